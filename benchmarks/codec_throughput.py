@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# =============================================================================
+# Benchmark the frame codec's encode and decode throughput.
+#
+# Frames are generated for a few kinds of animation -- a handful of pixels
+# changing per frame, a scrolling band, and every pixel changing -- and each
+# is encoded with neotiles.codec.FrameEncoder and decoded with
+# neotiles.codec.FrameDecoder.  The encoded size is reported as a fraction of
+# the raw frame size.
+#
+# Usage:
+#
+#    python benchmarks/codec_throughput.py [--cols 128] [--rows 64]
+#                                          [--frames 500]
+# =============================================================================
+
+from __future__ import division, print_function
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from neotiles.codec import FrameDecoder, FrameEncoder
+
+
+def sparse_frames(cols, rows, count, random):
+    """A handful of random pixels change each frame."""
+    frame = np.zeros((rows, cols, 4), dtype=np.uint8)
+    for _ in range(count):
+        frame = frame.copy()
+        for _ in range(8):
+            frame[random.randint(rows), random.randint(cols)] = (
+                random.randint(0, 256, 4))
+        yield frame
+
+
+def scrolling_frames(cols, rows, count, random):
+    """A band a quarter of the matrix high scrolls down one row per frame."""
+    band = random.randint(0, 256, (rows // 4, cols, 4)).astype(np.uint8)
+    for frame_num in range(count):
+        frame = np.zeros((rows, cols, 4), dtype=np.uint8)
+        top = frame_num % (rows - len(band))
+        frame[top:top + len(band)] = band
+        yield frame
+
+
+def noise_frames(cols, rows, count, random):
+    """Every pixel changes every frame."""
+    for _ in range(count):
+        yield random.randint(0, 256, (rows, cols, 4)).astype(np.uint8)
+
+
+SCENARIOS = [
+    ('sparse', sparse_frames),
+    ('scrolling', scrolling_frames),
+    ('noise', noise_frames),
+]
+
+
+def run_scenario(generate, cols, rows, count, keyframe_interval):
+    """
+    Encode and decode a scenario's frames.
+
+    :return: (tuple) Encode seconds, decode seconds, and the encoded size as
+        a fraction of the raw size.
+    """
+    frames = list(generate(cols, rows, count, np.random.RandomState(0)))
+
+    encoder = FrameEncoder(
+        (cols, rows), keyframe_interval=keyframe_interval)
+    start = time.time()
+    encoded = [encoder.encode(frame) for frame in frames]
+    encode_seconds = time.time() - start
+
+    decoder = FrameDecoder((cols, rows))
+    start = time.time()
+    for frame_type, payload in encoded:
+        decoder.decode(frame_type, payload)
+    decode_seconds = time.time() - start
+
+    if not np.array_equal(decoder.frame, frames[-1]):
+        raise AssertionError('decoded frame does not match')
+
+    encoded_bytes = sum(len(payload) for _, payload in encoded)
+    raw_bytes = sum(frame.nbytes for frame in frames)
+
+    return encode_seconds, decode_seconds, encoded_bytes / raw_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark frame codec encode and decode throughput.')
+    parser.add_argument('--cols', type=int, default=128)
+    parser.add_argument('--rows', type=int, default=64)
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--keyframe-interval', type=int, default=100)
+    args = parser.parse_args()
+
+    frame_mb = args.cols * args.rows * 4 / 1e6
+
+    print('{}x{}, {} frames'.format(args.cols, args.rows, args.frames))
+    print('{:12s} {:>14s} {:>14s} {:>10s}'.format(
+        'scenario', 'encode fps', 'decode fps', 'size'))
+
+    for name, generate in SCENARIOS:
+        encode_seconds, decode_seconds, ratio = run_scenario(
+            generate, args.cols, args.rows, args.frames,
+            args.keyframe_interval)
+
+        encode_fps = args.frames / encode_seconds
+        decode_fps = args.frames / decode_seconds
+        print('{:12s} {:14.0f} {:14.0f} {:9.1f}%'.format(
+            name, encode_fps, decode_fps, ratio * 100))
+        print('{:12s} {:11.0f} MB/s {:9.0f} MB/s'.format(
+            '', encode_fps * frame_mb, decode_fps * frame_mb))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
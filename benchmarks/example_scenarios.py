@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# =============================================================================
+# Benchmark the scenarios from the examples/ directory against a virtual
+# matrix at several matrix sizes.
+#
+# Each scenario is rendered offline (see TileManager.run_offline) and the
+# per-frame time spent in the tiles' draw() methods, in compositing, and in
+# sending the frame to the matrix is recorded.
+#
+# Usage:
+#
+#    # Record a baseline.
+#    python benchmarks/example_scenarios.py --save-baseline
+#
+#    # Compare against the baseline, failing on a regression of more than 25%.
+#    python benchmarks/example_scenarios.py --threshold 0.25
+# =============================================================================
+
+from __future__ import division, print_function
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import random
+import sys
+
+from neotiles import PixelColor, Tile, TileManager, TileSize
+from neotiles.matrixes import NTVirtualMatrix
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+EXAMPLES_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), 'examples')
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+DEFAULT_SIZES = ['8x8', '32x32', '128x64']
+METRICS = ['draw_ms', 'compose_ms', 'output_ms']
+
+# Regressions smaller than this many milliseconds per frame are ignored, as
+# they're indistinguishable from noise.
+MIN_REGRESSION_MS = 0.05
+
+
+def load_example(name):
+    """
+    Load a module from the examples/ directory.
+
+    :param name: (str) Example name (file name without the ``.py``).
+    :return: (module) The example module.
+    """
+    spec = importlib.util.spec_from_file_location(
+        'neotiles_example_{}'.format(name),
+        os.path.join(EXAMPLES_DIR, '{}.py'.format(name)))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+# -----------------------------------------------------------------------------
+# Scenarios.  Each scenario registers its tiles with the manager and returns
+# an on_frame callable (or None) which is called before each frame.
+# -----------------------------------------------------------------------------
+
+def scenario_fire(manager):
+    example = load_example('fire')
+    cols, rows = manager.matrix_size
+    size_divisor = 7.2 if rows <= 8 else 4.3
+
+    red_fire = example.FireTile(size_divisor=size_divisor)
+    grn_fire = example.FireTile(
+        size_divisor=size_divisor, hue_offset=50, base='top')
+
+    manager.register_tile(red_fire, size=(cols // 2, rows), root=(0, 0))
+    manager.register_tile(grn_fire, size=(cols // 2, rows), root=(cols // 2, 0))
+
+
+def scenario_speckled_tiles(manager):
+    example = load_example('speckled_tiles')
+    cols, rows = manager.matrix_size
+
+    speckled_tiles = [
+        example.SpeckledTile(animate=True),
+        example.SpeckledTile(animate=False),
+        example.SpeckledTile(animate=False),
+    ]
+
+    manager.register_tile(
+        speckled_tiles[0], size=(cols // 2, rows // 2), root=(0, 0))
+    manager.register_tile(
+        speckled_tiles[1], size=(cols // 2, rows // 2), root=(cols // 2, 0))
+    manager.register_tile(
+        speckled_tiles[2], size=(cols, rows // 2), root=(0, rows // 2))
+
+    def on_frame(frame_num):
+        # New base colors once per (virtual) second, as in the example.
+        if frame_num % 10 == 0:
+            for tile in speckled_tiles:
+                tile.data = PixelColor(
+                    random.random(), random.random(), random.random())
+                tile.draw()
+
+    return on_frame
+
+
+def scenario_clock_blocks(manager):
+    example = load_example('clock_blocks')
+    cols, rows = manager.matrix_size
+    width = cols // 4
+
+    time_tiles = [
+        example.TimeTile(color=PixelColor(1, 0, 0, 0), time_component='day'),
+        example.TimeTile(color=PixelColor(0, 1, 0, 0), time_component='hour'),
+        example.TimeTile(
+            color=PixelColor(0, 0, 1, 0), time_component='minute'),
+        example.TimeTile(
+            color=PixelColor(1, 1, 1, 0), time_component='second'),
+    ]
+
+    for index, tile in enumerate(time_tiles):
+        manager.register_tile(
+            tile, size=(width, rows), root=(int(cols * index / 4), 0))
+
+    def on_frame(frame_num):
+        now = datetime.datetime.fromtimestamp(manager.time)
+        manager.send_data_to_tiles({
+            'day': now.weekday(),
+            'hour': now.hour,
+            'minute': now.minute,
+            'second': now.second,
+        })
+
+    return on_frame
+
+
+def scenario_text_scroller(manager):
+    example = load_example('text_scroller')
+    cols, rows = manager.matrix_size
+
+    text_tile = example.TextScrollerTile()
+    progress_tile = example.TextScrollProgressTile()
+
+    manager.register_tile(text_tile, size=(cols, rows - 1), root=(0, 0))
+    manager.register_tile(progress_tile, size=(cols, 1), root=(0, rows - 1))
+
+    def on_frame(frame_num):
+        if text_tile.is_accepting_data:
+            text_tile.data = {
+                'progress_tile': progress_tile,
+                'text': 'the wind of banners that passes through my life',
+            }
+
+    return on_frame
+
+
+def scenario_growing_tile(manager):
+    cols, rows = manager.matrix_size
+    growing_tile = Tile(default_color=PixelColor(1, 0, 0))
+    manager.register_tile(growing_tile, size=(1, 1), root=(0, 0))
+
+    state = {'getting_bigger': True}
+
+    def on_frame(frame_num):
+        # The example resizes the tile twice per second.
+        if frame_num % 5 != 0:
+            return
+
+        size = growing_tile.size
+        if state['getting_bigger'] and (
+                size.cols >= cols or size.rows >= rows):
+            state['getting_bigger'] = False
+        elif not state['getting_bigger'] and size.cols <= 1:
+            state['getting_bigger'] = True
+
+        size_change = 1 if state['getting_bigger'] else -1
+        growing_tile.size = TileSize(
+            size.cols + size_change, size.rows + size_change)
+
+    return on_frame
+
+
+SCENARIOS = {
+    'fire': scenario_fire,
+    'speckled_tiles': scenario_speckled_tiles,
+    'clock_blocks': scenario_clock_blocks,
+    'text_scroller': scenario_text_scroller,
+    'growing_tile': scenario_growing_tile,
+}
+
+
+# -----------------------------------------------------------------------------
+
+def run_scenario(name, size, frames, fps, repeats):
+    """
+    Run a scenario, returning the best (lowest) per-frame timings over
+    ``repeats`` runs.
+
+    :return: (dict|None) Timings in milliseconds per frame, keyed by metric
+        name; or None if the scenario could not be run.
+    """
+    best = None
+
+    for _ in range(repeats):
+        random.seed(0)
+        manager = TileManager(
+            NTVirtualMatrix(size=size, realtime=False), draw_fps=fps)
+
+        try:
+            on_frame = SCENARIOS[name](manager)
+        except ImportError as e:
+            print('  skipping {}: {}'.format(name, e))
+            return None
+
+        stats = manager.run_offline(
+            frames / fps, fps=fps, output=True, on_frame=on_frame)
+
+        timings = {
+            'draw_ms': stats.draw_seconds * 1000 / stats.frames,
+            'compose_ms': (
+                (stats.composite_seconds - stats.draw_seconds) * 1000 /
+                stats.frames),
+            'output_ms': stats.output_seconds * 1000 / stats.frames,
+        }
+
+        if best is None:
+            best = timings
+        else:
+            best = {
+                metric: min(best[metric], timings[metric])
+                for metric in METRICS
+            }
+
+    return best
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Compare results against a baseline.
+
+    :return: ([str]) Descriptions of each metric which regressed by more than
+        ``threshold`` (a fraction of the baseline value).
+    """
+    regressions = []
+
+    for key, timings in sorted(results.items()):
+        if key not in baseline:
+            continue
+
+        for metric in METRICS:
+            old = baseline[key].get(metric)
+            new = timings[metric]
+            if old is None:
+                continue
+
+            if new > old * (1 + threshold) and new - old > MIN_REGRESSION_MS:
+                regressions.append(
+                    '{} {}: {:.3f} ms -> {:.3f} ms (+{:.0f}%)'.format(
+                        key, metric, old, new,
+                        (new - old) / old * 100 if old else float('inf')))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the example scenarios on a virtual matrix.')
+    parser.add_argument(
+        '--scenarios', default=','.join(sorted(SCENARIOS)),
+        help='comma-separated scenario names')
+    parser.add_argument(
+        '--sizes', default=','.join(DEFAULT_SIZES),
+        help='comma-separated matrix sizes (colsxrows)')
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--fps', type=int, default=10)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument(
+        '--save-baseline', action='store_true',
+        help='write the results to the baseline file')
+    parser.add_argument(
+        '--threshold', type=float, default=0.25,
+        help='allowed slowdown as a fraction of the baseline')
+    args = parser.parse_args()
+
+    sizes = [
+        tuple(int(dim) for dim in size.split('x'))
+        for size in args.sizes.split(',')
+    ]
+
+    results = {}
+    print('{:32s} {:>10s} {:>10s} {:>10s}'.format(
+        'scenario', 'draw ms', 'compose ms', 'output ms'))
+
+    for name in args.scenarios.split(','):
+        for size in sizes:
+            timings = run_scenario(
+                name, size, args.frames, args.fps, args.repeats)
+            if timings is None:
+                break
+
+            key = '{}@{}x{}'.format(name, *size)
+            results[key] = timings
+            print('{:32s} {:10.3f} {:10.3f} {:10.3f}'.format(
+                key, *[timings[metric] for metric in METRICS]))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+        print('baseline written to {}'.format(args.baseline))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('no baseline found at {}'.format(args.baseline))
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print('FAIL: regressions beyond {:.0f}%:'.format(args.threshold * 100))
+        for regression in regressions:
+            print('  {}'.format(regression))
+        return 1
+
+    print('no regressions beyond {:.0f}%'.format(args.threshold * 100))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
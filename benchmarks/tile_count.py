@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# =============================================================================
+# Benchmark the TileManager compositor with a large number of tiles.
+#
+# Models a 64x32 display as one 1x1 tile per matrix pixel (2,048 tiles) and
+# times how long it takes to composite a frame.  The tiles' draw() methods are
+# not included in the compositing time (they're timed separately) as they're
+# the responsibility of the tiles rather than the TileManager.
+#
+# Usage:
+#
+#    python benchmarks/tile_count.py [--cols 64] [--rows 32] [--frames 100]
+#                                    [--budget-ms 5]
+#
+# Exits with a non-zero status if the median compositing time exceeds the
+# budget.
+# =============================================================================
+
+from __future__ import division, print_function
+import argparse
+import sys
+import time
+
+from neotiles import PixelColor, Tile, TileManager
+from neotiles.matrixes import NTVirtualMatrix
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def time_frames(manager, frames):
+    """
+    Composite ``frames`` frames, returning the time (in milliseconds) each
+    frame took.
+    """
+    timings = []
+    for _ in range(frames):
+        start = time.time()
+        manager._set_pixels_from_tiles()
+        timings.append((time.time() - start) * 1000)
+
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark compositing one 1x1 tile per matrix pixel.')
+    parser.add_argument('--cols', type=int, default=64)
+    parser.add_argument('--rows', type=int, default=32)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--budget-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    manager = TileManager(
+        NTVirtualMatrix(size=(args.cols, args.rows)), draw_fps=None)
+
+    start = time.time()
+    tiles = []
+    for row in range(args.rows):
+        for col in range(args.cols):
+            tile = Tile(
+                default_color=PixelColor(col * 4 % 256, row * 8 % 256, 0),
+                animate=False)
+            manager.register_tile(tile, size=(1, 1), root=(col, row))
+            tiles.append(tile)
+    register_ms = (time.time() - start) * 1000
+
+    # The first frame builds the coverage map.
+    start = time.time()
+    manager._set_pixels_from_tiles()
+    first_frame_ms = (time.time() - start) * 1000
+
+    compose_ms = median(time_frames(manager, args.frames))
+
+    start = time.time()
+    for _ in range(args.frames):
+        for tile in tiles:
+            tile.draw()
+    draw_ms = (time.time() - start) * 1000 / args.frames
+
+    print('matrix: {}x{}, tiles: {}'.format(args.cols, args.rows, len(tiles)))
+    print('register all tiles:     {:8.2f} ms'.format(register_ms))
+    print('first frame (coverage): {:8.2f} ms'.format(first_frame_ms))
+    print('composite (median):     {:8.2f} ms'.format(compose_ms))
+    print('tile draw() calls:      {:8.2f} ms'.format(draw_ms))
+
+    if compose_ms > args.budget_ms:
+        print('FAIL: compositing exceeded budget of {} ms'.format(
+            args.budget_ms))
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
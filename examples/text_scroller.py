@@ -1,22 +1,21 @@
 # =============================================================================
 # Draws two tiles: the top one (using most of the matrix) displays scrolling
 # text.  The bottom one displays the progress of the scrolling text.
-#
-# This example relies on an external text drawing library:
-#    https://github.com/adafruit/micropython-adafruit-bitmap-font
-#
-# ... see installation instructions here:
-#    http://neotiles.readthedocs.io/pages/examples.html
 # =============================================================================
 
 from __future__ import division
 import random
 import time
 
-from bitmapfont.bitmapfont import BitmapFont
-from neopixel import ws
+try:
+    from neopixel import ws
+    STRIP_TYPE = ws.WS2811_STRIP_GRB
+except ImportError:
+    STRIP_TYPE = None
+
 from neotiles import MatrixSize, PixelColor, TileManager, Tile
 from neotiles.matrixes import NTNeoPixelMatrix
+from neotiles.text import TextTile
 
 
 # Matrix size.  cols, rows.
@@ -24,10 +23,9 @@ MATRIX_SIZE = MatrixSize(8, 8)
 
 # For a neopixel matrix.
 LED_PIN = 18
-STRIP_TYPE = ws.WS2811_STRIP_GRB
 
 
-class TextScrollerTile(Tile):
+class TextScrollerTile(TextTile):
     """
     Scrolls a text message from right to left across its tile.  Each message
     will be displayed with a different random color.
@@ -39,102 +37,40 @@ class TextScrollerTile(Tile):
     the data attribute of the 'progress_tile' tile.
     """
     def __init__(self, *args, **kwargs):
+        kwargs.setdefault('scroll', True)
+        kwargs.setdefault('loop', False)
         super(TextScrollerTile, self).__init__(*args, **kwargs)
 
-        # The current scroll position (will range from 0 to the length of the
-        # text + the width of the tile).
-        self._pos = None
-
-        # The width of the entire text (in pixels).
-        self._text_width = None
-
-        # The width of the text + the tile width.  This represents the total
-        # number of pixels the text has to scroll through.
-        self._display_width = None
-
-        # The number of pixel columns we've scrolled through.
-        self._cols_displayed = None
-
-        # The BitmapFont object used to draw the individual characters.
-        self._bitmap_font = None
-
-        # The color to render the text with.
-        self._color = None
-
-    def _init_new_scroll(self):
-        """
-        Initialize the tile's state when about to embark on scrolling a new
-        text string.
-        """
-        # Set up the beginning state of the text scroll.
-        self._bitmap_font = BitmapFont(*self.size, pixel=self._draw_text_pixel,
-                                       font_name='bitmapfont/font5x8.bin')
-        self._bitmap_font.init()
-        self._pos = self.size.cols
-        self._text_width = self._bitmap_font.width(self.data['text'])
-        self._display_width = self._text_width + self.size.cols
-        self._cols_displayed = 0
-        self._color = PixelColor(
-            random.random(), random.random(), random.random())
-
-    def _get_current_ms(self):
-        """
-        Compute the current time in milliseconds.
-
-        :return: (int) The current time in milliseconds.
-        """
-        return int(round(time.time() * 1000))
-
-    def _draw_text_pixel(self, col, row):
-        """
-        The pixel-drawing method that we pass to the BitmapFont object.  This
-        results in BitmapFont (which takes care of rendering the actual
-        text characters) drawing its pixels to our tile.
-
-        :param col: The character's pixel col.
-        :param row: The character's pixel row.
-        """
-        if col < 0:
-            return
-
-        self.set_pixel((col, row), self._color)
-
     def draw(self):
         """
-        Draw the tile.  This involves starting the text at the far right hand
-        side of the tile and scrolling it left, one pixel at a time, until it
-        scrolls off the left hand side of the tile.
+        Draw the tile.  TextTile takes care of starting the text at the far
+        right hand side of the tile and scrolling it left, one pixel per
+        frame, until it scrolls off the left hand side of the tile.  The
+        text is rendered once per message, and each frame only copies the
+        part of it which is inside the tile.
 
         This draw method will get called for every animation frame by the
-        TileManager.  As a result, we need to retain enough state between
-        each invocation to know where we are in the scroll.
+        TileManager.
         """
         if self.data is None:
             return
 
         if self.is_accepting_data:
-            # Ensure we don't get more data until we're ready.
+            # Ensure we don't get more data until we're ready.  Setting the
+            # text starts a new scroll.
             self.is_accepting_data = False
-            self._init_new_scroll()
-
-        # Clear the tile to prepare for the next frame of the scroll animation.
-        self.clear()
+            self.color = PixelColor(
+                random.random(), random.random(), random.random())
+            self.text = self.data['text']
 
-        # Prepare the text string at the correct position for this frame.
-        self._bitmap_font.text(self.data['text'], int(self._pos), 0)
-        self._cols_displayed += 1
-        self._pos -= 1
+        super(TextScrollerTile, self).draw()
 
         # Notify the progress tile of our progress through the scroll.
-        self.data['progress_tile'].data = (
-            self._cols_displayed / self._display_width)
+        self.data['progress_tile'].data = self.progress
 
-        if self._pos < -self._text_width:
+        if self.finished:
             # We've reached the end of the scroll for this text string so we
-            #  reset some things and prepare to receive the next text string.
-            self.clear()
-            self._bitmap_font.deinit()
-            self._bitmap_font = None
+            # prepare to receive the next text string.
             self.is_accepting_data = True
             self.data = None
 
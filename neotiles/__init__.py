@@ -1,5 +1,6 @@
 from .pixelcolor import PixelColor
 from .tile import Tile
 from .tilemanager import (
-    MatrixSize, PixelPosition, TileManager, TilePosition, TileSize
+    MatrixSize, PixelPosition, RenderStats, TileManager, TilePosition,
+    TileSize
 )
@@ -0,0 +1,60 @@
+from __future__ import division
+
+import numpy as np
+
+
+BLEND_NORMAL = 'normal'
+BLEND_ADD = 'add'
+BLEND_MULTIPLY = 'multiply'
+BLEND_SCREEN = 'screen'
+BLEND_MAX = 'max'
+
+BLEND_MODES = (
+    BLEND_NORMAL, BLEND_ADD, BLEND_MULTIPLY, BLEND_SCREEN, BLEND_MAX
+)
+
+
+def blend(dst, src, mode=BLEND_NORMAL, opacity=1.0):
+    """
+    Blend the ``src`` pixel values onto the ``dst`` pixel values.
+
+    Both arrays hold denormalized (0-255) component values and must have the
+    same shape (usually ``(rows, cols, 4)``).  The blend is performed on the
+    whole arrays at once.
+
+    The blend modes are:
+
+    * ``normal``: the source replaces the destination.
+    * ``add``: the source is added to the destination (clipped at 255).
+    * ``multiply``: the source and destination are multiplied (darkens).
+    * ``screen``: the inverse of multiplying the inverses (lightens).
+    * ``max``: the brightest of the source and destination is used.
+
+    The result of the blend mode is then mixed with the destination according
+    to ``opacity``.
+
+    :param dst: (numpy.ndarray) Destination (underlying) pixel values.
+    :param src: (numpy.ndarray) Source (overlaid) pixel values.
+    :param mode: (str) One of :data:`BLEND_MODES`.
+    :param opacity: (float) Opacity of the source, between 0 and 1.
+    :return: (numpy.ndarray) The blended pixel values (float32).
+    :raises: ``ValueError`` if ``mode`` is not a valid blend mode.
+    """
+    if mode == BLEND_NORMAL:
+        blended = src
+    elif mode == BLEND_ADD:
+        blended = np.minimum(dst + src, 255)
+    elif mode == BLEND_MULTIPLY:
+        blended = dst * src / 255
+    elif mode == BLEND_SCREEN:
+        blended = 255 - (255 - dst) * (255 - src) / 255
+    elif mode == BLEND_MAX:
+        blended = np.maximum(dst, src)
+    else:
+        raise ValueError('blend mode must be one of {}'.format(
+            ', '.join(BLEND_MODES)))
+
+    if opacity >= 1:
+        return blended.astype(np.float32)
+
+    return (dst + (blended - dst) * opacity).astype(np.float32)
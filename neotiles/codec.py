@@ -0,0 +1,267 @@
+from __future__ import division
+import struct
+
+import numpy as np
+
+from neotiles import MatrixSize
+from neotiles.exceptions import NeoTilesError
+
+
+# Frame types.  A keyframe's payload is every pixel's channels, row by row.
+# A delta frame's payload is the runs of pixels which changed since the
+# previous frame: the run count (uint32), then the first pixel number of
+# every run (uint32), then the length of every run (uint32), then the
+# channels of every pixel in every run.  All values are little-endian.
+FRAME_KEY = 0
+FRAME_DELTA = 1
+
+CHANNEL_LAYOUTS = ('RGB', 'RGBW')
+
+_RUN_COUNT = struct.Struct('<I')
+_RUN_DTYPE = np.dtype('<u4')
+
+
+def _validate_channel_layout(channel_layout):
+    if channel_layout not in CHANNEL_LAYOUTS:
+        raise NeoTilesError('channel_layout must be one of {}'.format(
+            ', '.join(CHANNEL_LAYOUTS)))
+
+
+def _run_pixels(starts, lengths):
+    """
+    Get the pixel numbers covered by a set of runs.
+
+    :param starts: (numpy.ndarray) First pixel number of each run.
+    :param lengths: (numpy.ndarray) Number of pixels in each run.
+    :return: (numpy.ndarray) The pixel numbers, in run order.
+    """
+    starts = starts.astype(np.int64)
+    lengths = lengths.astype(np.int64)
+    run_offsets = np.cumsum(lengths) - lengths
+
+    return np.repeat(starts - run_offsets, lengths) + np.arange(lengths.sum())
+
+
+class FrameEncoder(object):
+    """
+    Encodes a stream of frames as keyframes and delta frames.
+
+    Frames are uint8 arrays of shape ``(rows, cols, 4)`` holding each pixel's
+    red, green, blue, and white components (see
+    :func:`~neotiles.framebuffer.pixels_to_frame`).  If
+    ``channel_layout='RGB'`` then the white component is discarded.
+
+    The first frame is always a keyframe.  After that each frame is encoded
+    as the runs of pixels which changed since the previous frame, unless
+    that would be larger than a keyframe or ``keyframe_interval`` frames
+    have passed since the last keyframe.  Runs separated by fewer unchanged
+    pixels than it costs to start a new run are merged.
+
+    Encoded frames are decoded with a :class:`FrameDecoder`.  ::
+
+        encoder = FrameEncoder(size=(8, 8))
+        decoder = FrameDecoder(size=(8, 8))
+
+        frame_type, payload = encoder.encode(frame)
+        decoder.decode(frame_type, payload)
+
+    :param size: (:class:`MatrixSize`) Size of the frames.
+    :param channel_layout: (str) ``'RGBW'`` or ``'RGB'``.
+    :param keyframe_interval: (int|None) Maximum number of frames between
+        keyframes, or None to only make the first frame a keyframe.
+    :raises: :class:`exceptions.NeoTilesError` if ``channel_layout`` is not
+        valid.
+    """
+    def __init__(self, size, channel_layout='RGBW', keyframe_interval=None):
+        _validate_channel_layout(channel_layout)
+
+        self._size = MatrixSize(*size)
+        self._channel_layout = channel_layout
+        self._channels = len(channel_layout)
+        self._keyframe_interval = keyframe_interval
+
+        # A run costs two uint32s, so it's cheaper to include up to this
+        # many unchanged pixels in a run than to start a new one.
+        self._merge_gap = 2 * _RUN_DTYPE.itemsize // self._channels
+
+        self._previous = None
+        self._since_keyframe = 0
+
+    def __repr__(self):
+        return '{}(size={}, channel_layout={}, keyframe_interval={})'.format(
+            self.__class__.__name__, self._size, repr(self._channel_layout),
+            self._keyframe_interval
+        )
+
+    def _delta_payload(self, pixels):
+        """
+        Encode the runs of pixels which differ from the previous frame.
+
+        :param pixels: (numpy.ndarray) The frame, with one row per pixel.
+        :return: (bytes) The delta payload.
+        """
+        changed = np.any(pixels != self._previous, axis=1).view(np.int8)
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], changed, [0]))))
+        starts = edges[::2]
+        ends = edges[1::2]
+
+        if len(starts) > 1:
+            # Merge runs separated by small gaps.
+            keep = (starts[1:] - ends[:-1]) > self._merge_gap
+            starts = starts[np.concatenate(([True], keep))]
+            ends = ends[np.concatenate((keep, [True]))]
+
+        lengths = ends - starts
+
+        return b''.join([
+            _RUN_COUNT.pack(len(starts)),
+            starts.astype(_RUN_DTYPE).tobytes(),
+            lengths.astype(_RUN_DTYPE).tobytes(),
+            pixels[_run_pixels(starts, lengths)].tobytes(),
+        ])
+
+    def encode(self, frame):
+        """
+        Encode a frame.
+
+        :param frame: (numpy.ndarray) The frame, a uint8 array of shape
+            ``(rows, cols, 4)``.
+        :return: (tuple) A ``(frame_type, payload)`` pair, where
+            ``frame_type`` is :data:`FRAME_KEY` or :data:`FRAME_DELTA` and
+            ``payload`` is the encoded frame (bytes).
+        """
+        # Copy the frame, as the caller may reuse it for the next frame.
+        pixels = np.array(
+            frame[..., :self._channels], dtype=np.uint8).reshape(
+                -1, self._channels)
+
+        frame_type = FRAME_KEY
+        payload = None
+
+        keyframe_due = (
+            self._previous is None or (
+                self._keyframe_interval is not None and
+                self._since_keyframe + 1 >= self._keyframe_interval)
+        )
+
+        if not keyframe_due:
+            payload = self._delta_payload(pixels)
+            if len(payload) < pixels.nbytes:
+                frame_type = FRAME_DELTA
+
+        if frame_type == FRAME_KEY:
+            payload = pixels.tobytes()
+            self._since_keyframe = 0
+        else:
+            self._since_keyframe += 1
+
+        self._previous = pixels
+
+        return frame_type, payload
+
+    def reset(self):
+        """
+        Make the next frame a keyframe (for example when a new receiver
+        starts decoding the stream).
+        """
+        self._previous = None
+
+
+class FrameDecoder(object):
+    """
+    Decodes frames encoded by a :class:`FrameEncoder`.
+
+    Frames are decoded into :attr:`frame`, which is updated in place.  If
+    ``frame`` is given then it is decoded into directly: passing a matrix's
+    :attr:`~neotiles.matrixes.NTMatrix.framebuffer` means decoded frames
+    only need to be shown, not copied to the matrix.  ::
+
+        decoder = FrameDecoder(matrix.size, frame=matrix.framebuffer)
+        decoder.decode(frame_type, payload)
+        matrix.show()
+
+    Delta frames only update the pixels which changed, so nothing else
+    should write to ``frame`` between frames.
+
+    :param size: (:class:`MatrixSize`) Size of the frames.
+    :param channel_layout: (str) ``'RGBW'`` or ``'RGB'``.  This must match
+        the encoder's channel layout.
+    :param frame: (numpy.ndarray|None) A contiguous uint8 array of shape
+        ``(rows, cols, 4)`` to decode into.
+    :raises: :class:`exceptions.NeoTilesError` if ``channel_layout`` or
+        ``frame`` is not valid.
+    """
+    def __init__(self, size, channel_layout='RGBW', frame=None):
+        _validate_channel_layout(channel_layout)
+
+        self._size = MatrixSize(*size)
+        self._channel_layout = channel_layout
+        self._channels = len(channel_layout)
+
+        shape = (self._size.rows, self._size.cols, 4)
+        if frame is None:
+            frame = np.zeros(shape, dtype=np.uint8)
+        elif (frame.shape != shape or frame.dtype != np.uint8 or
+                not frame.flags.c_contiguous):
+            raise NeoTilesError(
+                'frame must be a contiguous uint8 array of shape {}'.format(
+                    shape))
+
+        self._frame = frame
+        self._pixels = frame.reshape(-1, 4)[:, :self._channels]
+
+    def __repr__(self):
+        return '{}(size={}, channel_layout={})'.format(
+            self.__class__.__name__, self._size, repr(self._channel_layout)
+        )
+
+    def decode(self, frame_type, buffer, offset=0, length=None):
+        """
+        Decode a frame into :attr:`frame`.
+
+        :param frame_type: (int) :data:`FRAME_KEY` or :data:`FRAME_DELTA`.
+        :param buffer: (bytes|mmap|memoryview) Buffer holding the payload.
+        :param offset: (int) Offset of the payload within ``buffer``.
+        :param length: (int|None) Length of the payload, or None if it
+            runs to the end of ``buffer``.
+        :return: (numpy.ndarray) :attr:`frame`.
+        :raises: :class:`exceptions.NeoTilesError` if ``frame_type`` is not
+            valid.
+        """
+        channels = self._channels
+
+        if frame_type == FRAME_KEY:
+            self._pixels[:] = np.frombuffer(
+                buffer, dtype=np.uint8, count=self._pixels.size,
+                offset=offset).reshape(-1, channels)
+        elif frame_type == FRAME_DELTA:
+            run_count, = _RUN_COUNT.unpack_from(buffer, offset)
+            offset += _RUN_COUNT.size
+            runs = np.frombuffer(
+                buffer, dtype=_RUN_DTYPE, count=run_count * 2, offset=offset)
+            offset += runs.nbytes
+
+            starts = runs[:run_count]
+            lengths = runs[run_count:]
+            pixel_nums = _run_pixels(starts, lengths)
+
+            self._pixels[pixel_nums] = np.frombuffer(
+                buffer, dtype=np.uint8, count=len(pixel_nums) * channels,
+                offset=offset).reshape(-1, channels)
+        else:
+            raise NeoTilesError('unknown frame type {}'.format(frame_type))
+
+        return self._frame
+
+    def reset(self):
+        """
+        Clear :attr:`frame` to black.
+        """
+        self._frame.fill(0)
+
+    @property
+    def frame(self):
+        """
+        (numpy.ndarray) The most recently decoded frame.
+        """
+        return self._frame
@@ -0,0 +1,449 @@
+from __future__ import division
+from collections import deque, namedtuple
+import json
+import random
+import socket
+import struct
+import time
+
+from neotiles import MatrixSize, TileManager, TilePosition, TileSize
+
+
+# Every frame starts with the coordinator sending a tick to every worker:
+# the coordinator's session ID (chosen at random each time a coordinator
+# starts, so workers can tell when it has restarted), the frame's sequence
+# number, its virtual time (passed to the tiles), the coordinator time at
+# which it should be presented, and the coordinator time at which the tick
+# was sent, optionally followed by JSON data for the tiles.  Workers
+# acknowledge each frame once it has been presented.  All values are
+# little-endian.
+TICK_MAGIC = b'NTDT'
+ACK_MAGIC = b'NTDA'
+
+# magic, session, sequence, frame time, present at, sent at.
+_TICK = struct.Struct('<4sIQddd')
+
+# magic, session, sequence, rendered at, presented at (both in coordinator
+# time), and whether the frame was rendered too late to be presented on time.
+_ACK = struct.Struct('<4sIQdd?')
+
+WorkerStats = namedtuple(
+    'WorkerStats', 'frames late last_sequence last_present_error')
+WorkerStats.__doc__ = """
+Statistics for one worker of a :class:`CanvasCoordinator`: the number of
+frames it has acknowledged, how many of those it rendered too late to
+present on time, the sequence number of the last one, and how far (in
+seconds) the last frame's presentation was from its scheduled time.
+"""
+
+
+class CanvasCoordinator(object):
+    """
+    Drives a canvas which is split across several :class:`CanvasWorker`
+    nodes, each displaying one region of it.
+
+    For every frame the coordinator sends each worker a tick carrying the
+    frame's sequence number, its virtual time (which becomes the workers'
+    :attr:`TileManager.time` while rendering, so every worker's tiles draw
+    the same moment), and the time at which it should be presented:
+    ``lead_time`` seconds after the tick is sent, which gives the workers
+    time to render the frame first.  Workers present the frame at that time
+    on their own clock (see :class:`CanvasWorker`) and acknowledge it, so
+    the coordinator can report on how well they're keeping up
+    (:attr:`worker_stats`) and in sync (:meth:`skew`).  ::
+
+        coordinator = CanvasCoordinator(
+            size=(16, 8), workers=[('pi-left', 7900), ('pi-right', 7900)])
+        coordinator.run(duration=60)
+
+    :param size: (:class:`MatrixSize`) Size of the whole canvas.
+    :param workers: ([tuple]) ``(host, port)`` address of each worker.
+    :param fps: (float) Frame rate.
+    :param lead_time: (float) Seconds between sending a tick and presenting
+        the frame.
+    :param host: (str) Address to receive acknowledgements on.
+    :param port: (int) Port to receive acknowledgements on (0 picks a free
+        port).
+    """
+    def __init__(
+            self, size, workers, fps=30, lead_time=0.05, host='0.0.0.0',
+            port=0):
+
+        self._size = MatrixSize(*size)
+        self.workers = [tuple(worker) for worker in workers]
+        self.fps = fps
+        self.lead_time = lead_time
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((host, port))
+
+        self.session = random.getrandbits(32)
+        self._sequence = 0
+        self._stats = {}
+
+        # Scheduled presentation time of recent frames, and the time each
+        # worker presented them (keyed by sequence number).
+        self._scheduled = {}
+        self._presented = {}
+
+    def __repr__(self):
+        return '{}(size={}, workers={}, fps={}, lead_time={})'.format(
+            self.__class__.__name__, self._size, self.workers, self.fps,
+            self.lead_time
+        )
+
+    def tick(self, frame_time=None, data=None):
+        """
+        Send the next frame's tick to every worker.
+
+        :param frame_time: (float|None) Virtual time of the frame.  Defaults
+            to the current time.
+        :param data: (any) JSON-serializable data to send to the workers'
+            tiles (see :meth:`TileManager.send_data_to_tiles`) before the
+            frame is rendered.
+        :return: (int) The frame's sequence number.
+        """
+        now = time.time()
+        present_at = now + self.lead_time
+        self._sequence += 1
+
+        self._scheduled[self._sequence] = present_at
+        self._scheduled.pop(self._sequence - 100, None)
+        self._presented.pop(self._sequence - 100, None)
+
+        packet = _TICK.pack(
+            TICK_MAGIC, self.session, self._sequence,
+            now if frame_time is None else frame_time, present_at, now)
+        if data is not None:
+            packet += json.dumps(data).encode('utf-8')
+
+        for worker in self.workers:
+            self._socket.sendto(packet, worker)
+
+        return self._sequence
+
+    def receive_acks(self, timeout=0):
+        """
+        Process worker acknowledgements, waiting up to ``timeout`` seconds
+        for the first one.
+
+        :param timeout: (float) Seconds to wait.
+        :return: (int) The number of acknowledgements processed.
+        """
+        received = 0
+        self._socket.settimeout(timeout)
+
+        try:
+            while True:
+                packet, worker = self._socket.recvfrom(_ACK.size)
+                self._socket.settimeout(0)
+
+                try:
+                    (magic, session, sequence, rendered_at, presented_at,
+                     late) = _ACK.unpack(packet)
+                except struct.error:
+                    continue
+                if magic != ACK_MAGIC or session != self.session:
+                    continue
+
+                self._acknowledge(worker, sequence, presented_at, late)
+                received += 1
+        except socket.error:
+            # Timed out, or no more acknowledgements waiting.
+            pass
+
+        return received
+
+    def _acknowledge(self, worker, sequence, presented_at, late):
+        if sequence in self._presented or sequence in self._scheduled:
+            self._presented.setdefault(sequence, {})[worker] = presented_at
+
+        stats = self._stats.get(worker, WorkerStats(0, 0, 0, 0))
+        self._stats[worker] = WorkerStats(
+            frames=stats.frames + 1,
+            late=stats.late + (1 if late else 0),
+            last_sequence=max(stats.last_sequence, sequence),
+            last_present_error=(
+                presented_at - self._scheduled.get(sequence, presented_at)),
+        )
+
+    def run(self, duration=None, frames=None, on_frame=None):
+        """
+        Send ticks at :attr:`fps` frames per second, processing
+        acknowledgements in between, for ``duration`` seconds or ``frames``
+        frames (or forever).
+
+        :param duration: (float|None) Seconds to run for.
+        :param frames: (int|None) Number of frames to run for.
+        :param on_frame: (callable) Called with the frame number before each
+            tick is sent.  Whatever it returns is sent to the workers' tiles
+            as data (see :meth:`tick`), unless it's ``None``.
+        :return: (int) The number of frames sent.
+        """
+        if duration is not None:
+            frames = int(round(duration * self.fps))
+
+        start = time.time()
+        frame_num = 0
+
+        while frames is None or frame_num < frames:
+            next_tick = start + frame_num / self.fps
+            while True:
+                delay = next_tick - time.time()
+                if delay <= 0:
+                    break
+                self.receive_acks(timeout=delay)
+
+            data = None if on_frame is None else on_frame(frame_num)
+            self.tick(frame_time=next_tick, data=data)
+            frame_num += 1
+
+        # Collect the acknowledgements for the last frames, until every
+        # worker has presented the last one.
+        deadline = time.time() + self.lead_time * 2
+        while len(self._presented.get(self._sequence, {})) < len(
+                self.workers):
+            delay = deadline - time.time()
+            if delay <= 0:
+                break
+            self.receive_acks(timeout=delay)
+
+        return frame_num
+
+    def skew(self, sequence):
+        """
+        Get the spread of the times at which the workers presented a frame.
+
+        :param sequence: (int) The frame's sequence number.
+        :return: (float|None) Seconds between the first and last workers
+            presenting the frame, or None if fewer than two workers have
+            acknowledged it.
+        """
+        presented = self._presented.get(sequence, {})
+        if len(presented) < 2:
+            return None
+
+        return max(presented.values()) - min(presented.values())
+
+    def close(self):
+        """
+        Close the network socket.
+        """
+        self._socket.close()
+
+    @property
+    def size(self):
+        """
+        (:class:`MatrixSize`) Size of the whole canvas.
+        """
+        return self._size
+
+    @property
+    def address(self):
+        """
+        (tuple) The ``(host, port)`` acknowledgements are received on.
+        """
+        return self._socket.getsockname()
+
+    @property
+    def worker_stats(self):
+        """
+        (dict) :class:`WorkerStats` for each worker which has acknowledged a
+        frame, keyed by the worker's address.
+        """
+        return dict(self._stats)
+
+
+class CanvasWorker(object):
+    """
+    Displays one region of a canvas driven by a :class:`CanvasCoordinator`.
+
+    The worker owns a :class:`TileManager` for its ``matrix``, which shows
+    the part of the canvas whose top left corner is at ``root``.  Tiles are
+    registered with the worker in canvas coordinates, so every worker can
+    run the same set-up code: a worker only keeps the tiles which overlap its
+    region, positioned relative to the region.  ::
+
+        worker = CanvasWorker(
+            NTNeoPixelMatrix(size=(8, 8), led_pin=18), root=(8, 0),
+            port=7900)
+        worker.register_tile(clock_tile, size=(16, 8), root=(0, 0))
+        worker.run()
+
+    For each tick received from the coordinator the worker renders the frame
+    at the tick's virtual time, waits until the tick's presentation time,
+    and then displays the frame and acknowledges it.  Ticks older than the
+    last one received are ignored, unless they come from a new coordinator
+    session (because the coordinator has restarted), in which case the
+    worker starts following the new session.  Presentation times are in the
+    coordinator's clock; the worker estimates the difference between the two
+    clocks from how early each tick arrives, so the nodes' clocks don't need
+    to be synchronized.  The estimate is the smallest difference seen over
+    the last ``clock_window`` ticks (the tick with the least network delay),
+    so it follows the clocks as they drift apart in either direction.
+
+    :param matrix: (:class:`~neotiles.matrixes.NTMatrix`) The matrix
+        displaying the worker's region.
+    :param root: (:class:`TilePosition`) Position of the region's top left
+        corner on the canvas.
+    :param host: (str) Address to receive ticks on.
+    :param port: (int) Port to receive ticks on (0 picks a free port).
+    :param clock_window: (int) Number of recent ticks the clock difference
+        is estimated from.
+    """
+    def __init__(
+            self, matrix, root=(0, 0), host='0.0.0.0', port=0,
+            clock_window=100):
+        self.manager = TileManager(matrix, draw_fps=None)
+        self.root = TilePosition(*root)
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((host, port))
+
+        # Estimated (local time - coordinator time), plus the network
+        # latency: the smallest of the recent samples, so that an estimate
+        # from a quick tick ages out as the clocks drift.
+        self._clock_samples = deque(maxlen=clock_window)
+        self._clock_offset = None
+
+        self.session = None
+        self.sessions = 0
+        self.last_sequence = 0
+        self.frames_presented = 0
+        self.frames_late = 0
+        self.frames_missed = 0
+        self.ticks_ignored = 0
+
+    def __repr__(self):
+        return '{}(matrix={}, root={})'.format(
+            self.__class__.__name__, repr(self.manager.hardware_matrix),
+            self.root
+        )
+
+    def register_tile(self, tile, size=None, root=None, z=0):
+        """
+        Register a tile at a position on the canvas.  The tile is only
+        registered with the worker's :attr:`manager` if it overlaps the
+        worker's region.
+
+        :param tile: (:class:`Tile`) The tile to register.
+        :param size: (:class:`TileSize`) Size of the tile.
+        :param root: (:class:`TilePosition`) Position of the tile's top left
+            corner on the canvas.
+        :param z: (int) Stacking order of the tile.
+        :return: (bool) Whether the tile overlaps the worker's region.
+        """
+        size = TileSize(*size)
+        root = TilePosition(*root)
+        cols, rows = self.manager.matrix_size
+
+        local_root = TilePosition(root.x - self.root.x, root.y - self.root.y)
+        if (local_root.x >= cols or local_root.y >= rows or
+                local_root.x + size.cols <= 0 or
+                local_root.y + size.rows <= 0):
+            return False
+
+        self.manager.register_tile(tile, size=size, root=local_root, z=z)
+
+        return True
+
+    def _handle(self, packet, coordinator):
+        received_at = time.time()
+
+        try:
+            (magic, session, sequence, frame_time, present_at,
+             sent_at) = _TICK.unpack_from(packet)
+        except struct.error:
+            self.ticks_ignored += 1
+            return False
+
+        if magic != TICK_MAGIC:
+            self.ticks_ignored += 1
+            return False
+
+        if session != self.session:
+            # A new (or restarted) coordinator: start again from its first
+            # tick, with a fresh estimate of its clock.
+            self.session = session
+            self.sessions += 1
+            self.last_sequence = 0
+            self._clock_samples.clear()
+        elif sequence <= self.last_sequence:
+            self.ticks_ignored += 1
+            return False
+
+        self._clock_samples.append(received_at - sent_at)
+        self._clock_offset = min(self._clock_samples)
+
+        if self.last_sequence:
+            self.frames_missed += sequence - self.last_sequence - 1
+        self.last_sequence = sequence
+
+        data = packet[_TICK.size:]
+        if data:
+            self.manager.send_data_to_tiles(json.loads(data.decode('utf-8')))
+
+        for _ in self.manager.render_frames(1, start_time=frame_time):
+            pass
+        rendered_at = time.time()
+
+        local_present_at = present_at + self._clock_offset
+        late = rendered_at > local_present_at
+        if late:
+            self.frames_late += 1
+        else:
+            time.sleep(local_present_at - rendered_at)
+
+        self.manager.show_hardware_matrix()
+        presented_at = time.time()
+        self.frames_presented += 1
+
+        self._socket.sendto(
+            _ACK.pack(
+                ACK_MAGIC, session, sequence, rendered_at - self._clock_offset,
+                presented_at - self._clock_offset, late),
+            coordinator)
+
+        return True
+
+    def poll(self, timeout=0.1):
+        """
+        Wait up to ``timeout`` seconds for a tick, and present its frame.
+
+        :param timeout: (float) Seconds to wait.
+        :return: (bool) Whether a frame was presented.
+        """
+        self._socket.settimeout(timeout)
+
+        try:
+            packet, coordinator = self._socket.recvfrom(65535)
+        except socket.error:
+            return False
+
+        return self._handle(packet, coordinator)
+
+    def run(self, stop_event=None, frames=None):
+        """
+        Keep presenting frames until ``stop_event`` is set or ``frames``
+        frames have been presented (or forever).
+
+        :param stop_event: (threading.Event|None) Event to stop on.
+        :param frames: (int|None) Number of frames to present.
+        """
+        while stop_event is None or not stop_event.is_set():
+            if frames is not None and self.frames_presented >= frames:
+                return
+            self.poll()
+
+    def close(self):
+        """
+        Close the network socket.
+        """
+        self._socket.close()
+
+    @property
+    def address(self):
+        """
+        (tuple) The ``(host, port)`` ticks are received on.
+        """
+        return self._socket.getsockname()
@@ -0,0 +1,109 @@
+from __future__ import division
+
+import numpy as np
+
+
+class TemporalDither(object):
+    """
+    Dims frames in software with more levels than the hardware can display,
+    by dithering each pixel over time.
+
+    Dimming a matrix with its hardware brightness leaves few distinct levels
+    per channel: a neopixel strip at brightness 16 displays each channel with
+    only 17 levels, so gradients collapse into bands and fades step.
+    TemporalDither dims frames itself instead (the hardware is then left at
+    full brightness).  Each channel's dimmed level is computed with 8 extra
+    bits of precision, and the fraction which the hardware can't display is
+    carried over to the next frame in a per-pixel error buffer.  Over a few
+    frames every channel then averages out to its exact dimmed level.
+
+    Frames are uint8 arrays of shape ``(rows, cols, 4)``, or uint16 arrays
+    (where 65535 is full intensity) for frames with more precision than 8
+    bits.  Dithering a frame is a handful of vectorized operations on the
+    whole frame.
+
+    Dithering only works if frames are displayed often, so it should be used
+    with an animation loop which refreshes the matrix continuously (see the
+    ``output_fps`` parameter of :class:`~neotiles.TileManager`).  Pass
+    ``dither=True`` to :class:`~neotiles.matrixes.NTNeoPixelMatrix` to dither
+    its frames.
+
+    :param size: (:class:`~neotiles.MatrixSize`) Size of the frames.
+    :param brightness: (int) The brightness to dim frames to (0-255).
+    """
+    def __init__(self, size, brightness=255):
+        cols, rows = size
+        shape = (rows, cols, 4)
+
+        self._size = size
+        self._error = np.zeros(shape, dtype=np.uint32)
+        self._level = np.zeros(shape, dtype=np.uint32)
+        self.brightness = brightness
+
+        self.reset()
+
+    def __repr__(self):
+        return '{}(size={}, brightness={})'.format(
+            self.__class__.__name__, self._size, self._brightness
+        )
+
+    def dither(self, frame):
+        """
+        Dim a frame to the brightness, dithering the result.
+
+        :param frame: (numpy.ndarray) The frame, a uint8 or uint16 array of
+            shape ``(rows, cols, 4)``.
+        :return: (numpy.ndarray) The dimmed frame, a uint8 array of shape
+            ``(rows, cols, 4)``.
+        """
+        level = self._level
+
+        # The dimmed level of each channel in 1/256ths of a displayable
+        # level.  An 8-bit value v is the 16-bit value v * 257.
+        full = 65535 if frame.dtype == np.uint16 else 255
+        np.multiply(frame, np.uint32(self._brightness * 256), out=level)
+        level //= full
+
+        # Display the whole levels, and carry the fractions over.
+        level += self._error
+        np.bitwise_and(level, 0xff, out=self._error)
+        level >>= 8
+
+        return level.astype(np.uint8)
+
+    def reset(self):
+        """
+        Forget the fractions carried over from previous frames.
+
+        The error buffer starts out at a fixed pattern of fractions which
+        differs from pixel to pixel, so that neighbouring pixels of the same
+        color don't all step up a level in the same frame.
+        """
+        self._error[...] = np.random.RandomState(0).randint(
+            0, 256, size=self._error.shape)
+
+    @property
+    def size(self):
+        """
+        (:class:`~neotiles.MatrixSize`) Size of the frames.
+        """
+        return self._size
+
+    @property
+    def brightness(self):
+        """
+        (int) Get or set the brightness to dim frames to (0-255).
+        """
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, val):
+        error_msg = 'Brightness must be between 0 and 255'
+
+        try:
+            if val >= 0 and val <= 255:
+                self._brightness = val
+            else:
+                raise ValueError(error_msg)
+        except TypeError:
+            raise ValueError(error_msg)
@@ -0,0 +1,81 @@
+from __future__ import division
+
+import numpy as np
+
+from neotiles.pixelcolor import PixelColor
+
+
+def pixels_to_array(pixels):
+    """
+    Convert a 2D list of :class:`PixelColor` objects into a numeric array.
+
+    :param pixels: ([[:class:`PixelColor`]]) 2D list of pixel colors (rows of
+        columns).
+    :return: (tuple) A ``(values, rgbw)`` pair, where ``values`` is a float32
+        array of shape ``(rows, cols, 4)`` holding denormalized (0-255) red,
+        green, blue and white components; and ``rgbw`` is a boolean array of
+        shape ``(rows, cols)`` which is ``True`` for RGBW pixels.  RGB pixels
+        have a white component of 0.
+    """
+    rows = len(pixels)
+    cols = len(pixels[0]) if rows else 0
+
+    # The same PixelColor object is usually shared by many pixels, so only
+    # look up the components of each distinct object once.  Each entry is
+    # (red, green, blue, white, is_rgbw).
+    cache = {}
+    flat = []
+    for row in pixels:
+        for color in row:
+            entry = cache.get(id(color))
+            if entry is None:
+                components = color.hardware_components
+                if len(components) == 4:
+                    entry = components + (1,)
+                else:
+                    entry = components + (0, 0)
+                cache[id(color)] = entry
+            flat.append(entry)
+
+    combined = np.array(flat, dtype=np.float32).reshape(rows, cols, 5)
+
+    return combined[..., :4], combined[..., 4] > 0
+
+
+def pixels_to_frame(pixels):
+    """
+    Convert a 2D list of :class:`PixelColor` objects into a frame: a uint8
+    array of shape ``(rows, cols, 4)`` holding each pixel's red, green, blue,
+    and white components.  RGB pixels have a white component of 0.
+
+    Frames are what :meth:`~neotiles.matrixes.NTMatrix.setFrame` expects.
+
+    :param pixels: ([[:class:`PixelColor`]]) 2D list of pixel colors.
+    :return: (numpy.ndarray) The frame.
+    """
+    values, rgbw = pixels_to_array(pixels)
+    return values.astype(np.uint8)
+
+
+def array_to_pixels(values, rgbw):
+    """
+    Convert a numeric array back into a 2D list of :class:`PixelColor`
+    objects.  This is the inverse of :func:`pixels_to_array`.
+
+    :param values: (numpy.ndarray) Array of shape ``(rows, cols, 4)`` of
+        denormalized component values.  Values are rounded and clipped to
+        0-255.
+    :param rgbw: (numpy.ndarray) Boolean array of shape ``(rows, cols)``
+        specifying which pixels are RGBW.
+    :return: ([[:class:`PixelColor`]]) 2D list of pixel colors.
+    """
+    components = np.clip(np.rint(values), 0, 255).astype(np.uint8).tolist()
+    rgbw = rgbw.tolist()
+
+    return [
+        [
+            PixelColor(r, g, b, w if is_rgbw else None, normalized=False)
+            for (r, g, b, w), is_rgbw in zip(components_row, rgbw_row)
+        ]
+        for components_row, rgbw_row in zip(components, rgbw)
+    ]
@@ -0,0 +1,119 @@
+from __future__ import division
+
+from neotiles.exceptions import NeoTilesError
+
+
+class AdaptiveFrameRate(object):
+    """
+    Adapts the frame rate of a :class:`~neotiles.TileManager`'s animation
+    loop to what's being displayed.
+
+    Pass an AdaptiveFrameRate as the TileManager's ``draw_fps``: ::
+
+        tiles = TileManager(
+            matrix, draw_fps=AdaptiveFrameRate(min_fps=2, max_fps=60))
+
+    After every frame the animation loop calls :meth:`update` with whether
+    the frame differed from the previous one and how long it took to draw.
+    While frames keep changing and are drawn well within the time available
+    per frame, the frame rate rises by a factor of ``increase`` per frame up
+    to ``max_fps``.  When a frame is identical to the previous one the frame
+    rate falls by a factor of ``decrease`` per frame down to ``min_fps``, so
+    a static display costs next to nothing.  When drawing a frame takes more
+    than ``headroom`` of the time available per frame (because the tiles are
+    slow or the CPU is busy) the frame rate falls to what can be sustained.
+
+    :param min_fps: (float) The lowest frame rate.
+    :param max_fps: (float) The highest frame rate.
+    :param start_fps: (float|None) The initial frame rate.  Defaults to
+        ``max_fps``.
+    :param increase: (float) Factor the frame rate rises by per changing
+        frame.
+    :param decrease: (float) Factor the frame rate falls by per unchanged
+        frame.
+    :param headroom: (float) Fraction of each frame's time which drawing may
+        take before the frame rate is lowered.
+    :raises: :class:`exceptions.NeoTilesError` if the frame rates or factors
+        are not valid.
+    """
+    def __init__(
+            self, min_fps=1, max_fps=60, start_fps=None, increase=1.1,
+            decrease=0.9, headroom=0.75):
+        if not 0 < min_fps <= max_fps:
+            raise NeoTilesError('min_fps must be between 0 and max_fps')
+
+        if increase < 1 or not 0 < decrease <= 1 or not 0 < headroom <= 1:
+            raise NeoTilesError(
+                'increase must be at least 1, and decrease and headroom must '
+                'be between 0 and 1')
+
+        self._min_fps = min_fps
+        self._max_fps = max_fps
+        self._start_fps = max_fps if start_fps is None else start_fps
+        self._increase = increase
+        self._decrease = decrease
+        self._headroom = headroom
+
+        self.reset()
+
+    def __repr__(self):
+        return '{}(min_fps={}, max_fps={})'.format(
+            self.__class__.__name__, self._min_fps, self._max_fps
+        )
+
+    def _clamp(self, fps):
+        return min(max(fps, self._min_fps), self._max_fps)
+
+    def update(self, changed, frame_seconds):
+        """
+        Adapt the frame rate after a frame has been displayed.
+
+        :param changed: (bool) Whether the frame differed from the previous
+            frame.
+        :param frame_seconds: (float) Time taken to draw and display the
+            frame.
+        :return: (float) The new frame rate.
+        """
+        # A coarse clock can measure a fast frame as taking no time at all.
+        frame_seconds = max(frame_seconds, 1e-6)
+        budget = self._headroom / self.fps
+
+        if frame_seconds > budget:
+            # Drawing is taking too long: drop to a rate which leaves
+            # headroom.
+            self.fps = self._clamp(min(
+                self.fps * self._decrease, self._headroom / frame_seconds))
+            self.frames_saturated += 1
+        elif changed:
+            self.fps = self._clamp(min(
+                self.fps * self._increase, self._headroom / frame_seconds))
+        else:
+            self.fps = self._clamp(self.fps * self._decrease)
+            self.frames_unchanged += 1
+
+        self.frames += 1
+
+        return self.fps
+
+    def reset(self):
+        """
+        Return to the initial frame rate and clear the counters.
+        """
+        self.fps = self._clamp(self._start_fps)
+        self.frames = 0
+        self.frames_unchanged = 0
+        self.frames_saturated = 0
+
+    @property
+    def min_fps(self):
+        """
+        (float) The lowest frame rate.
+        """
+        return self._min_fps
+
+    @property
+    def max_fps(self):
+        """
+        (float) The highest frame rate.
+        """
+        return self._max_fps
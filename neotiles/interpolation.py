@@ -0,0 +1,106 @@
+from __future__ import division
+
+import numpy as np
+
+
+class FrameInterpolator(object):
+    """
+    Cross-fades between the two most recently composed frames, so that a
+    matrix can be refreshed more often than its tiles are drawn.
+
+    Each newly composed frame is passed to :meth:`push` along with the time
+    it was composed.  :meth:`frame_at` then returns the frame to display at
+    any later time: it fades from the previous frame to the newest frame over
+    the time which passed between the two, so the display trails the tiles
+    by one draw interval in exchange for smooth motion.  The fade is a single
+    vectorized fixed point blend of the two frames (at 256 steps).
+
+    A :class:`~neotiles.TileManager` with an ``output_fps`` uses a
+    FrameInterpolator to refresh its matrix at ``output_fps`` while drawing
+    its tiles at ``draw_fps``.
+
+    :param size: (:class:`~neotiles.MatrixSize`) Size of the frames.
+    """
+    def __init__(self, size):
+        cols, rows = size
+        shape = (rows, cols, 4)
+
+        self._size = size
+        self._previous = np.zeros(shape, dtype=np.uint16)
+        self._current = np.zeros(shape, dtype=np.uint16)
+        self._blend = np.zeros(shape, dtype=np.uint16)
+        self._scratch = np.zeros(shape, dtype=np.uint16)
+        self._previous_time = None
+        self._current_time = None
+
+        self.frames_pushed = 0
+
+    def __repr__(self):
+        return '{}(size={})'.format(self.__class__.__name__, self._size)
+
+    def push(self, frame, timestamp):
+        """
+        Add a newly composed frame.
+
+        :param frame: (numpy.ndarray) The frame, a uint8 array of shape
+            ``(rows, cols, 4)``.
+        :param timestamp: (float) The time the frame was composed, in
+            seconds.
+        """
+        if self._current_time is None:
+            self._previous[...] = frame
+        else:
+            self._previous, self._current = self._current, self._previous
+
+        self._current[...] = frame
+        self._previous_time = self._current_time
+        self._current_time = timestamp
+        self.frames_pushed += 1
+
+    def weight_at(self, timestamp):
+        """
+        The weight of the newest frame at a given time.
+
+        :param timestamp: (float) The time, in seconds.
+        :return: (float) From 0 (only the previous frame) to 1 (only the
+            newest frame).
+        """
+        if self._previous_time is None:
+            return 1.0
+
+        interval = self._current_time - self._previous_time
+        if interval <= 0:
+            return 1.0
+
+        return min(max((timestamp - self._current_time) / interval, 0.0), 1.0)
+
+    def frame_at(self, timestamp):
+        """
+        The frame to display at a given time.
+
+        :param timestamp: (float) The time, in seconds.
+        :return: (numpy.ndarray) The frame, a uint8 array of shape
+            ``(rows, cols, 4)``.
+        """
+        weight = int(round(self.weight_at(timestamp) * 256))
+
+        if weight == 0:
+            return self._previous.astype(np.uint8)
+        if weight == 256:
+            return self._current.astype(np.uint8)
+
+        # (previous * (256 - weight) + current * weight) / 256 fits in 16
+        # bits, so the blend needs no wider intermediates.
+        np.multiply(self._previous, 256 - weight, out=self._blend)
+        np.multiply(self._current, weight, out=self._scratch)
+        self._blend += self._scratch
+        self._blend >>= 8
+
+        return self._blend.astype(np.uint8)
+
+    @property
+    def size(self):
+        """
+        (:class:`~neotiles.MatrixSize`) Size of the frames.
+        """
+        return self._size
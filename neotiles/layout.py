@@ -0,0 +1,246 @@
+from __future__ import division
+
+import numpy as np
+
+from neotiles import MatrixSize, TilePosition
+from neotiles.exceptions import NeoTilesError
+
+
+ROTATIONS = (0, 90, 180, 270)
+
+
+class PixelLayout(object):
+    """
+    Describes how the pixels of a matrix are wired: the order in which the
+    hardware's strip of pixels visits the matrix's ``(x, y)`` positions.
+
+    The layout is compiled once into index tables, so remapping a whole frame
+    to strip order (see :meth:`remap`) is a single gather.
+
+    ``pixel_map`` gives, for each pixel of the strip, the number
+    (``y * cols + x``) of the matrix pixel it displays.  Most matrixes are
+    wired in one of a few common patterns, which :class:`PanelLayout` and
+    :class:`TiledLayout` describe without writing out the map by hand.
+
+    :param size: (:class:`MatrixSize`) Size of the matrix.
+    :param pixel_map: ([int]) Matrix pixel number for each pixel of the
+        strip.
+    :raises: :class:`exceptions.NeoTilesError` if ``pixel_map`` refers to
+        pixels outside the matrix or refers to a pixel more than once.
+    """
+    def __init__(self, size, pixel_map):
+        self._size = MatrixSize(*size)
+
+        pixel_count = self._size.cols * self._size.rows
+        pixel_map = np.array(pixel_map, dtype=np.intp).ravel()
+
+        if len(pixel_map) and (
+                pixel_map.min() < 0 or pixel_map.max() >= pixel_count):
+            raise NeoTilesError(
+                'pixel_map refers to pixels outside the matrix')
+
+        strip_index = np.full(pixel_count, -1, dtype=np.intp)
+        strip_index[pixel_map] = np.arange(len(pixel_map))
+        if np.count_nonzero(strip_index >= 0) != len(pixel_map):
+            raise NeoTilesError(
+                'pixel_map refers to the same pixel more than once')
+
+        self._pixel_map = pixel_map
+        self._strip_index = strip_index.reshape(
+            self._size.rows, self._size.cols)
+
+        self._pixel_map.flags.writeable = False
+        self._strip_index.flags.writeable = False
+
+    def __repr__(self):
+        return '{}(size={}, pixels={})'.format(
+            self.__class__.__name__, self._size, len(self)
+        )
+
+    def __len__(self):
+        return len(self._pixel_map)
+
+    def remap(self, frame, out=None):
+        """
+        Reorder a frame's pixels into strip order.
+
+        :param frame: (numpy.ndarray) The frame, an array of shape
+            ``(rows, cols, channels)``.
+        :param out: (numpy.ndarray|None) Array of shape
+            ``(len(layout), channels)`` to write the strip into.
+        :return: (numpy.ndarray) The strip: one row per strip pixel.
+        """
+        pixels = frame.reshape(self._size.cols * self._size.rows, -1)
+
+        return np.take(pixels, self._pixel_map, axis=0, out=out)
+
+    @property
+    def size(self):
+        """
+        (:class:`MatrixSize`) Size of the matrix.
+        """
+        return self._size
+
+    @property
+    def pixel_map(self):
+        """
+        (numpy.ndarray) Matrix pixel number (``y * cols + x``) for each pixel
+        of the strip.  Read only.
+        """
+        return self._pixel_map
+
+    @property
+    def strip_index(self):
+        """
+        (numpy.ndarray) Strip pixel number for each matrix pixel, an array of
+        shape ``(rows, cols)``.  Matrix pixels which aren't on the strip are
+        ``-1``.  Read only.
+        """
+        return self._strip_index
+
+
+class PanelLayout(PixelLayout):
+    """
+    The layout of a single matrix panel wired in one of the common patterns.
+
+    By default the strip starts at the top left of the panel and runs left to
+    right along each row (``y * cols + x``).  ``column_major=True`` makes it
+    run top to bottom along each column instead, and ``serpentine=True``
+    makes every other row (or column) run back the other way, which is how
+    most neopixel matrixes are wired.
+
+    ``flip_x`` and ``flip_y`` move the start of the strip to the right and
+    bottom of the panel respectively.  ``rotation`` is the number of degrees
+    (0, 90, 180, or 270) the panel is rotated clockwise from that wiring when
+    mounted.  ``size`` is always the size of the matrix as displayed, so when
+    the panel is rotated by 90 or 270 degrees the wiring's rows are the
+    displayed columns.  For example, an 8x4 panel wired serpentine by rows
+    and mounted on its side is: ::
+
+        PanelLayout(size=(4, 8), serpentine=True, rotation=90)
+
+    :param size: (:class:`MatrixSize`) Size of the matrix.
+    :param serpentine: (bool) Whether alternate rows (or columns) run in
+        opposite directions.
+    :param column_major: (bool) Whether the strip runs along columns rather
+        than rows.
+    :param flip_x: (bool) Whether the strip starts on the right.
+    :param flip_y: (bool) Whether the strip starts at the bottom.
+    :param rotation: (int) Clockwise rotation of the panel, in degrees.
+    :raises: :class:`exceptions.NeoTilesError` if ``rotation`` is not valid.
+    """
+    def __init__(
+            self, size, serpentine=False, column_major=False, flip_x=False,
+            flip_y=False, rotation=0):
+        if rotation not in ROTATIONS:
+            raise NeoTilesError('rotation must be one of {}'.format(
+                ', '.join(str(rotation) for rotation in ROTATIONS)))
+
+        size = MatrixSize(*size)
+
+        self._serpentine = serpentine
+        self._column_major = column_major
+        self._flip_x = flip_x
+        self._flip_y = flip_y
+        self._rotation = rotation
+
+        # Size of the panel as wired, before rotation.
+        if rotation in (90, 270):
+            cols, rows = size.rows, size.cols
+        else:
+            cols, rows = size.cols, size.rows
+
+        strip = np.arange(cols * rows)
+        if column_major:
+            x, y = strip // rows, strip % rows
+            if serpentine:
+                y = np.where(x % 2, rows - 1 - y, y)
+        else:
+            x, y = strip % cols, strip // cols
+            if serpentine:
+                x = np.where(y % 2, cols - 1 - x, x)
+
+        if flip_x:
+            x = cols - 1 - x
+        if flip_y:
+            y = rows - 1 - y
+
+        # Rotate the panel's coordinates into matrix coordinates.
+        if rotation == 90:
+            x, y = rows - 1 - y, x
+        elif rotation == 180:
+            x, y = cols - 1 - x, rows - 1 - y
+        elif rotation == 270:
+            x, y = y, cols - 1 - x
+
+        super(PanelLayout, self).__init__(size, y * size.cols + x)
+
+    def __repr__(self):
+        return (
+            '{}(size={}, serpentine={}, column_major={}, flip_x={}, '
+            'flip_y={}, rotation={})'
+        ).format(
+            self.__class__.__name__, self.size, self._serpentine,
+            self._column_major, self._flip_x, self._flip_y, self._rotation
+        )
+
+
+class TiledLayout(PixelLayout):
+    """
+    The layout of a matrix made up of several panels chained together on one
+    strip.
+
+    ``panels`` is a list of ``(layout, root)`` pairs in the order the panels
+    are chained, where ``layout`` is the panel's own layout (such as a
+    :class:`PanelLayout`) and ``root`` is the :class:`TilePosition` of the
+    panel's top left pixel within the matrix.  Two 8x8 serpentine panels side
+    by side, chained from the left, are: ::
+
+        TiledLayout(size=(16, 8), panels=[
+            (PanelLayout((8, 8), serpentine=True), (0, 0)),
+            (PanelLayout((8, 8), serpentine=True), (8, 0)),
+        ])
+
+    :param size: (:class:`MatrixSize`) Size of the whole matrix.
+    :param panels: ([tuple]) ``(layout, root)`` pair for each panel.
+    :raises: :class:`exceptions.NeoTilesError` if a panel does not fit inside
+        the matrix or panels overlap.
+    """
+    def __init__(self, size, panels):
+        size = MatrixSize(*size)
+
+        self._panels = []
+        pixel_maps = []
+
+        for layout, root in panels:
+            root = TilePosition(*root)
+            panel_size = layout.size
+
+            if (root.x < 0 or root.y < 0 or
+                    root.x + panel_size.cols > size.cols or
+                    root.y + panel_size.rows > size.rows):
+                raise NeoTilesError(
+                    'panel of size {} at {} does not fit inside a matrix of '
+                    'size {}'.format(panel_size, root, size))
+
+            y, x = np.divmod(layout.pixel_map, panel_size.cols)
+            pixel_maps.append((y + root.y) * size.cols + x + root.x)
+            self._panels.append((layout, root))
+
+        pixel_map = (
+            np.concatenate(pixel_maps) if pixel_maps else
+            np.zeros(0, dtype=np.intp))
+
+        super(TiledLayout, self).__init__(size, pixel_map)
+
+    def __repr__(self):
+        return '{}(size={}, panels={})'.format(
+            self.__class__.__name__, self.size, self._panels
+        )
+
+    @property
+    def panels(self):
+        """
+        ([tuple]) The ``(layout, root)`` pair for each panel, in strip order.
+        """
+        return list(self._panels)
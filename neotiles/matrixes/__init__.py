@@ -1,3 +1,11 @@
+from __future__ import division
+from collections import namedtuple
+import math
+import threading
+import time
+
+import numpy as np
+
 try:
     from neopixel import Adafruit_NeoPixel, ws
     DEFAULT_STRIP_TYPE = ws.WS2811_STRIP_GRB
@@ -9,10 +17,27 @@ try:
 except ImportError:
     pass
 
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 from neotiles import MatrixSize
+from neotiles.pixelcolor import PixelColor
+from neotiles.dithering import TemporalDither
 from neotiles.exceptions import NeoTilesError
+from neotiles.layout import PixelLayout
+from neotiles.network import (
+    DEFAULT_MAX_PACKET_SIZE, DEFAULT_PORTS, PROTOCOL_E131, PROTOCOLS,
+    PacketWriter
+)
+from neotiles.sharedmemory import FrameRing, default_path
 
-__all__ = ['NTMatrix', 'NTNeoPixelMatrix', 'NTRGBMatrix']
+__all__ = [
+    'NTMatrix', 'NTNeoPixelMatrix', 'NTRGBMatrix', 'NTVirtualMatrix',
+    'NTNetworkMatrix', 'NTSharedMemoryMatrix', 'NTCompositeMatrix',
+    'PanelStats'
+]
 
 
 class NTMatrix(object):
@@ -26,6 +51,22 @@ class NTMatrix(object):
     def setPixelColor(self, x, y, color):
         raise NotImplementedError
 
+    def setFrame(self, frame):
+        """
+        Set every pixel on the matrix from a frame: a uint8 array of shape
+        ``(rows, cols, 4)`` holding each pixel's red, green, blue, and white
+        components (0-255).
+
+        This default implementation calls :meth:`setPixelColor` for every
+        pixel.  Subclasses can override it with something faster.
+
+        :param frame: (numpy.ndarray) The frame.
+        """
+        for y, row in enumerate(frame.tolist()):
+            for x, (red, green, blue, white) in enumerate(row):
+                color = PixelColor(red, green, blue, white, normalized=False)
+                self.setPixelColor(x, y, color)
+
     def show(self):
         raise NotImplementedError
 
@@ -41,6 +82,37 @@ class NTMatrix(object):
     def size(self):
         return self._size
 
+    @property
+    def layout(self):
+        """
+        (:class:`~neotiles.layout.PixelLayout`|None) How the matrix's pixels
+        are wired, if the matrix remaps frames with a layout.  Frames sent to
+        a matrix with a layout should be set with :meth:`setFrame`, which
+        remaps the whole frame at once.
+        """
+        return None
+
+    @property
+    def dither(self):
+        """
+        (:class:`~neotiles.dithering.TemporalDither`|None) The temporal
+        dither applied to the matrix's frames, if the matrix dims its frames
+        in software.  Frames sent to a dithering matrix should be set with
+        :meth:`setFrame`, which dithers the whole frame at once.
+        """
+        return None
+
+    @property
+    def framebuffer(self):
+        """
+        (numpy.ndarray|None) The matrix's frame buffer, if it has one which
+        can be written to directly: a uint8 array of shape
+        ``(rows, cols, 4)`` which is displayed by :meth:`show`.  Writing to
+        the frame buffer is equivalent to calling :meth:`setFrame`, without
+        the copy.  Matrixes without such a buffer return ``None``.
+        """
+        return None
+
 
 class NTNeoPixelMatrix(NTMatrix):
     """
@@ -62,6 +134,22 @@ class NTNeoPixelMatrix(NTMatrix):
     need to ``import ws`` (which comes with the ``neopixel`` module) into your
     code.
 
+    By default the pixels are assumed to be wired row by row from the top
+    left (pixel ``y * cols + x``).  Most neopixel matrixes are wired
+    differently (serpentine, rotated, or several panels chained together), in
+    which case pass a ``layout`` describing the wiring, such as a
+    :class:`~neotiles.layout.PanelLayout`.  The layout is compiled once, so
+    it costs nothing per frame.
+
+    At low ``led_brightness`` values the strip can only display a few
+    distinct levels per channel.  If ``dither=True`` then the strip is run at
+    full brightness and frames are dimmed to ``led_brightness`` in software
+    instead, with the levels between those the strip can display dithered
+    over time (see :class:`~neotiles.dithering.TemporalDither`).  Dithering
+    needs the matrix to be refreshed continuously, such as by a
+    :class:`~neotiles.TileManager` with an ``output_fps``.  Frames can then
+    also be set as uint16 arrays, for more than 8 bits per channel.
+
     :param size: (:class:`MatrixSize`) Size of the neopixel matrix.
     :param led_pin: (int) The pin you're using to talk to your neopixel matrix.
     :param led_freq_hz: (int) LED frequency.
@@ -69,13 +157,18 @@ class NTNeoPixelMatrix(NTMatrix):
     :param led_brightness: (int) Brightness of the matrix display (0-255).
     :param led_invert: (bool) Whether to invert the LEDs.
     :param strip_type: (int) Neopixel strip type.
+    :param layout: (:class:`~neotiles.layout.PixelLayout`|None) How the
+        matrix's pixels are wired.
+    :param dither: (bool) Whether to dim frames in software with temporal
+        dithering.
     :raises: :class:`exceptions.NeoTilesError` if ``matrix_size`` or
-        ``led_pin`` are not specified.
+        ``led_pin`` are not specified, or ``layout`` is not the same size as
+        the matrix.
     """
     def __init__(
             self, size=None, led_pin=None,
             led_freq_hz=800000, led_dma=5, led_brightness=64, led_invert=False,
-            strip_type=DEFAULT_STRIP_TYPE):
+            strip_type=DEFAULT_STRIP_TYPE, layout=None, dither=False):
 
         super(NTNeoPixelMatrix, self).__init__()
 
@@ -91,12 +184,37 @@ class NTNeoPixelMatrix(NTMatrix):
         self._led_invert = led_invert
         self._strip_type = strip_type
 
-        self._led_count = self.size.cols * self.size.rows
+        if layout is None:
+            self._led_count = self.size.cols * self.size.rows
+            self._strip_index = None
+        else:
+            if layout.size != self._size:
+                raise NeoTilesError(
+                    'layout size {} does not match matrix size {}'.format(
+                        layout.size, self._size))
+
+            self._led_count = len(layout)
+            self._strip_index = layout.strip_index.tolist()
+
+        self._layout = layout
+
+        # When dithering, frames are held with 16 bits per channel until
+        # they're dimmed and dithered by show(), and the strip itself is run
+        # at full brightness.
+        if dither:
+            self._dither = TemporalDither(self._size, led_brightness)
+            self._frame = np.zeros(
+                (self._size.rows, self._size.cols, 4), dtype=np.uint16)
+            strip_brightness = 255
+        else:
+            self._dither = None
+            self._frame = None
+            strip_brightness = self.brightness
 
         self.hardware_matrix = Adafruit_NeoPixel(
             self._led_count, self._led_pin, freq_hz=self._led_freq_hz,
             dma=self._led_dma, invert=self._led_invert,
-            brightness=self.brightness, strip_type=self._strip_type
+            brightness=strip_brightness, strip_type=self._strip_type
         )
 
         self.hardware_matrix.begin()
@@ -120,12 +238,67 @@ class NTNeoPixelMatrix(NTMatrix):
         )
 
     def setPixelColor(self, x, y, color):
-        pixel_num = (y * self.size.cols) + x
+        if self._dither is not None:
+            components = color.hardware_components
+            if len(components) == 3:
+                components += (0,)
+
+            self._frame[y, x] = [component * 257 for component in components]
+            return
+
+        if self._strip_index is None:
+            pixel_num = (y * self.size.cols) + x
+        else:
+            pixel_num = self._strip_index[y][x]
+            if pixel_num < 0:
+                return
+
         self.hardware_matrix.setPixelColor(pixel_num, color.hardware_int)
 
+    def setFrame(self, frame):
+        if self._dither is not None:
+            if frame.dtype == np.uint16:
+                np.copyto(self._frame, frame)
+            else:
+                np.multiply(frame, np.uint16(257), out=self._frame)
+            return
+
+        self._send_frame(frame)
+
+    def _send_frame(self, frame):
+        """
+        Send a uint8 frame to the strip.
+
+        :param frame: (numpy.ndarray) The frame.
+        """
+        # Pack every pixel into the hardware's 0xWWRRGGBB format in one go.
+        channels = frame.astype(np.uint32)
+        packed = (
+            channels[..., 3] << 24 | channels[..., 0] << 16 |
+            channels[..., 1] << 8 | channels[..., 2]
+        ).ravel()
+
+        if self._layout is not None:
+            packed = packed[self._layout.pixel_map]
+
+        set_pixel_color = self.hardware_matrix.setPixelColor
+        for pixel_num, value in enumerate(packed.tolist()):
+            set_pixel_color(pixel_num, value)
+
     def show(self):
+        if self._dither is not None:
+            self._send_frame(self._dither.dither(self._frame))
+
         self.hardware_matrix.show()
 
+    @property
+    def layout(self):
+        return self._layout
+
+    @property
+    def dither(self):
+        return self._dither
+
     @property
     def brightness(self):
         return self._brightness
@@ -137,7 +310,10 @@ class NTNeoPixelMatrix(NTMatrix):
         try:
             if val >= 0 and val <= 255:
                 self._brightness = val
-                self.hardware_matrix.setBrightness(self._brightness)
+                if self._dither is not None:
+                    self._dither.brightness = val
+                else:
+                    self.hardware_matrix.setBrightness(self._brightness)
             else:
                 raise ValueError(error_msg)
         except TypeError:
@@ -204,6 +380,16 @@ class NTRGBMatrix(NTMatrix):
         cd = color.components_denormalized
         self.frame_canvas.SetPixel(x, y, cd[0], cd[1], cd[2])
 
+    def setFrame(self, frame):
+        if Image is not None:
+            self.frame_canvas.SetImage(Image.fromarray(frame[..., :3], 'RGB'))
+            return
+
+        set_pixel = self.frame_canvas.SetPixel
+        for y, row in enumerate(frame.tolist()):
+            for x, (red, green, blue, _) in enumerate(row):
+                set_pixel(x, y, red, green, blue)
+
     def show(self):
         self.frame_canvas = self.hardware_matrix.SwapOnVSync(self.frame_canvas)
 
@@ -223,3 +409,795 @@ class NTRGBMatrix(NTMatrix):
                 raise ValueError(error_msg)
         except TypeError:
             raise ValueError(error_msg)
+
+
+class NTVirtualMatrix(NTMatrix):
+    """
+    Represents an in-memory matrix which doesn't need any hardware.
+
+    Pixels set with :meth:`setPixelColor` are written into a preallocated
+    buffer, and :meth:`show` copies that buffer into :attr:`frame` (the
+    "displayed" frame).  This is useful for testing, and for profiling tiles
+    and the :class:`~neotiles.TileManager` on machines without a matrix
+    attached.
+
+    The time taken by real hardware to display a frame can be simulated:
+
+    * ``pixel_latency`` is the time (in seconds) taken to send one pixel to
+      the matrix.  A WS281x neopixel strip takes 24 bits at 800kHz, or 30
+      microseconds per pixel.
+    * ``show_latency`` is a fixed time (in seconds) added to every
+      :meth:`show`, such as the WS281x reset/latch time.
+    * If ``dma=True`` then frames are sent in the background (as the WS281x
+      driver does using DMA): :meth:`show` returns immediately unless the
+      previous frame is still being sent, in which case it waits for that to
+      finish first.
+    * ``vsync_hz`` simulates an RGB (HUB75) matrix which only swaps frames on
+      its refresh boundary: :meth:`show` waits for the next multiple of
+      ``1 / vsync_hz`` seconds.
+
+    :meth:`ws281x` and :meth:`hub75` create virtual matrixes with typical
+    timings for neopixel and RGB matrixes.
+
+    If ``realtime=False`` then the simulated latency is added up (see
+    :attr:`total_latency`) but :meth:`show` never sleeps.
+
+    :param size: (:class:`MatrixSize`) Size of the matrix.
+    :param brightness: (int) Brightness of the matrix (0-255).
+    :param pixel_latency: (float) Seconds taken to send each pixel.
+    :param show_latency: (float) Seconds added to every :meth:`show`.
+    :param dma: (bool) Whether frames are sent in the background.
+    :param vsync_hz: (float|None) Refresh rate to synchronize frames to.
+    :param realtime: (bool) Whether :meth:`show` sleeps for the simulated
+        latency.
+    :raises: :class:`exceptions.NeoTilesError` if ``size`` is not specified.
+    """
+    def __init__(
+            self, size=None, brightness=255, pixel_latency=0, show_latency=0,
+            dma=False, vsync_hz=None, realtime=True):
+
+        super(NTVirtualMatrix, self).__init__()
+
+        if size is None:
+            raise NeoTilesError('size must be specified')
+
+        self._size = MatrixSize(*size)
+        self._brightness = brightness
+
+        self.pixel_latency = pixel_latency
+        self.show_latency = show_latency
+        self.dma = dma
+        self.vsync_hz = vsync_hz
+        self.realtime = realtime
+
+        # Back buffer written by setPixelColor(), and front buffer copied
+        # from it by show().  Both hold RGBW components (0-255).
+        self._buffer = np.zeros(
+            (self._size.rows, self._size.cols, 4), dtype=np.uint8)
+        self._frame = np.zeros_like(self._buffer)
+
+        self._transfer_done = 0
+        self._simulated_time = 0
+
+        self.frames_shown = 0
+        self.last_latency = 0
+        self.total_latency = 0
+
+    def __repr__(self):
+        return (
+            '{}(size={}, brightness={}, pixel_latency={}, show_latency={}, '
+            'dma={}, vsync_hz={}, realtime={})'
+        ).format(
+            self.__class__.__name__, self.size, self.brightness,
+            self.pixel_latency, self.show_latency, self.dma, self.vsync_hz,
+            self.realtime
+        )
+
+    @classmethod
+    def ws281x(cls, size, led_freq_hz=800000, **kwargs):
+        """
+        Create a virtual matrix with WS281x neopixel timing: 24 bits per
+        pixel at ``led_freq_hz``, a 50 microsecond reset time, and DMA output.
+
+        :param size: (:class:`MatrixSize`) Size of the matrix.
+        :param led_freq_hz: (int) LED frequency.
+        :param kwargs: (*) Any other :class:`NTVirtualMatrix` parameters.
+        :return: (:class:`NTVirtualMatrix`) The virtual matrix.
+        """
+        kwargs.setdefault('pixel_latency', 24 / led_freq_hz)
+        kwargs.setdefault('show_latency', 0.00005)
+        kwargs.setdefault('dma', True)
+
+        return cls(size=size, **kwargs)
+
+    @classmethod
+    def hub75(cls, size, refresh_hz=120, **kwargs):
+        """
+        Create a virtual matrix with RGB (HUB75) matrix timing: frames are
+        swapped on the next vertical sync at ``refresh_hz``.
+
+        :param size: (:class:`MatrixSize`) Size of the matrix.
+        :param refresh_hz: (float) Matrix refresh rate.
+        :param kwargs: (*) Any other :class:`NTVirtualMatrix` parameters.
+        :return: (:class:`NTVirtualMatrix`) The virtual matrix.
+        """
+        kwargs.setdefault('vsync_hz', refresh_hz)
+
+        return cls(size=size, **kwargs)
+
+    def _now(self):
+        return time.time() if self.realtime else self._simulated_time
+
+    def _show_latency(self):
+        """
+        Work out how long a call to :meth:`show` should take.
+
+        :return: (float) The simulated latency, in seconds.
+        """
+        now = self._now()
+        transfer_time = (
+            self.pixel_latency * self._size.cols * self._size.rows +
+            self.show_latency
+        )
+
+        if self.dma:
+            # Wait for the previous frame to finish sending, then send this
+            # one in the background.
+            transfer_start = max(now, self._transfer_done)
+            self._transfer_done = transfer_start + transfer_time
+            latency = transfer_start - now
+        else:
+            latency = transfer_time
+
+        if self.vsync_hz:
+            vsync_period = 1 / self.vsync_hz
+            ready = now + latency
+            latency = math.ceil(ready / vsync_period) * vsync_period - now
+
+        self._simulated_time = now + latency
+
+        return latency
+
+    def setPixelColor(self, x, y, color):
+        components = color.hardware_components
+        if len(components) == 3:
+            components += (0,)
+
+        self._buffer[y, x] = components
+
+    def setFrame(self, frame):
+        np.copyto(self._buffer, frame)
+
+    def show(self):
+        np.copyto(self._frame, self._buffer)
+
+        latency = self._show_latency()
+        self.frames_shown += 1
+        self.last_latency = latency
+        self.total_latency += latency
+
+        if self.realtime and latency > 0:
+            time.sleep(latency)
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, val):
+        error_msg = 'Brightness must be between 0 and 255'
+
+        try:
+            if val >= 0 and val <= 255:
+                self._brightness = val
+            else:
+                raise ValueError(error_msg)
+        except TypeError:
+            raise ValueError(error_msg)
+
+    @property
+    def framebuffer(self):
+        return self._buffer
+
+    @property
+    def frame(self):
+        """
+        (numpy.ndarray) The most recently shown frame, as an array of shape
+        ``(rows, cols, 4)`` holding each pixel's red, green, blue, and white
+        components (0-255).  RGB pixels have a white component of 0.
+        """
+        return self._frame
+
+
+class NTNetworkMatrix(NTMatrix):
+    """
+    Represents a matrix driven by an LED controller on the network.
+
+    Frames are sent over UDP using either E1.31 (sACN) or Open Pixel Control
+    framing (``protocol='e131'`` or ``protocol='opc'``).  The controller sees
+    the matrix as a single strip of RGB pixels, which is split into packets
+    of at most ``max_packet_size`` bytes (by default the largest which fits
+    in an Ethernet frame without fragmenting): one DMX universe per packet
+    for E1.31, or one OPC channel per packet for OPC.  Consecutive packets
+    use consecutive universes (or channels) starting at ``first_address``.
+    The packets are allocated once and reused for every frame.
+
+    By default the strip runs from the top left of the matrix to the bottom
+    right, row by row.  If the controller's pixels are wired in a different
+    order then pass a ``pixel_map``: either a
+    :class:`~neotiles.layout.PixelLayout` (such as a
+    :class:`~neotiles.layout.PanelLayout` for a serpentine panel) or a
+    sequence giving, for each pixel of the strip, the number
+    (``y * cols + x``) of the matrix pixel it displays.
+
+    If ``changed_only=True`` then packets whose pixels haven't changed since
+    the previous frame aren't sent, except every ``keepalive`` seconds (see
+    :class:`~neotiles.network.PacketWriter`).
+
+    :class:`~neotiles.network.PixelReceiver` can stand in for a controller
+    when testing.
+
+    :param size: (:class:`MatrixSize`) Size of the matrix.
+    :param host: (str) Address of the controller.
+    :param port: (int) Port of the controller.  Defaults to the protocol's
+        standard port.
+    :param protocol: (str) ``'e131'`` or ``'opc'``.
+    :param pixel_map: (:class:`~neotiles.layout.PixelLayout`|[int]|None)
+        Layout of the strip, or the matrix pixel number for each pixel of
+        the strip.
+    :param first_address: (int) The first universe (E1.31) or channel (OPC).
+    :param max_packet_size: (int) Maximum packet size in bytes.
+    :param changed_only: (bool) Whether to skip unchanged packets.
+    :param keepalive: (float|None) Maximum seconds between sends of each
+        packet when ``changed_only=True``.
+    :param brightness: (int) Brightness of the matrix (0-255).
+    :raises: :class:`exceptions.NeoTilesError` if ``size`` or ``host`` is not
+        specified, the protocol is not valid, ``pixel_map`` refers to pixels
+        outside the matrix, or ``pixel_map`` is a layout of a different size.
+    """
+    def __init__(
+            self, size=None, host=None, port=None, protocol=PROTOCOL_E131,
+            pixel_map=None, first_address=1,
+            max_packet_size=DEFAULT_MAX_PACKET_SIZE, changed_only=False,
+            keepalive=1.0, brightness=255):
+
+        super(NTNetworkMatrix, self).__init__()
+
+        if size is None or host is None:
+            raise NeoTilesError('size and host must be specified')
+
+        if protocol not in PROTOCOLS:
+            raise NeoTilesError('protocol must be one of {}'.format(
+                ', '.join(PROTOCOLS)))
+
+        self._size = MatrixSize(*size)
+        self._brightness = brightness
+        self._protocol = protocol
+        if port is None:
+            port = DEFAULT_PORTS[protocol]
+        self._address = (host, port)
+
+        pixel_count = self._size.cols * self._size.rows
+        if isinstance(pixel_map, PixelLayout):
+            if pixel_map.size != self._size:
+                raise NeoTilesError(
+                    'layout size {} does not match matrix size {}'.format(
+                        pixel_map.size, self._size))
+            pixel_map = pixel_map.pixel_map
+
+        if pixel_map is None:
+            self._pixel_map = None
+        else:
+            self._pixel_map = np.asarray(pixel_map, dtype=np.intp)
+            if len(self._pixel_map) and (
+                    self._pixel_map.min() < 0 or
+                    self._pixel_map.max() >= pixel_count):
+                raise NeoTilesError(
+                    'pixel_map refers to pixels outside the matrix')
+
+        # The frame being built by setPixelColor() and setFrame(), and the
+        # RGB strip it's converted to by show().
+        self._buffer = np.zeros(
+            (self._size.rows, self._size.cols, 4), dtype=np.uint8)
+        strip_length = (
+            pixel_count if self._pixel_map is None else len(self._pixel_map))
+        self._strip = np.zeros((strip_length, 3), dtype=np.uint8)
+
+        self._writer = PacketWriter(
+            strip_length, self._address, protocol=protocol,
+            first_address=first_address, max_packet_size=max_packet_size,
+            changed_only=changed_only, keepalive=keepalive)
+
+    def __repr__(self):
+        return (
+            '{}(size={}, host={}, port={}, protocol={}, changed_only={}, '
+            'brightness={})'
+        ).format(
+            self.__class__.__name__, self.size, repr(self._address[0]),
+            self._address[1], repr(self._protocol), self._writer.changed_only,
+            self.brightness
+        )
+
+    def setPixelColor(self, x, y, color):
+        components = color.hardware_components
+        if len(components) == 3:
+            components += (0,)
+
+        self._buffer[y, x] = components
+
+    def setFrame(self, frame):
+        np.copyto(self._buffer, frame)
+
+    def show(self):
+        pixels = self._buffer.reshape(-1, 4)
+        if self._pixel_map is None:
+            strip = pixels[:, :3]
+        else:
+            strip = pixels[self._pixel_map, :3]
+
+        if self._brightness < 255:
+            np.copyto(
+                self._strip,
+                strip.astype(np.uint16) * self._brightness // 255,
+                casting='unsafe')
+        else:
+            np.copyto(self._strip, strip)
+
+        self._writer.send(self._strip, time.time())
+
+    def close(self):
+        """
+        Close the network socket.
+        """
+        self._writer.close()
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, val):
+        error_msg = 'Brightness must be between 0 and 255'
+
+        try:
+            if val >= 0 and val <= 255:
+                self._brightness = val
+            else:
+                raise ValueError(error_msg)
+        except TypeError:
+            raise ValueError(error_msg)
+
+    @property
+    def framebuffer(self):
+        return self._buffer
+
+    @property
+    def packets_per_frame(self):
+        """
+        (int) The number of packets a full frame is split into.
+        """
+        return len(self._writer)
+
+    @property
+    def packets_sent(self):
+        """
+        (int) The number of packets sent so far.
+        """
+        return self._writer.packets_sent
+
+    @property
+    def packets_skipped(self):
+        """
+        (int) The number of unchanged packets which weren't sent.
+        """
+        return self._writer.packets_skipped
+
+
+class NTSharedMemoryMatrix(NTMatrix):
+    """
+    Represents a matrix displayed by another process.
+
+    Frames are written into a ring buffer of ``slots`` frames in a
+    memory-mapped file at ``path`` (by default in ``/dev/shm``), and
+    displayed by a :class:`~neotiles.sharedmemory.SharedMemoryDriver` in a
+    separate process.  This keeps the tiles out of the process which talks
+    to the hardware, which usually has to run as root.  Start the driver
+    with (for example): ::
+
+        sudo python -m neotiles.sharedmemory --matrix neopixel --size 8x8 \\
+            --led-pin 18
+
+    and then use the matrix as normal: ::
+
+        tiles = TileManager(NTSharedMemoryMatrix(size=(8, 8)))
+
+    Each :meth:`show` copies the frame into the next slot of the ring and
+    publishes it with a new sequence number; the driver reads it in place.
+    Brightness changes are passed to the driver too.  Until a brightness is
+    set the driver leaves its matrix's brightness as it was configured.
+
+    :param size: (:class:`MatrixSize`) Size of the matrix.
+    :param path: (str|None) Path of the ring buffer file.
+    :param slots: (int) Number of frames in the ring buffer.
+    :param brightness: (int|None) Brightness of the matrix (0-255), or None
+        to leave the driver's matrix at its own brightness.
+    :raises: :class:`exceptions.NeoTilesError` if ``size`` is not specified.
+    """
+    def __init__(self, size=None, path=None, slots=4, brightness=None):
+        super(NTSharedMemoryMatrix, self).__init__()
+
+        if size is None:
+            raise NeoTilesError('size must be specified')
+
+        self._size = MatrixSize(*size)
+        self._path = default_path() if path is None else path
+        self._ring = FrameRing(
+            self._path, size=self._size, slots=slots, create=True)
+        if brightness is not None:
+            self.brightness = brightness
+
+        self._buffer = np.zeros(
+            (self._size.rows, self._size.cols, 4), dtype=np.uint8)
+
+    def __repr__(self):
+        return '{}(size={}, path={}, slots={}, brightness={})'.format(
+            self.__class__.__name__, self.size, repr(self._path),
+            len(self._ring.slots), self.brightness
+        )
+
+    def setPixelColor(self, x, y, color):
+        components = color.hardware_components
+        if len(components) == 3:
+            components += (0,)
+
+        self._buffer[y, x] = components
+
+    def setFrame(self, frame):
+        np.copyto(self._buffer, frame)
+
+    def show(self):
+        self._ring.publish(self._buffer, time.time())
+
+    def close(self):
+        """
+        Unmap the ring buffer file.
+        """
+        self._ring.close()
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, val):
+        error_msg = 'Brightness must be between 0 and 255'
+
+        try:
+            if val >= 0 and val <= 255:
+                self._brightness = val
+                self._ring.brightness = val
+            else:
+                raise ValueError(error_msg)
+        except TypeError:
+            raise ValueError(error_msg)
+
+    @property
+    def framebuffer(self):
+        return self._buffer
+
+    @property
+    def path(self):
+        """
+        (str) Path of the ring buffer file.
+        """
+        return self._path
+
+    @property
+    def frames_published(self):
+        """
+        (int) The number of frames shown so far.
+        """
+        return self._ring.latest
+
+
+PanelStats = namedtuple(
+    'PanelStats',
+    'frames dropped errors last_seconds mean_seconds max_seconds')
+PanelStats.__doc__ = """
+Output statistics for one panel of an :class:`NTCompositeMatrix`: the
+number of frames shown, dropped (because the panel was still busy showing
+an earlier frame), and which failed (because the panel raised an error),
+and the last, mean, and maximum time (in seconds) the panel took to show a
+frame.
+"""
+
+
+class _PanelOutput(object):
+    """
+    Shows frames on one panel of an :class:`NTCompositeMatrix` in its own
+    thread.  Only the most recent frame waiting to be shown is kept.  If the
+    panel raises an error while showing a frame then the error is kept until
+    it is collected by :meth:`take_error`.
+    """
+    def __init__(self, matrix, root, canvas):
+        self.matrix = matrix
+        self.root = root
+
+        cols, rows = matrix.size
+        x, y = root
+        self.region = canvas[y:y + rows, x:x + cols]
+        if self.region.shape[:2] != (rows, cols):
+            raise NeoTilesError(
+                'panel at {} does not fit on the canvas'.format(root))
+
+        self._pending = np.zeros_like(self.region)
+        self._working = np.zeros_like(self.region)
+        self._has_pending = False
+        self._submitted = 0
+        self._completed = 0
+        self._stopped = False
+        self._condition = threading.Condition()
+
+        self.frames = 0
+        self.dropped = 0
+        self.errors = 0
+        self.error = None
+        self.last_seconds = 0
+        self.total_seconds = 0
+        self.max_seconds = 0
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self):
+        """
+        Queue the panel's region of the canvas to be shown.
+
+        :return: (int) The frame's submission number.
+        """
+        with self._condition:
+            if self._has_pending:
+                self.dropped += 1
+            np.copyto(self._pending, self.region)
+            self._has_pending = True
+            self._submitted += 1
+            self._condition.notify_all()
+
+            return self._submitted
+
+    def wait(self, submission):
+        """
+        Wait until the frame with the given submission number has been
+        shown (or dropped in favour of a later one).
+        """
+        with self._condition:
+            while self._completed < submission and not self._stopped:
+                self._condition.wait()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._has_pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+
+                self._pending, self._working = self._working, self._pending
+                self._has_pending = False
+                submission = self._submitted
+
+            start = time.time()
+            try:
+                self.matrix.setFrame(self._working)
+                self.matrix.show()
+                error = None
+            except Exception as e:
+                error = e
+            seconds = time.time() - start
+
+            with self._condition:
+                if error is None:
+                    self.frames += 1
+                    self.last_seconds = seconds
+                    self.total_seconds += seconds
+                    self.max_seconds = max(self.max_seconds, seconds)
+                else:
+                    self.errors += 1
+                    self.error = error
+
+                # Waiters are released whether or not the frame was shown.
+                self._completed = submission
+                self._condition.notify_all()
+
+    def take_error(self):
+        """
+        Collect the most recent error raised by the panel, if there is one
+        which hasn't been collected yet.
+
+        :return: (Exception|None) The error.
+        """
+        with self._condition:
+            error = self.error
+            self.error = None
+
+            return error
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    @property
+    def stats(self):
+        with self._condition:
+            return PanelStats(
+                frames=self.frames,
+                dropped=self.dropped,
+                errors=self.errors,
+                last_seconds=self.last_seconds,
+                mean_seconds=(
+                    self.total_seconds / self.frames if self.frames else 0),
+                max_seconds=self.max_seconds,
+            )
+
+
+class NTCompositeMatrix(NTMatrix):
+    """
+    Represents one logical canvas made up of several matrixes (panels).
+
+    Each panel is given as a ``(matrix, root)`` pair, where ``root`` is the
+    position of the panel's top left corner on the canvas.  The canvas is
+    just big enough to hold all the panels unless a ``size`` is given.
+    Parts of the canvas which aren't covered by a panel aren't displayed;
+    panels may overlap.  ::
+
+        canvas = NTCompositeMatrix([
+            (NTNeoPixelMatrix(size=(8, 8), led_pin=18), (0, 0)),
+            (NTRGBMatrix(rows=8, chain_length=1), (8, 0)),
+        ])
+        tiles = TileManager(canvas)
+
+    Every panel has its own output thread.  :meth:`show` hands each panel
+    its region of the canvas and returns without waiting, so a slow panel
+    doesn't hold up the others (or the animation loop): if a panel is still
+    showing an earlier frame when a new one arrives then it skips straight
+    to the newest frame.  If ``synchronous=True`` then :meth:`show` waits
+    for every panel to finish showing the frame, which keeps the panels in
+    step at the expense of running at the speed of the slowest panel.
+
+    :attr:`panel_stats` reports the output timings of each panel.
+
+    If a panel raises an error while showing a frame then the error is
+    counted in its :attr:`panel_stats` and a
+    :class:`~neotiles.exceptions.NeoTilesError` is raised by the next call
+    to :meth:`show` or :meth:`wait` (by the same call, if it waited for the
+    frame).  The panel carries on showing later frames.
+
+    :param panels: ([tuple]) ``(matrix, root)`` pairs.
+    :param size: (:class:`MatrixSize`|None) Size of the canvas.
+    :param synchronous: (bool) Whether :meth:`show` waits for every panel.
+    :raises: :class:`exceptions.NeoTilesError` if there are no panels or a
+        panel doesn't fit on the canvas.
+    """
+    def __init__(self, panels, size=None, synchronous=False):
+        super(NTCompositeMatrix, self).__init__()
+
+        if not panels:
+            raise NeoTilesError('at least one panel must be specified')
+
+        if size is None:
+            size = (
+                max(root[0] + matrix.size.cols for matrix, root in panels),
+                max(root[1] + matrix.size.rows for matrix, root in panels),
+            )
+
+        self._size = MatrixSize(*size)
+        self._brightness = None
+        self.synchronous = synchronous
+
+        self._buffer = np.zeros(
+            (self._size.rows, self._size.cols, 4), dtype=np.uint8)
+
+        self._outputs = []
+        try:
+            for matrix, root in panels:
+                self._outputs.append(
+                    _PanelOutput(matrix, tuple(root), self._buffer))
+        except NeoTilesError:
+            self.close()
+            raise
+
+    def __repr__(self):
+        return '{}(panels=[{}], size={}, synchronous={})'.format(
+            self.__class__.__name__,
+            ', '.join([
+                '({}, {})'.format(repr(output.matrix), output.root)
+                for output in self._outputs
+            ]),
+            self.size, self.synchronous
+        )
+
+    def setPixelColor(self, x, y, color):
+        components = color.hardware_components
+        if len(components) == 3:
+            components += (0,)
+
+        self._buffer[y, x] = components
+
+    def setFrame(self, frame):
+        np.copyto(self._buffer, frame)
+
+    def show(self):
+        submissions = [output.submit() for output in self._outputs]
+
+        if self.synchronous:
+            for output, submission in zip(self._outputs, submissions):
+                output.wait(submission)
+
+        self._raise_panel_errors()
+
+    def wait(self):
+        """
+        Wait for every panel to finish showing the most recent frame.
+
+        :raises: :class:`exceptions.NeoTilesError` if a panel failed to show
+            a frame.
+        """
+        for output in self._outputs:
+            output.wait(output._submitted)
+
+        self._raise_panel_errors()
+
+    def _raise_panel_errors(self):
+        """
+        Raise the errors any panels have hit since they were last raised.
+        """
+        failures = []
+        for output in self._outputs:
+            error = output.take_error()
+            if error is not None:
+                failures.append('panel at {}: {!r}'.format(output.root, error))
+
+        if failures:
+            raise NeoTilesError(
+                'failed to show frame on {}'.format('; '.join(failures)))
+
+    def close(self):
+        """
+        Stop the panels' output threads.
+        """
+        for output in self._outputs:
+            output.stop()
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, val):
+        # Each panel validates the brightness according to its own range.
+        for output in self._outputs:
+            output.matrix.brightness = val
+
+        self._brightness = val
+
+    @property
+    def framebuffer(self):
+        return self._buffer
+
+    @property
+    def panels(self):
+        """
+        ([:class:`NTMatrix`]) The panel matrixes.
+        """
+        return [output.matrix for output in self._outputs]
+
+    @property
+    def panel_stats(self):
+        """
+        ([:class:`PanelStats`]) Output statistics for each panel, in the
+        same order as :attr:`panels`.
+        """
+        return [output.stats for output in self._outputs]
@@ -0,0 +1,364 @@
+from __future__ import division
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from neotiles.exceptions import NeoTilesError
+from neotiles.framebuffer import array_to_pixels
+from neotiles.tile import Tile
+
+
+DEFAULT_CACHE_SIZE = 64
+
+# Netpbm formats which can be read without PIL: binary greyscale (P5) and
+# binary color (P6), and the number of channels in each.
+_PNM_CHANNELS = {b'P5': 1, b'P6': 3}
+
+
+def _read_pnm_header(handle):
+    """
+    Read the header of a binary netpbm image.
+
+    :param handle: (file) Binary file positioned at the start of the image.
+    :return: (tuple|None) The image's ``(channels, width, height, maxval)``,
+        or ``None`` at the end of the file.
+    :raises: :class:`exceptions.NeoTilesError` if the image isn't a binary
+        PGM or PPM.
+    """
+    fields = []
+
+    while len(fields) < 4:
+        byte = handle.read(1)
+
+        if not byte:
+            if fields:
+                raise NeoTilesError('truncated PPM header')
+            return None
+        elif byte == b'#':
+            handle.readline()
+        elif byte.isspace():
+            continue
+        else:
+            field = byte
+            byte = handle.read(1)
+            while byte and not byte.isspace() and byte != b'#':
+                field += byte
+                byte = handle.read(1)
+            if byte == b'#':
+                handle.readline()
+            fields.append(field)
+
+    magic, width, height, maxval = fields
+    if magic not in _PNM_CHANNELS:
+        raise NeoTilesError('only binary PGM and PPM images are supported')
+
+    return _PNM_CHANNELS[magic], int(width), int(height), int(maxval)
+
+
+class _PNMSource(object):
+    """
+    Frames read from netpbm files.  Each file can hold several images one
+    after the other.  The files are scanned for their images once, and each
+    image is only read from disk when it's asked for.
+
+    :param paths: ([str]) The files to read.
+    """
+    def __init__(self, paths):
+        # Where each image is: (path, offset, channels, width, height,
+        # maxval).
+        self._images = []
+
+        for path in paths:
+            with open(path, 'rb') as handle:
+                while True:
+                    header = _read_pnm_header(handle)
+                    if header is None:
+                        break
+
+                    channels, width, height, maxval = header
+                    sample_bytes = 1 if maxval < 256 else 2
+                    offset = handle.tell()
+                    self._images.append((path, offset) + header)
+                    handle.seek(
+                        offset + width * height * channels * sample_bytes)
+
+    def __len__(self):
+        return len(self._images)
+
+    def frame(self, index):
+        path, offset, channels, width, height, maxval = self._images[index]
+        dtype = np.dtype(np.uint8 if maxval < 256 else '>u2')
+        sample_count = width * height * channels
+
+        with open(path, 'rb') as handle:
+            handle.seek(offset)
+            data = handle.read(sample_count * dtype.itemsize)
+
+        if len(data) != sample_count * dtype.itemsize:
+            raise NeoTilesError('truncated image in {}'.format(path))
+
+        samples = np.frombuffer(data, dtype=dtype).reshape(
+            height, width, channels)
+        if maxval != 255:
+            samples = samples.astype(np.uint32) * 255 // maxval
+
+        return np.broadcast_to(samples, (height, width, 3)).astype(np.uint8)
+
+    def close(self):
+        pass
+
+
+class _ImageSource(object):
+    """
+    Frames of an animated image (such as a GIF) read with PIL.  Each frame
+    is decoded when it's asked for.
+
+    :param path: (str) The image file.
+    """
+    def __init__(self, path):
+        if Image is None:
+            raise NeoTilesError('PIL is required to display {}'.format(path))
+
+        self._image = Image.open(path)
+        self._frame_count = getattr(self._image, 'n_frames', 1)
+
+    def __len__(self):
+        return self._frame_count
+
+    def frame(self, index):
+        self._image.seek(index)
+        return np.asarray(self._image.convert('RGB'), dtype=np.uint8)
+
+    def close(self):
+        self._image.close()
+
+
+class _ArraySource(object):
+    """
+    Frames which are already in memory.
+
+    :param frames: ([numpy.ndarray]) The frames.
+    """
+    def __init__(self, frames):
+        self._frames = list(frames)
+
+    def __len__(self):
+        return len(self._frames)
+
+    def frame(self, index):
+        return self._frames[index]
+
+    def close(self):
+        pass
+
+
+def _open_source(source):
+    """
+    Choose how to read a media tile's source.
+    """
+    if isinstance(source, str):
+        if source.lower().endswith(('.pgm', '.ppm', '.pnm')):
+            return _PNMSource([source])
+        return _ImageSource(source)
+
+    source = list(source)
+    if source and isinstance(source[0], str):
+        return _PNMSource(source)
+
+    return _ArraySource(source)
+
+
+class MediaTile(Tile):
+    """
+    A tile which displays an image or an animation, scaled to fit the tile.
+
+    ``source`` is one of:
+
+    * The path of a binary PPM or PGM file (``.ppm``, ``.pgm``, or ``.pnm``),
+      which can hold several images one after the other.
+    * A list of paths of PPM or PGM files, one or more frames per file.
+    * The path of any other image file (such as an animated GIF), which is
+      read with `PIL <https://python-pillow.org/>`_.
+    * A list of frames: uint8 arrays of shape ``(rows, cols, 3)`` or
+      ``(rows, cols, 4)``.
+
+    Sources with up to ``cache_size`` frames (such as icons and short
+    animations) are decoded once when the tile is created, and scaled to the
+    tile's :attr:`size` (with nearest-neighbour sampling) whenever it's set,
+    so drawing them only copies prepared frames.  Longer sequences are
+    streamed: the files are scanned once when the tile is created, but each
+    frame is only read, decoded, and scaled when it's displayed, and only the
+    ``cache_size`` most recently displayed frames are kept (in a least
+    recently used cache).
+
+    Each call to :meth:`draw` displays the next frame.  If ``fps`` is given
+    then the frames are instead displayed at that rate, following the tile's
+    :attr:`time`.  After the last frame the animation starts again if
+    ``loop=True``; otherwise the last frame stays on display and
+    :attr:`finished` becomes ``True``.
+
+    :param source: (str|list) The image or frames to display.
+    :param fps: (float|None) Frames per second, or ``None`` for one frame per
+        :meth:`draw`.
+    :param loop: (bool) Whether to start again after the last frame.
+    :param cache_size: (int) Number of scaled frames to cache.
+    :param default_color: (:class:`PixelColor`) Color of the tile's pixels
+        before the first frame.
+    :param animate: (bool) Whether the tile is animating.
+    :raises: :class:`exceptions.NeoTilesError` if the source has no frames
+        or can't be read, or ``cache_size`` is less than 1.
+    """
+    def __init__(
+            self, source, fps=None, loop=True, cache_size=DEFAULT_CACHE_SIZE,
+            default_color=None, animate=True):
+        if cache_size < 1:
+            raise NeoTilesError('cache_size must be at least 1')
+
+        self._source = _open_source(source)
+        if not len(self._source):
+            raise NeoTilesError('source has no frames')
+
+        # Decode short sources up front, so they can be scaled all at once
+        # whenever the tile's size is set.
+        self._preloaded = len(self._source) <= cache_size
+        if self._preloaded:
+            frames = [
+                self._source.frame(index)
+                for index in range(len(self._source))
+            ]
+            self._source.close()
+            self._source = _ArraySource(frames)
+
+        self._fps = fps
+        self._loop = loop
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._frame_num = -1
+        self._pixels_stale = True
+        self._start_time = None
+        self._finished = False
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        super(MediaTile, self).__init__(
+            default_color=default_color, animate=animate)
+
+    def __repr__(self):
+        return '{}(frames={}, fps={}, loop={}, cache_size={})'.format(
+            self.__class__.__name__, len(self._source), self._fps,
+            self._loop, self._cache_size
+        )
+
+    def on_size_set(self):
+        """
+        Scale the frames to the tile's new size: all of them if the source
+        was decoded up front, otherwise each one when it's next displayed.
+        """
+        self._cache.clear()
+        self._pixels_stale = True
+
+        if self._preloaded:
+            for index in range(len(self._source)):
+                self._scaled_frame(index)
+
+    def _scaled_frame(self, index):
+        """
+        The pixels of a frame scaled to the tile's size, from the cache if
+        possible.
+
+        :param index: (int) The frame number.
+        :return: ([[:class:`PixelColor`]]) The frame's pixels.
+        """
+        pixels = self._cache.pop(index, None)
+
+        if pixels is None:
+            self.cache_misses += 1
+            frame = self._source.frame(index)
+
+            rows, cols = frame.shape[:2]
+            row_index = np.arange(self.size.rows) * rows // self.size.rows
+            col_index = np.arange(self.size.cols) * cols // self.size.cols
+            scaled = frame[row_index[:, np.newaxis], col_index]
+
+            values = np.zeros(scaled.shape[:2] + (4,), dtype=np.float32)
+            values[..., :scaled.shape[2]] = scaled[..., :4]
+            pixels = array_to_pixels(
+                values, np.full(scaled.shape[:2], scaled.shape[2] > 3))
+
+            if len(self._cache) >= self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self.cache_hits += 1
+
+        self._cache[index] = pixels
+
+        return pixels
+
+    def _next_frame_num(self):
+        """
+        The number of the frame to display next, before looping.
+        """
+        if self._fps is None:
+            return self._frame_num + 1
+
+        now = self.time
+        if self._start_time is None:
+            self._start_time = now
+
+        return int((now - self._start_time) * self._fps)
+
+    def draw(self):
+        """
+        Display the current frame.
+        """
+        frame_count = len(self._source)
+        frame_num = self._next_frame_num()
+
+        if frame_num >= frame_count:
+            if self._loop:
+                frame_num %= frame_count
+            else:
+                frame_num = frame_count - 1
+                self._finished = True
+
+        if frame_num == self._frame_num and not self._pixels_stale:
+            return
+
+        pixels = self._scaled_frame(frame_num)
+        self._frame_num = frame_num
+        self._pixels_stale = False
+        self._pixels = [list(row) for row in pixels]
+
+    def close(self):
+        """
+        Close the source file, if it's held open.
+        """
+        self._source.close()
+
+    @property
+    def frame_count(self):
+        """
+        (int) Number of frames in the source.
+        """
+        return len(self._source)
+
+    @property
+    def frame_num(self):
+        """
+        (int) Number of the frame on display, or -1 before the first frame.
+        """
+        return self._frame_num
+
+    @property
+    def finished(self):
+        """
+        (bool) Whether the last frame has been displayed and the animation
+        doesn't loop.
+        """
+        return self._finished
@@ -0,0 +1,380 @@
+from __future__ import division
+import socket
+import struct
+import threading
+import uuid
+
+import numpy as np
+
+from neotiles.exceptions import NeoTilesError
+
+
+PROTOCOL_E131 = 'e131'
+PROTOCOL_OPC = 'opc'
+PROTOCOLS = (PROTOCOL_E131, PROTOCOL_OPC)
+
+DEFAULT_PORTS = {
+    PROTOCOL_E131: 5568,
+    PROTOCOL_OPC: 7890,
+}
+
+# The largest UDP payload which fits in a standard 1500 byte Ethernet frame
+# (after the 20 byte IP header and 8 byte UDP header).
+DEFAULT_MAX_PACKET_SIZE = 1472
+
+# E1.31 (sACN) data packet header: root layer, framing layer, and DMP layer,
+# followed by up to 512 DMX slots.
+E131_IDENTIFIER = b'ASC-E1.17\0\0\0'
+E131_MAX_SLOTS = 512
+_E131_HEADER = struct.Struct('>HH12sHI16sHI64sBHBBHHBBHHHB')
+_E131_SEQUENCE_OFFSET = 111
+_E131_UNIVERSE = struct.Struct('>H')
+_E131_UNIVERSE_OFFSET = 113
+_E131_SLOT_COUNT_OFFSET = 123
+
+# Open Pixel Control message header: channel, command, data length.
+OPC_SET_PIXEL_COLORS = 0
+_OPC_HEADER = struct.Struct('>BBH')
+
+# Both protocols send 8-bit RGB.
+CHANNELS = 3
+
+
+def pixels_per_packet(protocol, max_packet_size=DEFAULT_MAX_PACKET_SIZE):
+    """
+    Get the number of RGB pixels which fit in one packet.  E1.31 packets are
+    also limited to the 170 whole pixels which fit in a 512 slot universe.
+
+    :param protocol: (str) One of :data:`PROTOCOLS`.
+    :param max_packet_size: (int) Maximum packet size in bytes.
+    :return: (int) The number of pixels.
+    :raises: :class:`exceptions.NeoTilesError` if the protocol is not valid
+        or not even one pixel fits in a packet.
+    """
+    if protocol == PROTOCOL_E131:
+        slots = min(E131_MAX_SLOTS, max_packet_size - _E131_HEADER.size)
+    elif protocol == PROTOCOL_OPC:
+        slots = max_packet_size - _OPC_HEADER.size
+    else:
+        raise NeoTilesError('protocol must be one of {}'.format(
+            ', '.join(PROTOCOLS)))
+
+    pixels = slots // CHANNELS
+    if pixels < 1:
+        raise NeoTilesError(
+            'max_packet_size {} is too small'.format(max_packet_size))
+
+    return pixels
+
+
+def e131_packet(universe, slot_count, cid, source_name, priority=100):
+    """
+    Create an E1.31 data packet with room for ``slot_count`` DMX slots.  The
+    slots are initially zero.
+
+    :param universe: (int) DMX universe number (1-63999).
+    :param slot_count: (int) Number of DMX slots.
+    :param cid: (bytes) 16 byte component identifier of the sender.
+    :param source_name: (str) Name of the sender.
+    :param priority: (int) Priority of the data (0-200).
+    :return: (bytearray) The packet.
+    """
+    length = _E131_HEADER.size + slot_count
+    header = _E131_HEADER.pack(
+        # Root layer.
+        0x0010, 0, E131_IDENTIFIER, 0x7000 | (length - 16), 0x00000004, cid,
+        # Framing layer.
+        0x7000 | (length - 38), 0x00000002,
+        source_name.encode('utf-8')[:63], priority, 0, 0, 0, universe,
+        # DMP layer.
+        0x7000 | (length - 115), 0x02, 0xa1, 0, 1, slot_count + 1, 0,
+    )
+
+    return bytearray(header) + bytearray(slot_count)
+
+
+def opc_packet(channel, pixel_count):
+    """
+    Create an Open Pixel Control "set pixel colors" message with room for
+    ``pixel_count`` RGB pixels.  The pixels are initially black.
+
+    :param channel: (int) OPC channel (1-255).
+    :param pixel_count: (int) Number of pixels.
+    :return: (bytearray) The packet.
+    """
+    data_length = pixel_count * CHANNELS
+    header = _OPC_HEADER.pack(channel, OPC_SET_PIXEL_COLORS, data_length)
+
+    return bytearray(header) + bytearray(data_length)
+
+
+class PacketWriter(object):
+    """
+    Splits a strip of RGB pixels into E1.31 or OPC packets and sends them.
+
+    Every packet is allocated once, up front; sending a strip copies each
+    packet's share of the pixels into its packet in place.  Consecutive
+    packets use consecutive universes (E1.31) or channels (OPC), starting at
+    ``first_address``.  If ``changed_only=True`` then packets whose pixels
+    haven't changed since they were last sent are skipped, although every
+    packet is resent at least every ``keepalive`` seconds (E1.31 receivers
+    stop displaying data after 2.5 seconds without it).
+
+    This is used by :class:`~neotiles.matrixes.NTNetworkMatrix`.
+
+    :param pixel_count: (int) Number of pixels in the strip.
+    :param address: (tuple) The ``(host, port)`` to send to.
+    :param protocol: (str) One of :data:`PROTOCOLS`.
+    :param first_address: (int) The first universe (E1.31) or channel (OPC).
+    :param max_packet_size: (int) Maximum packet size in bytes.
+    :param changed_only: (bool) Whether to skip unchanged packets.
+    :param keepalive: (float|None) Maximum seconds between sends of each
+        packet when ``changed_only=True``.
+    :param source_name: (str) Name of the sender (E1.31 only).
+    """
+    def __init__(
+            self, pixel_count, address, protocol=PROTOCOL_E131,
+            first_address=1, max_packet_size=DEFAULT_MAX_PACKET_SIZE,
+            changed_only=False, keepalive=1.0, source_name='neotiles'):
+
+        self.address = address
+        self.protocol = protocol
+        self.changed_only = changed_only
+        self.keepalive = keepalive
+
+        self.packets_sent = 0
+        self.packets_skipped = 0
+
+        per_packet = pixels_per_packet(protocol, max_packet_size)
+        cid = uuid.uuid4().bytes
+
+        # Each entry is [packet, pixel data view into the packet, first byte
+        # in the strip, last time sent].
+        self._packets = []
+        strip_size = pixel_count * CHANNELS
+        packet_size = per_packet * CHANNELS
+        for packet_num, start in enumerate(
+                range(0, strip_size, packet_size)):
+            data_size = min(packet_size, strip_size - start)
+
+            if protocol == PROTOCOL_E131:
+                packet = e131_packet(
+                    first_address + packet_num, data_size, cid, source_name)
+                header_size = _E131_HEADER.size
+            else:
+                packet = opc_packet(
+                    first_address + packet_num, data_size // CHANNELS)
+                header_size = _OPC_HEADER.size
+
+            data = np.frombuffer(packet, dtype=np.uint8, offset=header_size)
+            self._packets.append([packet, data, start, None])
+
+        self._sequence = 0
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __len__(self):
+        return len(self._packets)
+
+    def send(self, strip, now):
+        """
+        Send a strip of pixels.
+
+        :param strip: (numpy.ndarray) uint8 array of shape ``(pixels, 3)``.
+        :param now: (float) The current time, in seconds.
+        :return: (int) The number of packets sent.
+        """
+        strip = strip.reshape(-1)
+        self._sequence = (self._sequence + 1) % 256
+        sent = 0
+
+        for entry in self._packets:
+            packet, data, start, last_sent = entry
+            pixels = strip[start:start + len(data)]
+
+            if (self.changed_only and last_sent is not None and
+                    np.array_equal(data, pixels) and (
+                        self.keepalive is None or
+                        now - last_sent < self.keepalive)):
+                self.packets_skipped += 1
+                continue
+
+            data[:] = pixels
+            if self.protocol == PROTOCOL_E131:
+                packet[_E131_SEQUENCE_OFFSET] = self._sequence
+
+            self._socket.sendto(packet, self.address)
+            entry[3] = now
+            sent += 1
+
+        self.packets_sent += sent
+
+        return sent
+
+    def close(self):
+        """
+        Close the socket.
+        """
+        self._socket.close()
+
+
+class PixelReceiver(object):
+    """
+    A stand-in for a network LED controller, for testing a
+    :class:`~neotiles.matrixes.NTNetworkMatrix` without one.
+
+    The receiver listens for E1.31 or OPC packets on a UDP port and writes
+    their pixels into :attr:`strip`, a uint8 array of shape
+    ``(pixel_count, 3)``, in the same way a controller would.  The receiver
+    must be configured with the same packet layout (``first_address`` and
+    ``max_packet_size``) as the sender.  ::
+
+        receiver = PixelReceiver(64, protocol='e131')
+        matrix = NTNetworkMatrix(
+            size=(8, 8), host='127.0.0.1', port=receiver.address[1])
+
+        receiver.start()
+        ...
+        receiver.stop()
+
+    Packets can be processed either by calling :meth:`receive` or in a
+    background thread with :meth:`start`.
+
+    :param pixel_count: (int) Number of pixels in the strip.
+    :param protocol: (str) One of :data:`PROTOCOLS`.
+    :param host: (str) Address to listen on.
+    :param port: (int) Port to listen on (0 picks a free port).
+    :param first_address: (int) The first universe (E1.31) or channel (OPC).
+    :param max_packet_size: (int) Maximum packet size in bytes.
+    :raises: :class:`exceptions.NeoTilesError` if the protocol is not valid.
+    """
+    def __init__(
+            self, pixel_count, protocol=PROTOCOL_E131, host='127.0.0.1',
+            port=0, first_address=1,
+            max_packet_size=DEFAULT_MAX_PACKET_SIZE):
+
+        self.protocol = protocol
+        self.first_address = first_address
+        self.pixels_per_packet = pixels_per_packet(protocol, max_packet_size)
+
+        self.strip = np.zeros((pixel_count, CHANNELS), dtype=np.uint8)
+        self.packets_received = 0
+        self.packets_rejected = 0
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((host, port))
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __repr__(self):
+        return '{}(pixel_count={}, protocol={}, address={})'.format(
+            self.__class__.__name__, len(self.strip), repr(self.protocol),
+            self.address
+        )
+
+    def _parse(self, packet):
+        """
+        Get the packet's address (universe or channel) and pixel data.
+
+        :return: (tuple|None) ``(address, data)``, or None if the packet is
+            not valid.
+        """
+        if self.protocol == PROTOCOL_E131:
+            if (len(packet) < _E131_HEADER.size or
+                    packet[4:16] != E131_IDENTIFIER):
+                return None
+
+            universe, = _E131_UNIVERSE.unpack_from(
+                packet, _E131_UNIVERSE_OFFSET)
+            slot_count, = _E131_UNIVERSE.unpack_from(
+                packet, _E131_SLOT_COUNT_OFFSET)
+
+            return universe, packet[
+                _E131_HEADER.size:_E131_HEADER.size + slot_count - 1]
+
+        if len(packet) < _OPC_HEADER.size:
+            return None
+
+        channel, command, length = _OPC_HEADER.unpack_from(packet)
+        if command != OPC_SET_PIXEL_COLORS:
+            return None
+
+        return channel, packet[_OPC_HEADER.size:_OPC_HEADER.size + length]
+
+    def _process(self, packet):
+        parsed = self._parse(packet)
+        if parsed is None:
+            self.packets_rejected += 1
+            return
+
+        address, data = parsed
+        first_pixel = (address - self.first_address) * self.pixels_per_packet
+        if first_pixel < 0 or first_pixel >= len(self.strip):
+            self.packets_rejected += 1
+            return
+
+        pixels = np.frombuffer(
+            data, dtype=np.uint8, count=len(data) // CHANNELS * CHANNELS)
+        pixels = pixels.reshape(-1, CHANNELS)[:len(self.strip) - first_pixel]
+
+        self.strip[first_pixel:first_pixel + len(pixels)] = pixels
+        self.packets_received += 1
+
+    def receive(self, timeout=0.1):
+        """
+        Process all waiting packets, waiting up to ``timeout`` seconds for the
+        first one.
+
+        :param timeout: (float) Seconds to wait for a packet.
+        :return: (int) The number of packets processed.
+        """
+        received = 0
+        self._socket.settimeout(timeout)
+
+        try:
+            while True:
+                self._process(self._socket.recv(65535))
+                received += 1
+
+                # Don't wait for any packets after the first.
+                self._socket.settimeout(0)
+        except socket.error:
+            # Timed out, or no more packets waiting.
+            pass
+
+        return received
+
+    def start(self):
+        """
+        Start processing packets in a background thread.
+        """
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.receive(timeout=0.05)
+
+    def stop(self):
+        """
+        Stop the background thread and close the socket.  Any packets which
+        have already arrived are processed first.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+        self.receive(timeout=0)
+        self._socket.close()
+
+    @property
+    def address(self):
+        """
+        (tuple) The ``(host, port)`` the receiver is listening on.
+        """
+        return self._socket.getsockname()
@@ -0,0 +1,165 @@
+from __future__ import division
+
+import numpy as np
+
+from neotiles.exceptions import NeoTilesError
+
+
+# Typical current draw (in milliamps) of a WS2812-style LED's red, green,
+# blue, and white channels at full intensity.
+DEFAULT_CHANNEL_MA = (20, 20, 20, 20)
+
+
+class PowerLimiter(object):
+    """
+    Keeps the estimated current drawn by a matrix within a budget.
+
+    The current drawn by a frame is estimated in one vectorized pass from the
+    sum of each of its channels: each channel of each pixel draws up to
+    ``channel_ma`` milliamps at full intensity (255), scaled linearly by its
+    value and by the matrix's brightness; and each pixel draws ``idle_ma``
+    milliamps even when it's off.
+
+    If a frame's estimated draw is over ``budget_ma`` then :meth:`limit`
+    scales it down to fit: either by scaling every pixel of the frame, or
+    (if ``limit_brightness=True``) by lowering the matrix's brightness for
+    that frame.  Limiting the brightness keeps the frame's full color
+    resolution on matrixes which dim in hardware (such as RGB matrixes),
+    whose brightness ranges from 0 to ``max_brightness``.
+
+    Pass a PowerLimiter to a :class:`~neotiles.TileManager` to limit every
+    frame it displays: ::
+
+        limiter = PowerLimiter(budget_ma=4000)
+        tiles = TileManager(matrix, power_limiter=limiter)
+
+    :attr:`estimated_ma` and :attr:`limited_ma` report the draw of the most
+    recent frame before and after limiting.
+
+    :param budget_ma: (float) Maximum current, in milliamps.
+    :param channel_ma: (tuple) Current drawn by the red, green, blue, and
+        white channels of one pixel at full intensity, in milliamps.
+    :param idle_ma: (float) Current drawn by one pixel when it's off, in
+        milliamps.
+    :param limit_brightness: (bool) Whether to lower the matrix's brightness
+        rather than scaling the frame.
+    :param max_brightness: (int) The matrix's full brightness.
+    :raises: :class:`exceptions.NeoTilesError` if the budget is not positive
+        or ``channel_ma`` does not have 4 values.
+    """
+    def __init__(
+            self, budget_ma, channel_ma=DEFAULT_CHANNEL_MA, idle_ma=0.0,
+            limit_brightness=False, max_brightness=255):
+        if budget_ma <= 0:
+            raise NeoTilesError('budget_ma must be positive')
+
+        if len(channel_ma) != 4:
+            raise NeoTilesError(
+                'channel_ma must have red, green, blue, and white values')
+
+        self._budget_ma = budget_ma
+        self._channel_ma = tuple(channel_ma)
+        self._coefficients = np.array(channel_ma, dtype=np.float64) / 255
+        self._idle_ma = idle_ma
+        self._limit_brightness = limit_brightness
+        self._max_brightness = max_brightness
+
+        self.estimated_ma = 0.0
+        self.limited_ma = 0.0
+        self.scale = 1.0
+        self.frames_limited = 0
+
+    def __repr__(self):
+        return (
+            '{}(budget_ma={}, channel_ma={}, idle_ma={}, limit_brightness={}, '
+            'max_brightness={})'
+        ).format(
+            self.__class__.__name__, self._budget_ma, self._channel_ma,
+            self._idle_ma, self._limit_brightness, self._max_brightness
+        )
+
+    def _frame_ma(self, frame):
+        """
+        Estimate the current drawn by a frame's lit channels at full
+        brightness (leaving out the idle current).
+        """
+        channel_sums = frame.reshape(-1, 4).sum(axis=0, dtype=np.uint64)
+
+        return float(np.dot(channel_sums, self._coefficients))
+
+    def _brightness_factor(self, brightness):
+        if brightness is None:
+            return 1.0
+
+        return brightness / self._max_brightness
+
+    def estimate(self, frame, brightness=None):
+        """
+        Estimate the current drawn by displaying a frame.
+
+        :param frame: (numpy.ndarray) The frame, a uint8 array of shape
+            ``(rows, cols, 4)``.
+        :param brightness: (int|None) The matrix's brightness, or None for
+            full brightness.
+        :return: (float) The estimated current, in milliamps.
+        """
+        idle_ma = self._idle_ma * (frame.size // 4)
+
+        return idle_ma + (
+            self._frame_ma(frame) * self._brightness_factor(brightness))
+
+    def limit(self, frame, brightness=None):
+        """
+        Limit a frame to the budget.
+
+        The returned frame is ``frame`` itself if it doesn't need scaling.
+
+        :param frame: (numpy.ndarray) The frame, a uint8 array of shape
+            ``(rows, cols, 4)``.
+        :param brightness: (int|None) The matrix's brightness, or None for
+            full brightness.
+        :return: (tuple) The ``(frame, brightness)`` to display.
+        """
+        idle_ma = self._idle_ma * (frame.size // 4)
+        lit_ma = self._frame_ma(frame) * self._brightness_factor(brightness)
+
+        self.estimated_ma = idle_ma + lit_ma
+
+        if self.estimated_ma <= self._budget_ma:
+            self.scale = 1.0
+            self.limited_ma = self.estimated_ma
+            return frame, brightness
+
+        scale = max(self._budget_ma - idle_ma, 0) / lit_ma
+
+        if self._limit_brightness and brightness is not None:
+            limited_brightness = int(brightness * scale)
+            scale = limited_brightness / brightness
+            brightness = limited_brightness
+        else:
+            frame = (frame * scale).astype(np.uint8)
+
+        self.scale = scale
+        self.limited_ma = idle_ma + lit_ma * scale
+        self.frames_limited += 1
+
+        return frame, brightness
+
+    @property
+    def budget_ma(self):
+        """
+        (float) Get or set the maximum current, in milliamps.
+        """
+        return self._budget_ma
+
+    @budget_ma.setter
+    def budget_ma(self, val):
+        error_msg = 'budget_ma must be positive'
+
+        try:
+            if val <= 0:
+                raise ValueError(error_msg)
+        except TypeError:
+            raise ValueError(error_msg)
+
+        self._budget_ma = val
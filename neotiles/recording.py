@@ -0,0 +1,282 @@
+from __future__ import division
+import mmap
+import struct
+import time
+
+from neotiles import MatrixSize
+from neotiles.codec import FRAME_KEY, FrameDecoder, FrameEncoder
+from neotiles.exceptions import NeoTilesError
+
+
+# A recording is a file header followed by any number of frames.  Each frame
+# is a frame header followed by a payload encoded by a
+# neotiles.codec.FrameEncoder.  All values are little-endian.
+MAGIC = b'NTRC'
+VERSION = 2
+
+# magic, version, cols, rows, channel layout (padded with NULs).
+_FILE_HEADER = struct.Struct('<4sHHH4s')
+
+# timestamp, frame type, payload size.
+_FRAME_HEADER = struct.Struct('<dBI')
+
+
+class FrameRecorder(object):
+    """
+    Writes frames to a recording file which can be played back later with a
+    :class:`FramePlayer`.
+
+    Frames are uint8 arrays of shape ``(rows, cols, 4)`` (see
+    :func:`~neotiles.framebuffer.pixels_to_frame`), each stored with a
+    timestamp.  If ``channel_layout='RGB'`` then the white component is
+    discarded, which makes the recording smaller.  If ``delta=True`` then
+    frames are encoded by a :class:`~neotiles.codec.FrameEncoder` as the
+    pixels which changed since the previous frame, with a keyframe every
+    ``keyframe_interval`` frames so playback can start part way through.
+
+    Usually you'll want :meth:`TileManager.start_recording` rather than
+    creating a FrameRecorder yourself.  ::
+
+        with FrameRecorder('clock.ntr', size=(8, 8)) as recorder:
+            recorder.write(frame, time.time())
+
+    :param path: (str) Path of the recording file to write.
+    :param size: (:class:`MatrixSize`) Size of the frames.
+    :param channel_layout: (str) ``'RGBW'`` or ``'RGB'``.
+    :param delta: (bool) Whether to delta-encode frames.
+    :param keyframe_interval: (int) Maximum number of frames between
+        keyframes when delta-encoding.
+    :raises: :class:`exceptions.NeoTilesError` if ``channel_layout`` is not
+        valid.
+    """
+    def __init__(
+            self, path, size, channel_layout='RGBW', delta=True,
+            keyframe_interval=100):
+
+        self._size = MatrixSize(*size)
+        self._channel_layout = channel_layout
+        self._delta = delta
+        self._encoder = FrameEncoder(
+            self._size, channel_layout=channel_layout,
+            keyframe_interval=keyframe_interval if delta else 1)
+
+        self.frames_written = 0
+
+        self._file = open(path, 'wb')
+        self._file.write(_FILE_HEADER.pack(
+            MAGIC, VERSION, self._size.cols, self._size.rows,
+            channel_layout.encode('ascii')))
+
+    def __repr__(self):
+        return '{}(path={}, size={}, channel_layout={}, delta={})'.format(
+            self.__class__.__name__, repr(self._file.name), self._size,
+            repr(self._channel_layout), self._delta
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, frame, timestamp):
+        """
+        Add a frame to the recording.
+
+        :param frame: (numpy.ndarray) The frame, a uint8 array of shape
+            ``(rows, cols, 4)``.
+        :param timestamp: (float) The time of the frame, in seconds.
+        """
+        frame_type, payload = self._encoder.encode(frame)
+
+        self._file.write(
+            _FRAME_HEADER.pack(timestamp, frame_type, len(payload)))
+        self._file.write(payload)
+
+        self.frames_written += 1
+
+    def close(self):
+        """
+        Finish the recording and close the file.
+        """
+        self._file.close()
+
+
+class FramePlayer(object):
+    """
+    Plays back a recording made by a :class:`FrameRecorder`.
+
+    The recording file is memory-mapped rather than read, so playing back a
+    long recording doesn't need to hold it all in memory.  Frames are
+    decoded by a :class:`~neotiles.codec.FrameDecoder` straight into the
+    matrix's :attr:`~neotiles.matrixes.NTMatrix.framebuffer` if it has one,
+    or otherwise into a single preallocated frame which is sent to the
+    matrix with :meth:`~neotiles.matrixes.NTMatrix.setFrame`, so playback
+    does very little work per frame.  A recording which was cut short (for
+    example by a crash while it was being written) is played up to its last
+    complete frame.  ::
+
+        with FramePlayer('clock.ntr') as player:
+            player.play(NTNeoPixelMatrix(size=(8, 8), led_pin=18))
+
+    :param path: (str) Path of the recording file to play.
+    :raises: :class:`exceptions.NeoTilesError` if the file is not a
+        recording.
+    """
+    def __init__(self, path):
+        self._path = path
+
+        with open(path, 'rb') as recording:
+            try:
+                self._mmap = mmap.mmap(
+                    recording.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # The file is empty.
+                raise NeoTilesError('{} is not a recording'.format(path))
+
+        try:
+            magic, version, cols, rows, layout = _FILE_HEADER.unpack_from(
+                self._mmap)
+        except struct.error:
+            self.close()
+            raise NeoTilesError('{} is not a recording'.format(path))
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise NeoTilesError('{} is not a recording'.format(path))
+
+        self._size = MatrixSize(cols, rows)
+        self._channel_layout = layout.rstrip(b'\0').decode('ascii')
+
+        # Index the frames by walking the frame headers: a list of
+        # (timestamp, frame type, payload offset, payload size).  A recording
+        # which was cut short (say by a crash) ends at its last whole frame.
+        self._index = []
+        offset = _FILE_HEADER.size
+        while offset + _FRAME_HEADER.size <= len(self._mmap):
+            timestamp, frame_type, payload_size = _FRAME_HEADER.unpack_from(
+                self._mmap, offset)
+            offset += _FRAME_HEADER.size
+            if offset + payload_size > len(self._mmap):
+                break
+
+            self._index.append((timestamp, frame_type, offset, payload_size))
+            offset += payload_size
+
+        self._decoder = FrameDecoder(self._size, self._channel_layout)
+
+    def __repr__(self):
+        return '{}(path={})'.format(self.__class__.__name__, repr(self._path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._index)
+
+    def _decoded_frames(self, decoder, start=0):
+        """
+        Decode frames into ``decoder``, starting from frame number ``start``.
+        This is a generator which yields each frame's timestamp once it has
+        been decoded.
+        """
+        # Start decoding from the last keyframe at or before the first frame
+        # we want.
+        first = start
+        while first > 0 and self._index[first][1] != FRAME_KEY:
+            first -= 1
+
+        decoder.reset()
+
+        for frame_num in range(first, len(self._index)):
+            timestamp, frame_type, offset, payload_size = self._index[
+                frame_num]
+            decoder.decode(frame_type, self._mmap, offset, payload_size)
+
+            if frame_num >= start:
+                yield timestamp
+
+    def frames(self, start=0):
+        """
+        Decode the frames in the recording.  This is a generator which yields
+        a ``(timestamp, frame)`` tuple for each frame.
+
+        The same frame array is updated in place for every frame, so copy it
+        if you need to keep it.
+
+        :param start: (int) The frame number to start from.
+        """
+        for timestamp in self._decoded_frames(self._decoder, start):
+            yield timestamp, self._decoder.frame
+
+    def play(self, matrix, speed=1.0, loop=False):
+        """
+        Play the recording on a matrix, keeping the frames' original timing.
+
+        :param matrix: (:class:`~neotiles.matrixes.NTMatrix`) The matrix to
+            play the recording on.
+        :param speed: (float) Playback speed (``2.0`` plays twice as fast).
+        :param loop: (bool) Whether to keep playing the recording from the
+            start once it ends.
+        :raises: :class:`exceptions.NeoTilesError` if the matrix is not the
+            same size as the recording.
+        """
+        if MatrixSize(*matrix.size) != self._size:
+            raise NeoTilesError(
+                'matrix size {} does not match recording size {}'.format(
+                    matrix.size, self._size))
+
+        framebuffer = matrix.framebuffer
+        decoder = FrameDecoder(
+            self._size, self._channel_layout, frame=framebuffer)
+
+        while True:
+            start = None
+
+            for timestamp in self._decoded_frames(decoder):
+                if start is None:
+                    start = time.time() - timestamp / speed
+
+                delay = start + timestamp / speed - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+
+                if framebuffer is None:
+                    matrix.setFrame(decoder.frame)
+                matrix.show()
+
+            if not loop or not self._index:
+                return
+
+    def close(self):
+        """
+        Close the recording file.
+        """
+        self._mmap.close()
+
+    @property
+    def size(self):
+        """
+        (:class:`MatrixSize`) The size of the recorded frames.
+        """
+        return self._size
+
+    @property
+    def channel_layout(self):
+        """
+        (str) The channels stored for each pixel (``'RGBW'`` or ``'RGB'``).
+        """
+        return self._channel_layout
+
+    @property
+    def duration(self):
+        """
+        (float) Seconds between the first and last frames.
+        """
+        if not self._index:
+            return 0
+
+        return self._index[-1][0] - self._index[0][0]
@@ -0,0 +1,269 @@
+from __future__ import division
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from neotiles import MatrixSize
+from neotiles.exceptions import NeoTilesError
+
+
+# A scene file is a header followed by a zlib-compressed body.  The body is
+# the frame sequence (a uint32 index into the unique frames for every frame
+# of the scene) followed by the unique frames themselves (uint8 RGBW, row by
+# row).  All values are little-endian.
+MAGIC = b'NTSN'
+VERSION = 1
+
+# magic, version, cols, rows, fps, frame count, unique frame count, loops.
+_HEADER = struct.Struct('<4sHHHdII?')
+
+
+class Scene(object):
+    """
+    A precompiled ("baked") animation: a sequence of frames to be played at a
+    fixed frame rate.
+
+    Scenes are usually created with :meth:`TileManager.bake`, which renders
+    a set of tiles offline.  Identical frames are only stored once, so a
+    scene is often much smaller than its frame count suggests.  Playing a
+    scene back needs no tiles at all -- just a bulk copy of each frame to the
+    matrix -- so an animation too expensive to draw in real time on a small
+    controller can be baked elsewhere and played there.  ::
+
+        # On a fast machine.
+        tiles = TileManager(NTVirtualMatrix(size=(8, 8)), draw_fps=None)
+        tiles.register_tile(FireTile(), size=(8, 8), root=(0, 0))
+        tiles.bake(duration=60, fps=30).save('fire.nts')
+
+        # On the controller.
+        Scene.load('fire.nts').play(
+            NTNeoPixelMatrix(size=(8, 8), led_pin=18), loop=True)
+
+    :param frames: (numpy.ndarray) The unique frames, a uint8 array of shape
+        ``(unique_frames, rows, cols, 4)``.
+    :param sequence: ([int]) Index into ``frames`` of each frame of the
+        scene, in order.
+    :param fps: (float) Frame rate of the scene.
+    :param loops: (bool) Whether the scene loops seamlessly.
+    :raises: :class:`exceptions.NeoTilesError` if ``sequence`` refers to a
+        frame which doesn't exist.
+    """
+    def __init__(self, frames, sequence, fps, loops=False):
+        self._frames = np.ascontiguousarray(frames, dtype=np.uint8)
+        self._sequence = np.asarray(sequence, dtype=np.uint32)
+        self._fps = float(fps)
+        self._loops = loops
+
+        if len(self._sequence) and (
+                self._sequence.max() >= len(self._frames)):
+            raise NeoTilesError('sequence refers to a missing frame')
+
+        self._size = MatrixSize(self._frames.shape[2], self._frames.shape[1])
+
+    def __repr__(self):
+        return (
+            '{}(size={}, frames={}, unique_frames={}, fps={}, loops={})'
+        ).format(
+            self.__class__.__name__, self._size, len(self),
+            self.unique_frames, self._fps, self._loops
+        )
+
+    def __len__(self):
+        return len(self._sequence)
+
+    @classmethod
+    def from_frames(cls, frames, fps, detect_loop=True):
+        """
+        Create a scene from rendered frames, storing identical frames only
+        once.
+
+        If ``detect_loop=True`` then the scene is trimmed to the shortest
+        period which the frames repeat with (provided the frames contain at
+        least two repetitions of it), and the scene is marked as looping.
+
+        :param frames: ([numpy.ndarray]) The frames, each a uint8 array of
+            shape ``(rows, cols, 4)``.
+        :param fps: (float) Frame rate of the frames.
+        :param detect_loop: (bool) Whether to look for a loop.
+        :return: (:class:`Scene`) The scene.
+        :raises: :class:`exceptions.NeoTilesError` if there are no frames.
+        """
+        unique = {}
+        unique_frames = []
+        sequence = []
+
+        for frame in frames:
+            key = frame.tobytes()
+            index = unique.get(key)
+            if index is None:
+                index = unique[key] = len(unique_frames)
+                unique_frames.append(np.array(frame, dtype=np.uint8))
+            sequence.append(index)
+
+        if not sequence:
+            raise NeoTilesError('a scene needs at least one frame')
+
+        sequence = np.array(sequence, dtype=np.uint32)
+        loops = False
+
+        if detect_loop:
+            period = cls._find_period(sequence)
+            if period is not None:
+                sequence = sequence[:period]
+                loops = True
+
+        # Drop any unique frames which only appeared after the loop point.
+        used = np.unique(sequence)
+        remap = np.zeros(len(unique_frames), dtype=np.uint32)
+        remap[used] = np.arange(len(used), dtype=np.uint32)
+
+        return cls(
+            np.array([unique_frames[index] for index in used.tolist()]),
+            remap[sequence], fps, loops=loops)
+
+    @staticmethod
+    def _find_period(sequence):
+        """
+        Find the shortest period which ``sequence`` repeats with.  Only
+        periods which repeat at least twice are considered.
+
+        :param sequence: (numpy.ndarray) Frame indexes.
+        :return: (int|None) The period, or None if there isn't one.
+        """
+        for period in np.flatnonzero(sequence == sequence[0]).tolist():
+            if period == 0:
+                continue
+            if period * 2 > len(sequence):
+                break
+            if np.array_equal(sequence[period:], sequence[:-period]):
+                return period
+
+        return None
+
+    def save(self, path):
+        """
+        Write the scene to a file.
+
+        :param path: (str) Path of the scene file.
+        """
+        body = zlib.compress(self._sequence.tobytes() + self._frames.tobytes())
+
+        with open(path, 'wb') as scene_file:
+            scene_file.write(_HEADER.pack(
+                MAGIC, VERSION, self._size.cols, self._size.rows, self._fps,
+                len(self), self.unique_frames, self._loops))
+            scene_file.write(body)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a scene from a file written by :meth:`save`.
+
+        :param path: (str) Path of the scene file.
+        :return: (:class:`Scene`) The scene.
+        :raises: :class:`exceptions.NeoTilesError` if the file is not a scene.
+        """
+        with open(path, 'rb') as scene_file:
+            data = scene_file.read()
+
+        try:
+            (magic, version, cols, rows, fps, frame_count, unique_count,
+             loops) = _HEADER.unpack_from(data)
+            body = zlib.decompress(data[_HEADER.size:])
+        except (struct.error, zlib.error):
+            raise NeoTilesError('{} is not a scene'.format(path))
+
+        if magic != MAGIC or version != VERSION:
+            raise NeoTilesError('{} is not a scene'.format(path))
+
+        sequence_size = frame_count * 4
+        sequence = np.frombuffer(body, dtype=np.uint32, count=frame_count)
+        frames = np.frombuffer(
+            body, dtype=np.uint8, offset=sequence_size).reshape(
+                unique_count, rows, cols, 4)
+
+        return cls(frames, sequence, fps, loops=loops)
+
+    def frames(self):
+        """
+        Get the scene's frames in order.  This is a generator which yields
+        each frame (a uint8 array of shape ``(rows, cols, 4)``).  Frames must
+        not be modified.
+        """
+        frames = self._frames
+        for index in self._sequence.tolist():
+            yield frames[index]
+
+    def play(self, matrix, loop=None, speed=1.0):
+        """
+        Play the scene on a matrix at the scene's frame rate.
+
+        :param matrix: (:class:`~neotiles.matrixes.NTMatrix`) The matrix to
+            play the scene on.
+        :param loop: (bool|None) Whether to keep playing the scene from the
+            start once it ends.  Defaults to whether the scene loops
+            seamlessly (see :attr:`loops`).
+        :param speed: (float) Playback speed (``2.0`` plays twice as fast).
+        :raises: :class:`exceptions.NeoTilesError` if the matrix is not the
+            same size as the scene.
+        """
+        if MatrixSize(*matrix.size) != self._size:
+            raise NeoTilesError(
+                'matrix size {} does not match scene size {}'.format(
+                    matrix.size, self._size))
+
+        if loop is None:
+            loop = self._loops
+
+        frame_seconds = 1 / (self._fps * speed)
+        next_frame = time.time()
+
+        while True:
+            for frame in self.frames():
+                delay = next_frame - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+
+                matrix.setFrame(frame)
+                matrix.show()
+                next_frame += frame_seconds
+
+            if not loop or not len(self):
+                return
+
+    @property
+    def size(self):
+        """
+        (:class:`MatrixSize`) The size of the scene's frames.
+        """
+        return self._size
+
+    @property
+    def fps(self):
+        """
+        (float) The scene's frame rate.
+        """
+        return self._fps
+
+    @property
+    def loops(self):
+        """
+        (bool) Whether the scene loops seamlessly.
+        """
+        return self._loops
+
+    @property
+    def unique_frames(self):
+        """
+        (int) The number of distinct frames in the scene.
+        """
+        return len(self._frames)
+
+    @property
+    def duration(self):
+        """
+        (float) The length of the scene in seconds.
+        """
+        return len(self) / self._fps
@@ -0,0 +1,404 @@
+# Out-of-process output via a shared-memory ring buffer.
+#
+# NTSharedMemoryMatrix (in neotiles.matrixes) writes frames into a ring buffer
+# in a memory-mapped file, and a SharedMemoryDriver -- usually running in a
+# separate process -- reads them and displays them on a hardware matrix, so
+# only the driver needs the privileges required to talk to the hardware.  The
+# driver can be run with:
+#
+#    sudo python -m neotiles.sharedmemory --matrix neopixel --size 8x8 \
+#        --led-pin 18
+
+from __future__ import division, print_function
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from neotiles import MatrixSize
+from neotiles.exceptions import NeoTilesError
+
+
+# The file is a header followed by a ring of slots.  Each slot holds a
+# sequence number, the time the frame was published, and the frame itself.
+# A slot's sequence number is 0 while its frame is being written.  The
+# header's latest sequence number is the most recently published frame,
+# which is in slot (sequence % slots).
+MAGIC = b'NTSM'
+VERSION = 1
+
+# magic, version, cols, rows, slots, brightness.  The brightness is 0-255,
+# or BRIGHTNESS_UNSET until the writer sets one.
+_HEADER = struct.Struct('<4sHHHHH')
+_HEADER_SIZE = 32
+_BRIGHTNESS_OFFSET = 12
+_LATEST_OFFSET = 16
+
+BRIGHTNESS_UNSET = 0xffff
+
+
+def default_path():
+    """
+    Get the default ring buffer path: in ``/dev/shm`` if it exists (so the
+    file is only ever in memory), otherwise in the temporary directory.
+
+    :return: (str) The path.
+    """
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else (
+        tempfile.gettempdir())
+
+    return os.path.join(directory, 'neotiles-matrix')
+
+
+def _slot_dtype(size):
+    return np.dtype([
+        ('sequence', '<u8'),
+        ('timestamp', '<f8'),
+        ('frame', np.uint8, (size.rows, size.cols, 4)),
+    ], align=True)
+
+
+class FrameRing(object):
+    """
+    A ring buffer of frames in a memory-mapped file.
+
+    The writer creates the ring with ``create=True``; readers open the
+    existing file (read-only).  A new ring is built in a temporary file which
+    then replaces any existing ring, so a reader which still has the old ring
+    mapped keeps reading the old (now unlinked) file rather than having it
+    truncated underneath it.  Readers can check :attr:`replaced` to find out
+    when to open the new ring.
+
+    :param path: (str) Path of the file holding the ring.
+    :param size: (:class:`MatrixSize`) Size of the frames (writer only).
+    :param slots: (int) Number of frames in the ring (writer only).
+    :param create: (bool) Whether to create the ring.
+    :raises: :class:`exceptions.NeoTilesError` if the file is not a ring.
+    """
+    def __init__(self, path, size=None, slots=4, create=False):
+        self.path = path
+
+        if create:
+            if size is None or slots < 2:
+                raise NeoTilesError(
+                    'size and at least 2 slots must be specified')
+
+            size = MatrixSize(*size)
+            file_size = _HEADER_SIZE + _slot_dtype(size).itemsize * slots
+
+            directory, name = os.path.split(path)
+            fd, temp_path = tempfile.mkstemp(
+                prefix='.{}.'.format(name), dir=directory or None)
+            try:
+                os.fchmod(fd, 0o644)
+                os.ftruncate(fd, file_size)
+                self._mmap = mmap.mmap(fd, file_size)
+                self._mmap[:_HEADER.size] = _HEADER.pack(
+                    MAGIC, VERSION, size.cols, size.rows, slots,
+                    BRIGHTNESS_UNSET)
+                self._inode = os.fstat(fd).st_ino
+
+                # Atomically replaces any existing ring (on POSIX).
+                os.rename(temp_path, path)
+            except Exception:
+                os.unlink(temp_path)
+                raise
+            finally:
+                os.close(fd)
+        else:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                self._mmap = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+                self._inode = os.fstat(fd).st_ino
+            finally:
+                os.close(fd)
+
+            try:
+                magic, version, cols, rows, slots, _ = _HEADER.unpack_from(
+                    self._mmap)
+            except struct.error:
+                magic = version = None
+
+            if magic != MAGIC or version != VERSION:
+                self._mmap.close()
+                raise NeoTilesError('{} is not a frame ring'.format(path))
+
+            size = MatrixSize(cols, rows)
+
+        self.size = size
+        self.slots = np.ndarray(
+            (slots,), dtype=_slot_dtype(size), buffer=self._mmap,
+            offset=_HEADER_SIZE)
+        self._latest = np.ndarray(
+            (1,), dtype='<u8', buffer=self._mmap, offset=_LATEST_OFFSET)
+        self._brightness = np.ndarray(
+            (1,), dtype='<u2', buffer=self._mmap, offset=_BRIGHTNESS_OFFSET)
+
+    def __repr__(self):
+        return '{}(path={}, size={}, slots={})'.format(
+            self.__class__.__name__, repr(self.path), self.size,
+            len(self.slots)
+        )
+
+    def publish(self, frame, timestamp):
+        """
+        Write a frame into the next slot and make it the latest frame.
+
+        :param frame: (numpy.ndarray) The frame, a uint8 array of shape
+            ``(rows, cols, 4)``.
+        :param timestamp: (float) The time the frame was published.
+        :return: (int) The frame's sequence number.
+        """
+        sequence = int(self._latest[0]) + 1
+        index = sequence % len(self.slots)
+
+        self.slots['sequence'][index] = 0
+        self.slots['frame'][index] = frame
+        self.slots['timestamp'][index] = timestamp
+        self.slots['sequence'][index] = sequence
+        self._latest[0] = sequence
+
+        return sequence
+
+    def close(self):
+        """
+        Unmap the file.
+        """
+        self.slots = self._latest = self._brightness = None
+        self._mmap.close()
+
+    @property
+    def replaced(self):
+        """
+        (bool) Whether the file at :attr:`path` is no longer this ring (for
+        example because a new writer has created a new ring).
+        """
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except OSError:
+            return True
+
+    @property
+    def latest(self):
+        """
+        (int) Sequence number of the latest frame (0 if there isn't one).
+        """
+        return int(self._latest[0])
+
+    @property
+    def brightness(self):
+        """
+        (int|None) The brightness requested by the writer (0-255), or None if
+        it hasn't requested one.
+        """
+        brightness = int(self._brightness[0])
+        return None if brightness == BRIGHTNESS_UNSET else brightness
+
+    @brightness.setter
+    def brightness(self, val):
+        self._brightness[0] = BRIGHTNESS_UNSET if val is None else val
+
+
+class SharedMemoryDriver(object):
+    """
+    Displays frames written by an
+    :class:`~neotiles.matrixes.NTSharedMemoryMatrix` on a matrix.
+
+    Each call to :meth:`poll` displays the latest frame if it's new.  Frames
+    are sent to the matrix straight from shared memory (with
+    :meth:`~neotiles.matrixes.NTMatrix.setFrame`), so nothing is copied on
+    the way.  If the writer is faster than the matrix then the driver skips
+    to the latest frame, counting the skipped frames in
+    :attr:`frames_dropped`.  :attr:`last_latency` is the time between a
+    frame being published and it being shown.
+
+    The matrix's brightness is left alone until the writer sets one.  The
+    writer's brightness (0-255) is scaled to the matrix's range of 0 to
+    ``max_brightness`` (for example 100 for an
+    :class:`~neotiles.matrixes.NTRGBMatrix`).
+
+    :param path: (str) Path of the ring buffer file.
+    :param matrix: (:class:`~neotiles.matrixes.NTMatrix`) The matrix to
+        display frames on.
+    :param max_brightness: (int) The matrix's full brightness.
+    :raises: :class:`exceptions.NeoTilesError` if the matrix is not the same
+        size as the ring buffer's frames.
+    """
+    def __init__(self, path, matrix, max_brightness=255):
+        self.matrix = matrix
+        self.max_brightness = max_brightness
+        self._ring = None
+        self._open_ring(path)
+
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self.frames_torn = 0
+        self.last_latency = 0
+        self.total_latency = 0
+
+    def __repr__(self):
+        return '{}(path={}, matrix={})'.format(
+            self.__class__.__name__, repr(self._ring.path), repr(self.matrix)
+        )
+
+    def _open_ring(self, path):
+        """
+        Open the ring buffer at ``path``, closing the current one (if any).
+        """
+        ring = FrameRing(path)
+
+        if MatrixSize(*self.matrix.size) != ring.size:
+            ring.close()
+            raise NeoTilesError(
+                'matrix size {} does not match frame size {}'.format(
+                    self.matrix.size, ring.size))
+
+        if self._ring is not None:
+            self._ring.close()
+
+        self._ring = ring
+        self._shown = 0
+        self._brightness = None
+
+    def poll(self):
+        """
+        Display the latest frame, if there is a new one.  If a new writer has
+        replaced the ring buffer then the driver switches to the new one.
+
+        :return: (bool) Whether a frame was displayed.
+        :raises: :class:`exceptions.NeoTilesError` if a replacement ring
+            buffer's frames are not the same size as the matrix.
+        """
+        ring = self._ring
+        if ring.latest == self._shown and ring.replaced:
+            self._open_ring(ring.path)
+            ring = self._ring
+
+        slot_count = len(ring.slots)
+
+        while True:
+            sequence = ring.latest
+            if sequence == self._shown:
+                return False
+
+            if sequence < self._shown:
+                # The writer has restarted.
+                self._shown = 0
+
+            brightness = ring.brightness
+            if brightness is not None and brightness != self._brightness:
+                self.matrix.brightness = int(round(
+                    brightness * self.max_brightness / 255))
+                self._brightness = brightness
+
+            index = sequence % slot_count
+            timestamp = ring.slots['timestamp'][index]
+            self.matrix.setFrame(ring.slots['frame'][index])
+
+            if ring.slots['sequence'][index] == sequence:
+                break
+
+            # The writer lapped us and overwrote the frame while it was being
+            # sent.  Try again with the new latest frame.
+            self.frames_torn += 1
+
+        self.matrix.show()
+
+        if self._shown:
+            self.frames_dropped += sequence - self._shown - 1
+        self._shown = sequence
+
+        self.last_latency = time.time() - timestamp
+        self.total_latency += self.last_latency
+        self.frames_shown += 1
+
+        return True
+
+    def run(self, poll_interval=0.001, stop_event=None):
+        """
+        Keep displaying new frames until ``stop_event`` is set (or forever).
+
+        :param poll_interval: (float) Seconds to wait between checks for a
+            new frame.
+        :param stop_event: (threading.Event|None) Event to stop on.
+        """
+        while stop_event is None or not stop_event.is_set():
+            if not self.poll():
+                time.sleep(poll_interval)
+
+    def close(self):
+        """
+        Unmap the ring buffer file.
+        """
+        self._ring.close()
+
+    @property
+    def mean_latency(self):
+        """
+        (float) The mean time between frames being published and shown.
+        """
+        if not self.frames_shown:
+            return 0
+
+        return self.total_latency / self.frames_shown
+
+
+def main(argv=None):
+    """
+    Run a :class:`SharedMemoryDriver` for a neopixel or RGB matrix.
+    """
+    parser = argparse.ArgumentParser(
+        description='Display frames from a shared-memory neotiles matrix.')
+    parser.add_argument('--path', default=default_path())
+    parser.add_argument(
+        '--matrix', choices=['neopixel', 'rgb'], default='neopixel')
+    parser.add_argument(
+        '--size', default='8x8', help='neopixel matrix size (colsxrows)')
+    parser.add_argument('--led-pin', type=int, default=18)
+    parser.add_argument('--rows', type=int, default=32, help='RGB rows')
+    parser.add_argument(
+        '--chain-length', type=int, default=1, help='RGB chain length')
+    parser.add_argument('--poll-interval', type=float, default=0.001)
+    args = parser.parse_args(argv)
+
+    from neotiles.matrixes import NTNeoPixelMatrix, NTRGBMatrix
+
+    if args.matrix == 'neopixel':
+        matrix = NTNeoPixelMatrix(
+            size=[int(dim) for dim in args.size.split('x')],
+            led_pin=args.led_pin)
+        max_brightness = 255
+    else:
+        matrix = NTRGBMatrix(rows=args.rows, chain_length=args.chain_length)
+        max_brightness = 100
+
+    # Wait for the writer to create the ring buffer.
+    if not os.path.exists(args.path):
+        print('waiting for {}'.format(args.path))
+        while not os.path.exists(args.path):
+            time.sleep(0.5)
+
+    driver = SharedMemoryDriver(
+        args.path, matrix, max_brightness=max_brightness)
+    print('displaying frames from {} on {}'.format(args.path, matrix))
+
+    try:
+        driver.run(poll_interval=args.poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print('shown {} frames ({} dropped), mean latency {:.3f} ms'.format(
+            driver.frames_shown, driver.frames_dropped,
+            driver.mean_latency * 1000))
+        driver.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+from __future__ import division
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import numpy as np
+import wrapt
+
+from neotiles.exceptions import NeoTilesError
+from neotiles.framebuffer import array_to_pixels
+from neotiles.tile import Tile
+
+
+# How long the prefetch thread waits for room in the buffer before checking
+# whether it has been stopped.
+_PREFETCH_POLL_SECONDS = 0.05
+
+
+class _StreamEnd(object):
+    """
+    Put in the prefetch buffer after the source's last frame.  Holds the
+    exception which ended the source, if it didn't end normally.
+    """
+    def __init__(self, error=None):
+        self.error = error
+
+
+class StreamTile(Tile):
+    """
+    A tile which displays the frames yielded by an iterator, such as a
+    generator.
+
+    Animations are often easiest to write as generators, which keep their
+    state in local variables rather than on the tile: ::
+
+        def pulse(size):
+            frame = np.zeros((size.rows, size.cols, 4), dtype=np.uint8)
+            while True:
+                for level in range(0, 256, 8):
+                    frame[..., 0] = level
+                    yield frame
+
+        tile = StreamTile(pulse(TileSize(8, 8)))
+        tiles.register_tile(tile, size=(8, 8), root=(0, 0))
+
+    Every call to :meth:`draw` takes exactly one frame from the source.  A
+    frame is either a uint8 array of shape ``(rows, cols, 4)`` (or
+    ``(rows, cols, 3)`` for RGB pixels), or a 2D list of :class:`PixelColor`
+    objects.  Frames are displayed from the tile's top left corner: the part
+    of a frame which lies outside the tile is ignored, and the part of the
+    tile which a frame doesn't cover is left as it was.  When the source is
+    exhausted the last frame stays on display and :attr:`finished` becomes
+    ``True``.
+
+    If the source is slow then pass a ``prefetch`` buffer size: a background
+    thread then reads ahead up to ``prefetch`` frames from the source, so
+    that drawing the tile never waits for it.  If the buffer is empty when the
+    tile is drawn then the previous frame stays on display (and
+    :attr:`frames_missed` is incremented).  An exception raised by the
+    source is raised by :meth:`draw` either way.  Call :meth:`close` to stop
+    the background thread early.
+
+    Note that the source is shared with the background thread, so frames
+    which are arrays should not be modified after they're yielded when
+    prefetching (the pulse example above must yield ``frame.copy()``).
+
+    :param source: (iterable) The frames to display.
+    :param prefetch: (int) Number of frames to read ahead on a background
+        thread, or 0 to read each frame when the tile is drawn.
+    :param default_color: (:class:`PixelColor`) Color of the tile's pixels
+        before the first frame.
+    :param animate: (bool) Whether the tile is animating.
+    :raises: :class:`exceptions.NeoTilesError` if ``prefetch`` is negative.
+    """
+    def __init__(self, source, prefetch=0, default_color=None, animate=True):
+        if prefetch < 0:
+            raise NeoTilesError('prefetch must not be negative')
+
+        super(StreamTile, self).__init__(
+            default_color=default_color, animate=animate)
+
+        self._source = iter(source)
+        self._prefetch = prefetch
+        self._finished = False
+        self._stopped = threading.Event()
+
+        self.frames_drawn = 0
+        self.frames_missed = 0
+
+        if prefetch:
+            self._buffer = queue.Queue(maxsize=prefetch)
+            self._prefetch_thread = threading.Thread(target=self._read_ahead)
+            self._prefetch_thread.daemon = True
+            self._prefetch_thread.start()
+        else:
+            self._buffer = None
+            self._prefetch_thread = None
+
+    def __repr__(self):
+        return '{}(prefetch={})'.format(
+            self.__class__.__name__, self._prefetch
+        )
+
+    def _read_ahead(self):
+        """
+        Internal prefetch thread method.  Reads frames from the source into
+        the buffer until the source ends or the tile is closed.
+        """
+        while not self._stopped.is_set():
+            try:
+                item = next(self._source)
+            except StopIteration:
+                item = _StreamEnd()
+            except Exception as e:
+                item = _StreamEnd(e)
+
+            while not self._stopped.is_set():
+                try:
+                    self._buffer.put(item, timeout=_PREFETCH_POLL_SECONDS)
+                    break
+                except queue.Full:
+                    pass
+
+            if isinstance(item, _StreamEnd):
+                return
+
+    def _next_item(self):
+        """
+        The next frame from the source (or from the prefetch buffer), a
+        :class:`_StreamEnd` if the source has ended, or ``None`` if the
+        prefetch buffer is empty.
+        """
+        if self._buffer is None:
+            try:
+                return next(self._source)
+            except StopIteration:
+                return _StreamEnd()
+
+        try:
+            return self._buffer.get_nowait()
+        except queue.Empty:
+            return None
+
+    @wrapt.synchronized
+    def _set_frame(self, frame):
+        """
+        Copy a frame into the tile's pixels.
+
+        :param frame: (numpy.ndarray|[[:class:`PixelColor`]]) The frame.
+        """
+        if isinstance(frame, np.ndarray):
+            frame = frame[:self.size.rows, :self.size.cols]
+            rows, cols, channels = frame.shape
+            values = np.zeros((rows, cols, 4), dtype=np.float32)
+            values[..., :channels] = frame[..., :4]
+            rgbw = np.full((rows, cols), channels > 3)
+            frame = array_to_pixels(values, rgbw)
+
+        for tile_row, frame_row in zip(self._pixels, frame):
+            cols = min(len(tile_row), len(frame_row))
+            tile_row[:cols] = frame_row[:cols]
+
+    def draw(self):
+        """
+        Display the next frame from the source.
+        """
+        if self._finished:
+            return
+
+        item = self._next_item()
+
+        if item is None:
+            self.frames_missed += 1
+        elif isinstance(item, _StreamEnd):
+            self._finished = True
+            if item.error is not None:
+                raise item.error
+        else:
+            self._set_frame(item)
+            self.frames_drawn += 1
+
+    def close(self):
+        """
+        Stop reading ahead from the source, and wait for the prefetch thread
+        to finish.  The tile draws no more frames once it's closed.
+        """
+        self._stopped.set()
+        self._finished = True
+
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+
+    @property
+    def finished(self):
+        """
+        (bool) Whether the source has no more frames (or the tile has been
+        closed).
+        """
+        return self._finished
+
+    @property
+    def prefetch(self):
+        """
+        (int) Number of frames read ahead on a background thread.
+        """
+        return self._prefetch
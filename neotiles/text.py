@@ -0,0 +1,383 @@
+from __future__ import division
+from collections import OrderedDict
+import threading
+
+import numpy as np
+import wrapt
+
+from neotiles.exceptions import NeoTilesError
+from neotiles.pixelcolor import PixelColor
+from neotiles.tile import Tile
+
+
+# Number of rendered strings kept by render_text().
+TEXT_CACHE_SIZE = 64
+
+# A 5x7 font covering printable ASCII.  Each glyph is a tuple of columns from
+# left to right, and bit 0 of each column is the glyph's top row.
+_FONT_5X7 = {
+    ' ': (0x00, 0x00, 0x00), '!': (0x5f,), '"': (0x07, 0x00, 0x07),
+    '#': (0x14, 0x7f, 0x14, 0x7f, 0x14), '$': (0x24, 0x2a, 0x7f, 0x2a, 0x12),
+    '%': (0x23, 0x13, 0x08, 0x64, 0x62), '&': (0x36, 0x49, 0x55, 0x22, 0x50),
+    "'": (0x05, 0x03), '(': (0x1c, 0x22, 0x41), ')': (0x41, 0x22, 0x1c),
+    '*': (0x14, 0x08, 0x3e, 0x08, 0x14), '+': (0x08, 0x08, 0x3e, 0x08, 0x08),
+    ',': (0x50, 0x30), '-': (0x08, 0x08, 0x08, 0x08, 0x08), '.': (0x60, 0x60),
+    '/': (0x20, 0x10, 0x08, 0x04, 0x02), '0': (0x3e, 0x51, 0x49, 0x45, 0x3e),
+    '1': (0x00, 0x42, 0x7f, 0x40, 0x00), '2': (0x42, 0x61, 0x51, 0x49, 0x46),
+    '3': (0x21, 0x41, 0x45, 0x4b, 0x31), '4': (0x18, 0x14, 0x12, 0x7f, 0x10),
+    '5': (0x27, 0x45, 0x45, 0x45, 0x39), '6': (0x3c, 0x4a, 0x49, 0x49, 0x30),
+    '7': (0x01, 0x71, 0x09, 0x05, 0x03), '8': (0x36, 0x49, 0x49, 0x49, 0x36),
+    '9': (0x06, 0x49, 0x49, 0x29, 0x1e), ':': (0x36, 0x36), ';': (0x56, 0x36),
+    '<': (0x08, 0x14, 0x22, 0x41), '=': (0x14, 0x14, 0x14, 0x14, 0x14),
+    '>': (0x41, 0x22, 0x14, 0x08), '?': (0x02, 0x01, 0x51, 0x09, 0x06),
+    '@': (0x32, 0x49, 0x79, 0x41, 0x3e), 'A': (0x7e, 0x11, 0x11, 0x11, 0x7e),
+    'B': (0x7f, 0x49, 0x49, 0x49, 0x36), 'C': (0x3e, 0x41, 0x41, 0x41, 0x22),
+    'D': (0x7f, 0x41, 0x41, 0x22, 0x1c), 'E': (0x7f, 0x49, 0x49, 0x49, 0x41),
+    'F': (0x7f, 0x09, 0x09, 0x09, 0x01), 'G': (0x3e, 0x41, 0x49, 0x49, 0x7a),
+    'H': (0x7f, 0x08, 0x08, 0x08, 0x7f), 'I': (0x41, 0x7f, 0x41),
+    'J': (0x20, 0x40, 0x41, 0x3f, 0x01), 'K': (0x7f, 0x08, 0x14, 0x22, 0x41),
+    'L': (0x7f, 0x40, 0x40, 0x40, 0x40), 'M': (0x7f, 0x02, 0x0c, 0x02, 0x7f),
+    'N': (0x7f, 0x04, 0x08, 0x10, 0x7f), 'O': (0x3e, 0x41, 0x41, 0x41, 0x3e),
+    'P': (0x7f, 0x09, 0x09, 0x09, 0x06), 'Q': (0x3e, 0x41, 0x51, 0x21, 0x5e),
+    'R': (0x7f, 0x09, 0x19, 0x29, 0x46), 'S': (0x46, 0x49, 0x49, 0x49, 0x31),
+    'T': (0x01, 0x01, 0x7f, 0x01, 0x01), 'U': (0x3f, 0x40, 0x40, 0x40, 0x3f),
+    'V': (0x1f, 0x20, 0x40, 0x20, 0x1f), 'W': (0x3f, 0x40, 0x38, 0x40, 0x3f),
+    'X': (0x63, 0x14, 0x08, 0x14, 0x63), 'Y': (0x07, 0x08, 0x70, 0x08, 0x07),
+    'Z': (0x61, 0x51, 0x49, 0x45, 0x43), '[': (0x7f, 0x41, 0x41),
+    '\\': (0x02, 0x04, 0x08, 0x10, 0x20), ']': (0x41, 0x41, 0x7f),
+    '^': (0x04, 0x02, 0x01, 0x02, 0x04), '_': (0x40, 0x40, 0x40, 0x40, 0x40),
+    '`': (0x01, 0x02, 0x04), 'a': (0x20, 0x54, 0x54, 0x54, 0x78),
+    'b': (0x7f, 0x48, 0x44, 0x44, 0x38), 'c': (0x38, 0x44, 0x44, 0x44, 0x20),
+    'd': (0x38, 0x44, 0x44, 0x48, 0x7f), 'e': (0x38, 0x54, 0x54, 0x54, 0x18),
+    'f': (0x08, 0x7e, 0x09, 0x01, 0x02), 'g': (0x0c, 0x52, 0x52, 0x52, 0x3e),
+    'h': (0x7f, 0x08, 0x04, 0x04, 0x78), 'i': (0x44, 0x7d, 0x40),
+    'j': (0x20, 0x40, 0x44, 0x3d), 'k': (0x7f, 0x10, 0x28, 0x44),
+    'l': (0x41, 0x7f, 0x40), 'm': (0x7c, 0x04, 0x18, 0x04, 0x78),
+    'n': (0x7c, 0x08, 0x04, 0x04, 0x78), 'o': (0x38, 0x44, 0x44, 0x44, 0x38),
+    'p': (0x7c, 0x14, 0x14, 0x14, 0x08), 'q': (0x08, 0x14, 0x14, 0x18, 0x7c),
+    'r': (0x7c, 0x08, 0x04, 0x04, 0x08), 's': (0x48, 0x54, 0x54, 0x54, 0x20),
+    't': (0x04, 0x3f, 0x44, 0x40, 0x20), 'u': (0x3c, 0x40, 0x40, 0x20, 0x7c),
+    'v': (0x1c, 0x20, 0x40, 0x20, 0x1c), 'w': (0x3c, 0x40, 0x30, 0x40, 0x3c),
+    'x': (0x44, 0x28, 0x10, 0x28, 0x44), 'y': (0x0c, 0x50, 0x50, 0x50, 0x3c),
+    'z': (0x44, 0x64, 0x54, 0x4c, 0x44), '{': (0x08, 0x36, 0x41),
+    '|': (0x7f,), '}': (0x41, 0x36, 0x08), '~': (0x08, 0x04, 0x08, 0x10, 0x08),
+}
+
+
+class BitmapFont(object):
+    """
+    A font of fixed-height bitmap glyphs.
+
+    ``glyphs`` maps each character to its glyph: a sequence of columns from
+    left to right, where each column is an integer whose bit 0 is the
+    glyph's top row.  Glyphs can be different widths.  When the font is
+    created every glyph is rasterized into one packed atlas (the glyphs'
+    columns side by side), so rendering a string is a single gather of the
+    atlas's columns (see :meth:`render`).
+
+    Characters which aren't in the font are drawn as ``default_char``.
+
+    :data:`DEFAULT_FONT` is a 5x7 font covering printable ASCII.
+
+    :param glyphs: (dict) The glyph for each character.
+    :param height: (int) Height of the glyphs, in pixels.
+    :param spacing: (int) Number of blank columns between characters.
+    :param default_char: (str) Character drawn in place of characters which
+        aren't in the font.
+    :raises: :class:`exceptions.NeoTilesError` if ``default_char`` isn't in
+        the font, or ``height`` or ``spacing`` are not valid.
+    """
+    def __init__(self, glyphs, height, spacing=1, default_char='?'):
+        if default_char not in glyphs:
+            raise NeoTilesError('default_char must be in the font')
+
+        if height < 1 or spacing < 0:
+            raise NeoTilesError(
+                'height must be at least 1 and spacing must not be negative')
+
+        self._height = height
+        self._spacing = spacing
+        self._default_char = default_char
+
+        # Atlas column 0 is blank, and is used for the spacing between
+        # characters.  Each character's entry is the list of its columns in
+        # the atlas, followed by the spacing.
+        atlas_columns = [0]
+        self._glyph_columns = {}
+        for char in sorted(glyphs):
+            columns = list(glyphs[char])
+            start = len(atlas_columns)
+            atlas_columns.extend(columns)
+            self._glyph_columns[char] = (
+                list(range(start, start + len(columns))) + [0] * spacing)
+
+        bits = np.array(atlas_columns, dtype=np.uint64)
+        rows = np.arange(height, dtype=np.uint64)
+        self._atlas = (bits[np.newaxis, :] >> rows[:, np.newaxis]) & 1 == 1
+        self._atlas.flags.writeable = False
+
+    def __repr__(self):
+        return '{}(glyphs={}, height={}, spacing={})'.format(
+            self.__class__.__name__, len(self._glyph_columns), self._height,
+            self._spacing
+        )
+
+    def _columns(self, text):
+        """
+        The atlas columns which make up a string.
+        """
+        glyph_columns = self._glyph_columns
+        default = glyph_columns[self._default_char]
+
+        columns = []
+        for char in text:
+            columns.extend(glyph_columns.get(char, default))
+
+        # No spacing after the last character.
+        if columns and self._spacing:
+            del columns[-self._spacing:]
+
+        return columns
+
+    def width(self, text):
+        """
+        Width of a string, in pixels.
+
+        :param text: (str) The string.
+        :return: (int) The width.
+        """
+        return len(self._columns(text))
+
+    def render(self, text):
+        """
+        Render a string.
+
+        :param text: (str) The string.
+        :return: (numpy.ndarray) Boolean array of shape ``(height, width)``
+            which is ``True`` where the string's pixels are lit.
+        """
+        return self._atlas[:, self._columns(text)]
+
+    @property
+    def height(self):
+        """
+        (int) Height of the glyphs, in pixels.
+        """
+        return self._height
+
+    @property
+    def atlas(self):
+        """
+        (numpy.ndarray) Every glyph, rasterized side by side: a boolean array
+        of shape ``(height, columns)``.  Read only.
+        """
+        return self._atlas
+
+
+DEFAULT_FONT = BitmapFont(_FONT_5X7, height=7)
+
+_text_cache = OrderedDict()
+_text_cache_lock = threading.Lock()
+
+
+def render_text(text, color, background=None, font=None):
+    """
+    Render a string as a bitmap of pixel colors.
+
+    Rendered strings are cached by text, font, and colors (the
+    :data:`TEXT_CACHE_SIZE` most recently rendered strings are kept), so
+    rendering the same string again costs nothing.  The returned bitmap is
+    shared with the cache and must not be modified.
+
+    :param text: (str) The string.
+    :param color: (:class:`PixelColor`) Color of the text.
+    :param background: (:class:`PixelColor`) Color of the pixels around the
+        text.  Defaults to ``PixelColor(0, 0, 0, 0)``.
+    :param font: (:class:`BitmapFont`) The font.  Defaults to
+        :data:`DEFAULT_FONT`.
+    :return: ([[:class:`PixelColor`]]) The bitmap, with the font's height in
+        rows and the string's width in columns.
+    """
+    if background is None:
+        background = PixelColor(0, 0, 0, 0)
+    if font is None:
+        font = DEFAULT_FONT
+
+    key = (
+        text, font, color.hardware_components,
+        background.hardware_components)
+
+    with _text_cache_lock:
+        bitmap = _text_cache.pop(key, None)
+        if bitmap is None:
+            bitmap = [
+                [color if lit else background for lit in row]
+                for row in font.render(text).tolist()
+            ]
+            if len(_text_cache) >= TEXT_CACHE_SIZE:
+                _text_cache.popitem(last=False)
+
+        _text_cache[key] = bitmap
+
+    return bitmap
+
+
+class TextTile(Tile):
+    """
+    A tile which displays a string of text, optionally scrolling it.
+
+    The text is rendered once (see :func:`render_text`) and each frame copies
+    the part of the rendered text which is inside the tile, so scrolling
+    costs the same however long the text is.  The text is drawn at the top of
+    the tile; the rest of the tile is the ``background`` color.
+
+    If ``scroll=True`` then the text scrolls in from the right hand side of
+    the tile and out of the left, moving ``step`` columns per :meth:`draw`.
+    Once it has scrolled off, :attr:`finished` becomes ``True`` and (if
+    ``loop=True``) it starts again.  :attr:`progress` is how far through the
+    scroll it is.
+
+    :param text: (str) The text to display.
+    :param color: (:class:`PixelColor`) Color of the text.  Defaults to
+        white.
+    :param background: (:class:`PixelColor`) Color of the tile behind the
+        text.  Defaults to ``PixelColor(0, 0, 0, 0)``.
+    :param font: (:class:`BitmapFont`) The font.  Defaults to
+        :data:`DEFAULT_FONT`.
+    :param scroll: (bool) Whether the text scrolls.
+    :param step: (int) Number of columns the text scrolls per frame.
+    :param loop: (bool) Whether the text starts scrolling again once it has
+        scrolled off the tile.
+    :param animate: (bool) Whether the tile is animating.
+    """
+    def __init__(
+            self, text='', color=None, background=None, font=None,
+            scroll=False, step=1, loop=True, animate=True):
+        self._text = text
+        self._color = PixelColor(1, 1, 1) if color is None else color
+        self._background = (
+            PixelColor(0, 0, 0, 0) if background is None else background)
+        self._font = DEFAULT_FONT if font is None else font
+        self._scroll = scroll
+        self._step = step
+        self._loop = loop
+        self._bitmap = None
+        self._x = 0
+        self._finished = False
+
+        super(TextTile, self).__init__(
+            default_color=self._background, animate=animate)
+
+        self._render()
+
+    def __repr__(self):
+        return '{}(text={!r}, scroll={})'.format(
+            self.__class__.__name__, self._text, self._scroll
+        )
+
+    def _render(self):
+        """
+        Render the text and return to the start of the scroll.
+        """
+        self._bitmap = render_text(
+            self._text, self._color, self._background, self._font)
+        self._x = self.size.cols if self._scroll else 0
+        self._finished = False
+
+    @wrapt.synchronized
+    def _blit(self):
+        """
+        Copy the part of the rendered text which is inside the tile into the
+        tile's pixels.
+        """
+        cols, rows = self.size
+        background = self._background
+        width = self._text_width
+
+        # Blank columns to the left of the text, the first column of the text
+        # inside the tile, the number of columns of the text inside the tile,
+        # and the blank columns to the right of the text.
+        left = min(max(self._x, 0), cols)
+        start = max(-self._x, 0)
+        shown = max(min(width - start, cols - left), 0)
+        right = cols - left - shown
+
+        self._pixels = [
+            [background] * left + self._bitmap[row][start:start + shown] +
+            [background] * right
+            if row < len(self._bitmap) else [background] * cols
+            for row in range(rows)
+        ]
+
+    def draw(self):
+        """
+        Display the text, scrolling it if it scrolls.
+        """
+        self._blit()
+
+        if not self._scroll or self._finished:
+            return
+
+        self._x -= self._step
+        if self._x <= -self._text_width:
+            if self._loop:
+                self._x = self.size.cols
+            else:
+                self._finished = True
+
+    def on_size_set(self):
+        """
+        Start the scroll again from the right hand side of the tile.
+        """
+        if self._bitmap is not None:
+            self._render()
+
+    @property
+    def _text_width(self):
+        return len(self._bitmap[0])
+
+    @property
+    def text(self):
+        """
+        (str) Get or set the text.  Setting the text starts the scroll
+        again.
+        """
+        return self._text
+
+    @text.setter
+    def text(self, val):
+        self._text = val
+        self._render()
+
+    @property
+    def color(self):
+        """
+        (:class:`PixelColor`) Get or set the color of the text.
+        """
+        return self._color
+
+    @color.setter
+    def color(self, val):
+        self._color = val
+        self._bitmap = render_text(
+            self._text, self._color, self._background, self._font)
+
+    @property
+    def finished(self):
+        """
+        (bool) Whether the text has scrolled off the tile and doesn't loop.
+        """
+        return self._finished
+
+    @property
+    def progress(self):
+        """
+        (float) How far through the scroll the text is, from 0 (about to
+        scroll in from the right) to 1 (scrolled off the left).  Always 0 if
+        the text doesn't scroll.
+        """
+        if not self._scroll:
+            return 0.0
+
+        distance = self.size.cols + self._text_width
+        return min((self.size.cols - self._x) / distance, 1.0)
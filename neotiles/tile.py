@@ -1,7 +1,9 @@
 import random
+import time
 
 import wrapt
 
+from .blending import BLEND_MODES, BLEND_NORMAL
 from .pixelcolor import PixelColor
 from .tilemanager import PixelPosition, TileSize
 
@@ -69,6 +71,14 @@ class Tile(object):
     the :meth:`draw` method needs to know the dimensions of the tile.  The
     :attr:`size` attribute is also how the tile can access its size when
     implementing :meth:`on_size_set`.
+
+    **Blending:**
+
+    By default a tile is opaque and hides anything underneath it.  Setting
+    :attr:`opacity` below 1, or setting :attr:`blend_mode` to something other
+    than ``'normal'``, will instead blend the tile with the tiles beneath it
+    when the TileManager composites the matrix.  This is useful for overlays
+    and fades.
     """
     def __init__(self, default_color=None, animate=True):
         # Set the default color to something random if we're not a subclass
@@ -97,6 +107,9 @@ class Tile(object):
         self._data = None
         self._pixels = None
         self._visible = True
+        self._opacity = 1.0
+        self._blend_mode = BLEND_NORMAL
+        self._clock = time.time
 
         self.animate = animate
         self.size = TileSize(1, 1)
@@ -309,3 +322,82 @@ class Tile(object):
             raise ValueError('visible must be set to True or False')
 
         self._visible = val
+
+    @property
+    def opacity(self):
+        """
+        (float) Get or set the opacity of the tile, between 0 (transparent)
+        and 1 (opaque).
+
+        Tiles with an opacity below 1 are blended with whatever is underneath
+        them on the matrix.
+        """
+        return self._opacity
+
+    @opacity.setter
+    def opacity(self, val):
+        error_msg = 'opacity must be between 0 and 1'
+
+        try:
+            if val >= 0 and val <= 1:
+                self._opacity = val
+            else:
+                raise ValueError(error_msg)
+        except TypeError:
+            raise ValueError(error_msg)
+
+    @property
+    def blend_mode(self):
+        """
+        (str) Get or set how the tile is blended with whatever is underneath
+        it on the matrix.  One of ``'normal'``, ``'add'``, ``'multiply'``,
+        ``'screen'``, or ``'max'``.  See :func:`neotiles.blending.blend` for
+        details.
+        """
+        return self._blend_mode
+
+    @blend_mode.setter
+    def blend_mode(self, val):
+        if val not in BLEND_MODES:
+            raise ValueError('blend_mode must be one of {}'.format(
+                ', '.join(BLEND_MODES)))
+
+        self._blend_mode = val
+
+    @property
+    def is_opaque(self):
+        """
+        (bool) Whether the tile completely hides whatever is underneath it
+        (i.e. it has an :attr:`opacity` of 1 and a :attr:`blend_mode` of
+        ``'normal'``).
+        """
+        return self._opacity >= 1 and self._blend_mode == BLEND_NORMAL
+
+    @property
+    def clock(self):
+        """
+        (callable) Get or set the function which :attr:`time` uses to get the
+        current time.  Defaults to ``time.time``.
+
+        This attribute will be set automatically by the TileManager object the
+        tile is registered with, so that tiles follow the TileManager's virtual
+        clock when it is rendering offline (see
+        :meth:`TileManager.render_frames`).
+        """
+        return self._clock
+
+    @clock.setter
+    def clock(self, val):
+        if not callable(val):
+            raise ValueError('clock must be callable')
+
+        self._clock = val
+
+    @property
+    def time(self):
+        """
+        (float) The current time in seconds.  Tiles which animate based on
+        time should use this rather than ``time.time()`` so that they also
+        animate correctly when their TileManager is rendering offline.
+        """
+        return self._clock()
@@ -1,10 +1,19 @@
+from __future__ import division
 from collections import namedtuple
+import operator
 import threading
 import time
 
+import numpy as np
 import wrapt
 
+from neotiles.blending import blend
 from neotiles.exceptions import NeoTilesError
+from neotiles.framebuffer import (
+    array_to_pixels, pixels_to_array, pixels_to_frame
+)
+from neotiles.framerate import AdaptiveFrameRate
+from neotiles.interpolation import FrameInterpolator
 from neotiles.pixelcolor import PixelColor
 
 
@@ -12,6 +21,255 @@ MatrixSize = namedtuple('MatrixSize', 'cols rows')
 TileSize = namedtuple('TileSize', 'cols rows')
 TilePosition = namedtuple('TilePosition', 'x y')
 PixelPosition = namedtuple('PixelPosition', 'x y')
+RenderStats = namedtuple(
+    'RenderStats',
+    'frames seconds fps draw_seconds composite_seconds output_seconds')
+
+# Tile attributes which the compositor reads in bulk (using map(), which
+# keeps the per-tile loop out of Python for large numbers of tiles).
+_get_layout_state = operator.attrgetter(
+    'visible', 'opacity', 'is_opaque', 'size')
+_get_pixels = operator.attrgetter('pixels')
+_get_size = operator.attrgetter('size')
+
+
+class _TileScaler(object):
+    """
+    Scales the pixels of a tile which is drawn at a different resolution to
+    the size it's displayed at on the matrix.
+
+    If the tile's render size is a whole multiple of its display size then
+    each displayed pixel is the average of the block of rendered pixels it
+    covers (supersampling).  Otherwise each displayed pixel is the nearest
+    rendered pixel, looked up through index maps which are computed once.
+
+    :param render_size: (:class:`TileSize`) Size the tile is drawn at.
+    :param display_size: (:class:`TileSize`) Size the tile is displayed at.
+    """
+    def __init__(self, render_size, display_size):
+        self.render_size = render_size
+        self.display_size = display_size
+
+        factor_x, remainder_x = divmod(render_size.cols, display_size.cols)
+        factor_y, remainder_y = divmod(render_size.rows, display_size.rows)
+        self.supersample = (
+            remainder_x == 0 and remainder_y == 0 and
+            factor_x * factor_y > 1)
+        self.factors = (factor_y, factor_x)
+
+        self.row_map = [
+            row * render_size.rows // display_size.rows
+            for row in range(display_size.rows)
+        ]
+        col_map = [
+            col * render_size.cols // display_size.cols
+            for col in range(display_size.cols)
+        ]
+        if len(col_map) == 1:
+            self.get_cols = lambda row: [row[col_map[0]]]
+        else:
+            get_cols = operator.itemgetter(*col_map)
+            self.get_cols = lambda row: list(get_cols(row))
+
+    def scale(self, pixels):
+        """
+        Scale a tile's pixels to its display size.
+
+        :param pixels: ([[:class:`PixelColor`]]) The tile's pixels, at its
+            render size.
+        :return: ([[:class:`PixelColor`]]) The pixels at the display size.
+        """
+        if self.supersample:
+            cols, rows = self.display_size
+            factor_y, factor_x = self.factors
+            values, rgbw = pixels_to_array(pixels)
+            values = values.reshape(
+                rows, factor_y, cols, factor_x, 4).mean(axis=(1, 3))
+            rgbw = rgbw.reshape(rows, factor_y, cols, factor_x).any(
+                axis=(1, 3))
+
+            return array_to_pixels(values, rgbw)
+
+        # Scale each rendered row once, then repeat the scaled rows.
+        get_cols = self.get_cols
+        scaled_rows = [get_cols(row) for row in pixels]
+
+        return [scaled_rows[row] for row in self.row_map]
+
+
+class _TileTable(object):
+    """
+    Compact description of a snapshot of managed tiles, used by the
+    compositor.
+
+    The tiles' roots are held in arrays, and :meth:`update` computes
+    everything the compositor needs from the tiles' current layout state
+    (visibility, opacity, and size): the coverage map of which visible
+    opaque tile owns each matrix pixel, a flat list of the row-slice copies
+    needed to composite the opaque tiles, the matrix row slices which no
+    opaque tile covers, and the clipped rectangles of the tiles which need
+    to be blended.
+
+    :param snapshot: (tuple) The managed tiles, in z order.
+    :param matrix_size: (:class:`MatrixSize`) Size of the matrix.
+    """
+    def __init__(self, snapshot, matrix_size):
+        self.snapshot = snapshot
+        self.matrix_size = matrix_size
+
+        self.tiles = [managed_tile['tile_object'] for managed_tile in snapshot]
+        self.display_sizes = [
+            managed_tile['display_size'] for managed_tile in snapshot]
+        self.root_x = np.array(
+            [managed_tile['root'].x for managed_tile in snapshot],
+            dtype=np.int64)
+        self.root_y = np.array(
+            [managed_tile['root'].y for managed_tile in snapshot],
+            dtype=np.int64)
+
+        # Everything below is derived from the layout state by update().
+        self.layout = None
+        self.sizes = None
+        self.coverage = None
+
+        # _TileScaler for each tile drawn at a different resolution to its
+        # display size, keyed by tile index.
+        self.scalers = {}
+
+        # (dst_row, dst_cols, blank_pixels) for matrix pixels not covered by
+        # any opaque tile.
+        self.uncovered_spans = []
+
+        # (tile_index, src_row, dst_row, src_cols, dst_cols) for the visible
+        # parts of the opaque tiles.
+        self.span_ops = []
+
+        # (tile_index, src_rows, dst_rows, src_cols, dst_cols, mask) for the
+        # non-opaque tiles.  mask is None if no part of the tile is hidden by
+        # an opaque tile above it.
+        self.blend_ops = []
+
+        # Visible tiles, and visible tiles with at least one pixel showing on
+        # the matrix.
+        self.visible_tiles = []
+        self.unoccluded_tiles = []
+
+    def update(self, layout, blank_pixel):
+        """
+        Recompute the coverage map and compositing operations.
+
+        :param layout: (list) A ``(visible, opacity, is_opaque, size)`` tuple
+            for each tile.
+        :param blank_pixel: (:class:`PixelColor`) Color for matrix pixels not
+            covered by any tile.
+        """
+        matrix_cols, matrix_rows = self.matrix_size
+        tile_count = len(self.tiles)
+
+        self.layout = layout
+        self.sizes = [state[3] for state in layout]
+
+        # Tiles drawn at a different resolution occupy their display size.
+        self.scalers = {}
+        matrix_sizes = list(self.sizes)
+        for index, display_size in enumerate(self.display_sizes):
+            if display_size is not None:
+                matrix_sizes[index] = display_size
+                if self.sizes[index] != display_size:
+                    self.scalers[index] = _TileScaler(
+                        self.sizes[index], display_size)
+
+        cols = np.array([size.cols for size in matrix_sizes], dtype=np.int64)
+        rows = np.array([size.rows for size in matrix_sizes], dtype=np.int64)
+        visible = np.array([state[0] for state in layout], dtype=bool)
+        transparent = np.array([state[1] <= 0 for state in layout], dtype=bool)
+        opaque = np.array([state[2] for state in layout], dtype=bool)
+
+        # Clip every tile to the matrix in one pass.  Fully transparent tiles
+        # are still drawn (they may be fading themselves in) but are left out
+        # of compositing.
+        x0 = np.clip(self.root_x, 0, matrix_cols)
+        x1 = np.clip(self.root_x + cols, 0, matrix_cols)
+        y0 = np.clip(self.root_y, 0, matrix_rows)
+        y1 = np.clip(self.root_y + rows, 0, matrix_rows)
+        in_bounds = visible & (x1 > x0) & (y1 > y0)
+        on_matrix = in_bounds & ~transparent
+
+        root_x = self.root_x.tolist()
+        root_y = self.root_y.tolist()
+        x0, x1, y0, y1 = x0.tolist(), x1.tolist(), y0.tolist(), y1.tolist()
+
+        # Paint each opaque tile's index onto the coverage map from the
+        # bottom up, so the topmost tile wins.  -1 means not covered.
+        coverage = np.full((matrix_rows, matrix_cols), -1, dtype=np.int64)
+        for index in np.flatnonzero(on_matrix & opaque).tolist():
+            coverage[y0[index]:y1[index], x0[index]:x1[index]] = index
+
+        # Convert each row of the coverage map into runs of the same owner.
+        owned = np.zeros(tile_count, dtype=bool)
+        run_breaks = coverage[:, 1:] != coverage[:, :-1]
+        uncovered_spans = []
+        span_ops = []
+
+        for dst_row in range(matrix_rows):
+            starts = [0] + (np.flatnonzero(run_breaks[dst_row]) + 1).tolist()
+            ends = starts[1:] + [matrix_cols]
+            owners = coverage[dst_row][starts].tolist()
+
+            for start, end, owner in zip(starts, ends, owners):
+                if owner < 0:
+                    uncovered_spans.append(
+                        (dst_row, slice(start, end),
+                         [blank_pixel] * (end - start)))
+                else:
+                    span_ops.append((
+                        owner,
+                        dst_row - root_y[owner],
+                        dst_row,
+                        slice(start - root_x[owner], end - root_x[owner]),
+                        slice(start, end),
+                    ))
+
+        if span_ops:
+            owned[[span_op[0] for span_op in span_ops]] = True
+
+        # A non-opaque tile affects the pixels where it is above the opaque
+        # tile (if any) which owns the pixel.
+        blend_ops = []
+        for index in np.flatnonzero(on_matrix & ~opaque).tolist():
+            mask = coverage[y0[index]:y1[index], x0[index]:x1[index]] < index
+            if not mask.any():
+                continue
+
+            owned[index] = True
+            blend_ops.append((
+                index,
+                range(y0[index] - root_y[index], y1[index] - root_y[index]),
+                range(y0[index], y1[index]),
+                slice(x0[index] - root_x[index], x1[index] - root_x[index]),
+                slice(x0[index], x1[index]),
+                None if mask.all() else mask,
+            ))
+
+        # A transparent tile is unoccluded (and so still drawn) where it
+        # would show if it were opaque.
+        for index in np.flatnonzero(in_bounds & transparent).tolist():
+            region = coverage[y0[index]:y1[index], x0[index]:x1[index]]
+            if (region < index).any():
+                owned[index] = True
+
+        self.coverage = coverage
+        self.uncovered_spans = uncovered_spans
+        self.span_ops = span_ops
+        self.blend_ops = blend_ops
+        self.visible_tiles = [
+            tile for tile, is_visible in zip(self.tiles, visible.tolist())
+            if is_visible
+        ]
+        self.unoccluded_tiles = [
+            tile for tile, is_owner in zip(self.tiles, owned.tolist())
+            if is_owner
+        ]
 
 
 class StoppableThread(threading.Thread):
@@ -68,26 +326,127 @@ class TileManager(object):
     depending on whatever else the CPU is doing, including the compute load
     created by the tiles' :meth:`Tile.draw` methods.
 
+    If ``draw_fps`` is an :class:`~neotiles.framerate.AdaptiveFrameRate` then
+    the frame rate adapts to what's being displayed: it rises while the
+    frames keep changing (and the tiles can keep up), and falls while the
+    frames are unchanged or drawing can't keep up.  :attr:`draw_fps` is the
+    current frame rate.
+
+    If ``output_fps`` is given (and is higher than the draw frame rate) then
+    the animation loop refreshes the hardware matrix ``output_fps`` times per
+    second, cross-fading between the two most recently drawn frames (see
+    :class:`~neotiles.interpolation.FrameInterpolator`).  Tiles which only
+    need to be drawn a few times per second then still move smoothly, at the
+    cost of the display trailing the tiles by one draw frame.
+
     The animation loop assumes that something else will be sending data to the
     tiles via the :attr:`Tile.data` attribute or the
     :meth:`TileManager.send_data_to_tiles` method.  If that isn't happening
     then the animation loop will likely keep re-drawing the matrix with the
     same unchanging pixel colors.
 
+    **Overlapping tiles**:
+
+    Each tile is registered with a ``z`` order (see :meth:`register_tile`).
+    Where opaque tiles overlap, the visible tile with the highest ``z`` is
+    displayed; tiles with the same ``z`` are stacked in registration order.
+    Tiles which are not opaque (see :attr:`Tile.opacity` and
+    :attr:`Tile.blend_mode`) are blended with whatever is beneath them.  The
+    TileManager keeps a coverage map of which tile owns each matrix pixel, so
+    every matrix pixel is written once per frame.  If ``skip_occluded=True``
+    then the :meth:`Tile.draw` method of a tile which is completely hidden by
+    other tiles (or is entirely outside the matrix) will not be called.
+
+    **Render resolution**:
+
+    A tile can be drawn at a different resolution to the size it's displayed
+    at by registering it with a ``render_size`` (see :meth:`register_tile`).
+    A tile drawn at a lower resolution has fewer pixels to draw, and is scaled
+    up to its display size (each displayed pixel is the nearest drawn pixel).
+    A tile whose ``render_size`` is a whole multiple of its display size is
+    supersampled: each displayed pixel is the average of the block of drawn
+    pixels it covers, which smooths the tile's edges.
+
+    **Power limiting**:
+
+    Large matrixes showing bright frames can draw more current than their
+    power supply provides.  If a ``power_limiter`` (a
+    :class:`~neotiles.power.PowerLimiter`) is given then every frame is
+    scaled down (or the matrix's brightness is lowered for that frame) to
+    keep its estimated current draw within the limiter's budget.  The
+    limiter's :attr:`~neotiles.power.PowerLimiter.estimated_ma` reports the
+    draw of the most recent frame.
+
     :param matrix: (:class:`~neotiles.matrixes.NTNeoPixelMatrix` |
         :class:`~neotiles.matrixes.NTRGBMatrix`) The matrix being managed.
-    :param draw_fps: (int|None) The frame rate for the drawing animation loop.
+    :param draw_fps: (int|:class:`~neotiles.framerate.AdaptiveFrameRate`|None)
+        The frame rate for the drawing animation loop.
+    :param skip_occluded: (bool) Whether to skip drawing tiles which are
+        completely hidden.
+    :param power_limiter: (:class:`~neotiles.power.PowerLimiter`|None) Keeps
+        each frame's estimated current draw within a budget.
+    :param output_fps: (float|None) The rate at which the animation loop
+        refreshes the matrix with interpolated frames.  If ``None`` then the
+        matrix is refreshed once per drawn frame.
+    :raises: :class:`exceptions.NeoTilesError` if ``output_fps`` is not
+        positive.
     """
-    def __init__(self, matrix, draw_fps=10):
+    def __init__(
+            self, matrix, draw_fps=10, skip_occluded=False,
+            power_limiter=None, output_fps=None):
+        if output_fps is not None and output_fps <= 0:
+            raise NeoTilesError('output_fps must be positive')
+
         self.hardware_matrix = matrix
         self._draw_fps = draw_fps
+        self._output_fps = output_fps
+        self._skip_occluded = skip_occluded
+
+        # The adaptive frame rate controller, if the frame rate is adaptive.
+        self._frame_rate = (
+            draw_fps if isinstance(draw_fps, AdaptiveFrameRate) else None)
+
+        # The power limiter, and the brightness requested for the matrix
+        # (which the limiter may lower frame by frame).
+        self._power_limiter = power_limiter
+        self._brightness = matrix.brightness
 
         self._animation_thread = None
         self._pixels = None
+        self._pixels_stale = False
+
+        # The virtual time (in seconds) while rendering offline, otherwise
+        # None.  Time spent calling the tiles' draw() methods in the most
+        # recent frame.
+        self._virtual_time = None
+        self._last_draw_seconds = 0
         self._clear_pixels()
 
-        # List of tiles we'll be displaying inside the matrix.
-        self._managed_tiles = []
+        # The previous frame drawn by the animation loop, when the frame rate
+        # is adaptive.
+        self._previous_frame = None
+
+        # Cross-fades between drawn frames while the animation loop is
+        # refreshing the matrix at output_fps.
+        self._interpolator = None
+
+        # FrameRecorder capturing every frame sent to the hardware matrix.
+        self._recorder = None
+
+        # Registry of tiles we'll be displaying inside the matrix, keyed by
+        # the id() of the tile object.  The animation loop never reads the
+        # registry directly: it reads _tiles_snapshot, an immutable tuple of
+        # the registered tiles in z order (bottom first) which is rebuilt
+        # from the registry whenever it has been invalidated (set to None) by
+        # a registration change.
+        self._tile_registry = {}
+        self._tiles_snapshot = ()
+        self._registry_lock = threading.Lock()
+        self._registration_count = 0
+
+        # Compositing information for the current tile snapshot.
+        self._blank_pixel = PixelColor(0, 0, 0, 0)
+        self._tile_table = None
 
     def __repr__(self):
         return '{}(matrix={}, draw_fps={})'.format(
@@ -157,43 +516,132 @@ class TileManager(object):
         Create a 2D matrix representing the entire pixel matrix, made up of
         each of the individual tiles' colors for each tile pixel.
 
-        :return: ([[matrix]]) 2D list of :class:`PixelColor` objects.
-        :raises: :class:`NeoTilesError` if an attempt is made to render a
-            pixel outside of the neopixel matrix's dimensions.
+        Each matrix pixel is first written exactly once: either from the
+        topmost visible opaque tile covering it (copied one row slice at a
+        time using the coverage map) or with the blank pixel color.  Any
+        visible non-opaque tiles are then blended on top in z order, one whole
+        tile rectangle at a time.
         """
-        self._clear_pixels()
-
-        # Set the matrix pixels to the colors of each tile in turn.  If any
-        # tiles happen to overlap then the last one processed will win.
-        for managed_tile in self._managed_tiles:
-            tile_object = managed_tile['tile_object']
-            if not tile_object.visible:
-                continue
-
-            # Call the draw() method of any tile which is flagged as animating.
+        self._pixels_stale = False
+
+        # Pick up the current set of registered tiles once for the whole
+        # frame, so registration changes made while we're compositing will
+        # only be seen by the next frame.
+        snapshot = self._get_tiles_snapshot()
+
+        table = self._tile_table
+        if table is None or table.snapshot is not snapshot:
+            table = _TileTable(snapshot, self.matrix_size)
+            self._tile_table = table
+
+        # Recompute the coverage map if any tile has changed its visibility,
+        # opacity, or size since the map was last computed.
+        tiles = table.tiles
+        layout = list(map(_get_layout_state, tiles))
+        if layout != table.layout:
+            table.update(layout, self._blank_pixel)
+
+        # Call the draw() method of any tile which is flagged as animating.
+        if self._skip_occluded:
+            draw_tiles = table.unoccluded_tiles
+        else:
+            draw_tiles = table.visible_tiles
+
+        draw_start = time.time()
+        for tile_object in draw_tiles:
             if tile_object.animate:
                 tile_object.draw()
+        self._last_draw_seconds = time.time() - draw_start
+
+        # Retrieve the pixel colors of every tile.  If a tile was resized
+        # after the coverage map was computed (possibly by its own draw()
+        # method) then leave it out of this frame; the coverage map will be
+        # recomputed for the next frame.
+        tile_pixels = list(map(_get_pixels, tiles))
+        span_ops = table.span_ops
+        blend_ops = table.blend_ops
+
+        sizes = list(map(_get_size, tiles))
+        resized = set()
+        if sizes != table.sizes:
+            resized = set(
+                index for index, (size, old_size) in
+                enumerate(zip(sizes, table.sizes)) if size != old_size
+            )
+            span_ops = [op for op in span_ops if op[0] not in resized]
+            blend_ops = [op for op in blend_ops if op[0] not in resized]
+
+        # Scale the pixels of tiles drawn at a different resolution to their
+        # display size.
+        for index, scaler in table.scalers.items():
+            if index not in resized:
+                tile_pixels[index] = scaler.scale(tile_pixels[index])
+
+        matrix_pixels = self._pixels
+
+        for dst_row, dst_cols, blank_pixels in table.uncovered_spans:
+            matrix_pixels[dst_row][dst_cols] = blank_pixels
+
+        for index, src_row, dst_row, src_cols, dst_cols in span_ops:
+            matrix_pixels[dst_row][dst_cols] = (
+                tile_pixels[index][src_row][src_cols])
+
+        for blend_op in blend_ops:
+            self._blend_tile(
+                tiles[blend_op[0]], tile_pixels[blend_op[0]], blend_op)
+
+    def _blend_tile(self, tile_object, tile_matrix, blend_op):
+        """
+        Blend a non-opaque tile onto the matrix pixels.  The blend is computed
+        over the tile's entire (clipped) rectangle at once; any pixels which
+        are hidden by an opaque tile above this one are left unchanged.
+
+        :param tile_object: (:class:`Tile`) The tile to blend.
+        :param tile_matrix: ([[:class:`PixelColor`]]) The tile's pixels.
+        :param blend_op: (tuple) The tile's blend operation from its
+            :class:`_TileTable`.
+        """
+        index, src_rows, dst_rows, src_cols, dst_cols, mask = blend_op
+        matrix_pixels = self._pixels
+
+        dst_values, dst_rgbw = pixels_to_array(
+            [matrix_pixels[row][dst_cols] for row in dst_rows])
+        src_values, src_rgbw = pixels_to_array(
+            [tile_matrix[row][src_cols] for row in src_rows])
 
-            # Retrieve the pixel colors of the tile.
-            tile_matrix = tile_object.pixels
-
-            # Draw the tile's pixels in the right place on the matrix
-            # (determined by the tile's root position).
-            for tile_row_num in range(len(tile_matrix)):
-                for tile_col_num in range(len(tile_matrix[tile_row_num])):
-                    pixel_color = tile_matrix[tile_row_num][tile_col_num]
-                    matrix_row = managed_tile['root'].y + tile_row_num
-                    matrix_col = managed_tile['root'].x + tile_col_num
-
-                    try:
-                        self._pixels[matrix_row][matrix_col] = pixel_color
-                    except IndexError:
-                        raise NeoTilesError(
-                            'Cannot render tile {}: pixel position ({}, {}) '
-                            'is invalid for {}x{} matrix'.format(
-                                managed_tile, matrix_col, matrix_row,
-                                self.matrix_size.cols, self.matrix_size.rows
-                            ))
+        values = blend(
+            dst_values, src_values,
+            tile_object.blend_mode, tile_object.opacity)
+        rgbw = dst_rgbw | src_rgbw
+
+        if mask is not None:
+            values = np.where(mask[..., np.newaxis], values, dst_values)
+            rgbw = np.where(mask, rgbw, dst_rgbw)
+
+        blended_pixels = array_to_pixels(values, rgbw)
+        for dst_row, blended_row in zip(dst_rows, blended_pixels):
+            matrix_pixels[dst_row][dst_cols] = blended_row
+
+    def _get_tiles_snapshot(self):
+        """
+        Get the immutable snapshot of registered tiles, rebuilding it from the
+        tile registry if a registration change has invalidated it.
+
+        :return: (tuple) The managed tiles in z order (bottom first).
+        """
+        snapshot = self._tiles_snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._registry_lock:
+            if self._tiles_snapshot is None:
+                self._tiles_snapshot = tuple(sorted(
+                    self._tile_registry.values(),
+                    key=lambda managed_tile: (
+                        managed_tile['z'], managed_tile['order'])
+                ))
+
+            return self._tiles_snapshot
 
     @wrapt.synchronized
     def _draw_hardware_matrix(self):
@@ -203,6 +651,15 @@ class TileManager(object):
         """
         pixels = self.pixels
 
+        # Matrixes with a pixel layout remap whole frames with one gather,
+        # dithering matrixes dither whole frames, and the power limiter works
+        # on whole frames.
+        matrix = self.hardware_matrix
+        if (self._power_limiter is not None or matrix.layout is not None or
+                matrix.dither is not None):
+            self._draw_frame(pixels_to_frame(pixels))
+            return
+
         # Walk through the matrix from the top left to the bottom right,
         # painting pixels as we go.
         for row_num in range(len(pixels)):
@@ -212,12 +669,45 @@ class TileManager(object):
 
         self.hardware_matrix.show()
 
+        if self._recorder is not None:
+            self._recorder.write(pixels_to_frame(pixels), self._current_time())
+
+    def _draw_frame(self, frame):
+        """
+        Displays a frame on the hardware matrix, after limiting its power
+        draw if there is a power limiter.
+
+        :param frame: (numpy.ndarray) The frame.
+        """
+        matrix = self.hardware_matrix
+
+        if self._power_limiter is not None:
+            frame, brightness = self._power_limiter.limit(
+                frame, self._brightness)
+            if brightness != matrix.brightness:
+                matrix.brightness = brightness
+
+        matrix.setFrame(frame)
+        matrix.show()
+
+        if self._recorder is not None:
+            self._recorder.write(frame, self._current_time())
+
     def _animate(self):
         """
         Internal animation method.  Spawns a new thread to manage the drawing
         of the matrix at the (hoped-for) frame rate.
         """
-        frame_delay_millis = int(1000 / self._draw_fps)
+        frame_rate = self._frame_rate
+        if frame_rate is not None:
+            frame_rate.reset()
+            self._previous_frame = None
+
+        if self._output_fps is not None and self._output_fps > self.draw_fps:
+            self._animate_interpolated()
+            return
+
+        frame_delay_millis = int(1000 / self.draw_fps)
         current_time = int(round(time.time() * 1000))
         next_frame_time = current_time + frame_delay_millis
 
@@ -229,9 +719,13 @@ class TileManager(object):
         while True:
             current_time = int(round(time.time() * 1000))
             if current_time > next_frame_time:
+                if frame_rate is None:
+                    self._set_pixels_from_tiles()
+                    self._draw_hardware_matrix()
+                else:
+                    frame_delay_millis = self._draw_adaptive_frame()
+
                 next_frame_time = current_time + frame_delay_millis
-                self._set_pixels_from_tiles()
-                self._draw_hardware_matrix()
 
             # The sleep time needs to be long enough that we're not churning
             # through CPU cycles checking whether it's time to render the next
@@ -244,28 +738,180 @@ class TileManager(object):
             if self._animation_thread.stopped():
                 return
 
+    def _animate_interpolated(self):
+        """
+        Internal animation method used when there is an ``output_fps``.
+        Draws the tiles at the (hoped-for) draw frame rate, and refreshes the
+        matrix at the output frame rate with frames interpolated between the
+        drawn frames.
+        """
+        self._interpolator = FrameInterpolator(self.matrix_size)
+        output_delay_millis = 1000 / self._output_fps
+
+        current_time = int(round(time.time() * 1000))
+        next_frame_time = (
+            current_time + self._draw_interpolated_frame(current_time))
+        next_output_time = current_time
+
+        while True:
+            current_time = int(round(time.time() * 1000))
+            if current_time > next_frame_time:
+                next_frame_time = (
+                    current_time +
+                    self._draw_interpolated_frame(current_time))
+
+            if current_time >= next_output_time:
+                self._output_interpolated_frame(current_time)
+
+                # Keep to the output frame rate's schedule, unless we've
+                # fallen a whole frame behind it.
+                next_output_time += output_delay_millis
+                if next_output_time < current_time:
+                    next_output_time = current_time + output_delay_millis
+
+            # Sleep until the next frame is due, but for no more than 5ms so
+            # that stopping the animation loop stays responsive.
+            sleep_millis = min(next_frame_time, next_output_time) - (
+                time.time() * 1000)
+            time.sleep(min(max(sleep_millis, 0), 5) / 1000)
+
+            if self._animation_thread.stopped():
+                return
+
+    def _draw_interpolated_frame(self, current_time):
+        """
+        Draws the tiles and passes the composed frame to the interpolator.
+
+        :param current_time: (int) The time the frame is drawn, in
+            milliseconds.
+        :return: (int) Milliseconds until the next frame.
+        """
+        frame_start = time.time()
+        self._set_pixels_from_tiles()
+        frame = pixels_to_frame(self._pixels)
+        self._interpolator.push(frame, current_time / 1000)
+
+        if self._frame_rate is None:
+            return int(1000 / self._draw_fps)
+
+        return self._adapt_frame_rate(frame, time.time() - frame_start)
+
+    @wrapt.synchronized
+    def _output_interpolated_frame(self, current_time):
+        """
+        Displays the interpolated frame for the given time on the hardware
+        matrix.
+
+        :param current_time: (int) The time, in milliseconds.
+        """
+        self._draw_frame(self._interpolator.frame_at(current_time / 1000))
+
+    def _draw_adaptive_frame(self):
+        """
+        Draws a frame and adapts the frame rate to how long it took and
+        whether it changed.
+
+        :return: (int) Milliseconds until the next frame.
+        """
+        frame_start = time.time()
+        self._set_pixels_from_tiles()
+        self._draw_hardware_matrix()
+        frame_seconds = time.time() - frame_start
+
+        return self._adapt_frame_rate(
+            pixels_to_frame(self._pixels), frame_seconds)
+
+    def _adapt_frame_rate(self, frame, frame_seconds):
+        """
+        Adapts the frame rate to how long a frame took to draw and whether it
+        differed from the previous frame.
+
+        :param frame: (numpy.ndarray) The frame.
+        :param frame_seconds: (float) Time taken to draw the frame.
+        :return: (int) Milliseconds until the next frame.
+        """
+        changed = (
+            self._previous_frame is None or
+            not np.array_equal(frame, self._previous_frame))
+        self._previous_frame = frame
+
+        fps = self._frame_rate.update(changed, frame_seconds)
+
+        return int(1000 / fps)
+
+    def _default_fps(self):
+        """
+        The frame rate to render at offline when none is given: the
+        animation loop's frame rate (the highest frame rate, if it's
+        adaptive), or 10 if there is no animation loop.
+
+        :return: (float) The frame rate.
+        """
+        if self._frame_rate is not None:
+            return self._frame_rate.max_fps
+
+        return self._draw_fps or 10
+
+    def _current_time(self):
+        """
+        The TileManager's current time: the virtual time when rendering
+        offline, otherwise the wall clock time.
+
+        :return: (float) The current time in seconds.
+        """
+        virtual_time = self._virtual_time
+        return time.time() if virtual_time is None else virtual_time
+
     def register_tile(
-            self, tile, size=None, root=None):
+            self, tile, size=None, root=None, z=0, render_size=None):
         """
         Registers a tile with the TileManager.  Registering a tile allows
         its pixels to be drawn by the TileManager to the hardware matrix.
 
+        Registering a tile which is already registered replaces its previous
+        registration.  Tiles can be registered (and deregistered) while the
+        animation loop is running; the change is picked up on the next frame.
+
         :param tile: (:class:`Tile`) The tile to register.
         :param size: (:class:`TileSize`) Size of the tile (in cols and rows).
         :param root: (:class:`TilePosition`) Position of the top left corner
-            of the tile within the hardware matrix.
+            of the tile within the hardware matrix.  The tile may be partially
+            (or entirely) outside the matrix, in which case it is clipped.
+        :param z: (int) Stacking order of the tile.  Tiles with a higher ``z``
+            are displayed on top of tiles with a lower ``z``.
+        :param render_size: (:class:`TileSize`) Size the tile draws its pixels
+            at, if different from ``size``.  The tile's pixels are scaled to
+            ``size`` when the matrix is composited.
         """
-        tile.size = TileSize(*size)
+        size = TileSize(*size)
+        if render_size is None:
+            render_size = size
+        else:
+            render_size = TileSize(*render_size)
+
+        tile.size = render_size
+        tile.clock = self._current_time
 
-        self._managed_tiles.append({
+        managed_tile = {
             'root': TilePosition(*root),
             'tile_object': tile,
-        })
-
-        # Set the tile manager's pixels based on this new tile.  A future
-        # optimization would be to only render the new tile onto the manager's
-        # pixels.
-        self._set_pixels_from_tiles()
+            'z': z,
+            'display_size': None if render_size == size else size,
+        }
+
+        with self._registry_lock:
+            managed_tile['order'] = self._registration_count
+            self._registration_count += 1
+            self._tile_registry[id(tile)] = managed_tile
+            self._tiles_snapshot = None
+
+        # The tile manager's pixels need to include this new tile.  If the
+        # animation loop is running then it will pick up the new tile on its
+        # next frame; otherwise the pixels will be recomposited the next time
+        # they're asked for (so registering many tiles at once only
+        # composites once).
+        if self._animation_thread is None:
+            self._pixels_stale = True
 
     def deregister_tile(self, tile):
         """
@@ -277,19 +923,20 @@ class TileManager(object):
         automatically.
 
         :param tile: (:class:`Tile`) The tile being deregistered.
-        :return: (int) The number of tiles removed.
+        :return: (int) The number of tiles removed (0 if the tile was not
+            registered, otherwise 1).
         """
-        removed = 0
-
-        for i, managed_tile in enumerate(self._managed_tiles):
-            if managed_tile['tile_object'] == tile:
-                del self._managed_tiles[i]
-                removed += 1
-
-        if len(self._managed_tiles) == 0:
+        with self._registry_lock:
+            removed = self._tile_registry.pop(id(tile), None)
+            if removed is not None:
+                self._tiles_snapshot = None
+                tile.clock = time.time
+            remaining = len(self._tile_registry)
+
+        if remaining == 0:
             self.draw_stop()
 
-        return removed
+        return 0 if removed is None else 1
 
     def send_data_to_tiles(self, data):
         """
@@ -299,7 +946,7 @@ class TileManager(object):
 
         :param data: (any) Input data.
         """
-        for managed_tile in self._managed_tiles:
+        for managed_tile in self._get_tiles_snapshot():
             tile_object = managed_tile['tile_object']
 
             if tile_object.is_accepting_data:
@@ -327,6 +974,217 @@ class TileManager(object):
             self._animation_thread = StoppableThread(target=self._animate)
             self._animation_thread.start()
 
+    def show_hardware_matrix(self):
+        """
+        Displays the TileManager's current :attr:`pixels` on the hardware
+        matrix without calling any tile's :meth:`Tile.draw` method.
+
+        This is useful for presenting a frame some time after it was rendered
+        (for example with :meth:`render_frames`), such as when the frame has
+        to be displayed at a scheduled moment.
+        """
+        self._draw_hardware_matrix()
+
+    def render_frames(
+            self, count, fps=None, start_time=0, output=False, on_frame=None):
+        """
+        Render ``count`` frames back to back, as fast as possible, without
+        the animation loop.  This is a generator which yields the TileManager's
+        :attr:`pixels` after each frame is rendered.
+
+        While rendering, the TileManager's :attr:`time` (and therefore each
+        registered tile's :attr:`Tile.time`) is a virtual clock which starts
+        at ``start_time`` and advances by ``1 / fps`` seconds per frame,
+        regardless of how long each frame actually took to render.  This is
+        useful for benchmarking tiles and for pre-rendering animations.
+
+        Note that the same :attr:`pixels` list is updated in place for every
+        frame, so copy it if you need to keep it.  ::
+
+            for pixels in tiles.render_frames(100, fps=30):
+                print(pixels[0][0])
+
+        :param count: (int) The number of frames to render.
+        :param fps: (int) The frame rate of the virtual clock.  Defaults to
+            the TileManager's ``draw_fps`` (or 10 if that is ``None``).
+        :param start_time: (float) The virtual time of the first frame.
+        :param output: (bool) Whether to also send each frame to the hardware
+            matrix.
+        :param on_frame: (callable) Called with the frame number before each
+            frame is rendered (with :attr:`time` already set to the frame's
+            virtual time).  Useful for sending data to the tiles.
+        :raises: :class:`NeoTilesError` if the animation loop is running.
+        """
+        if self._animation_thread is not None:
+            raise NeoTilesError(
+                'Cannot render offline while the animation loop is running')
+
+        if fps is None:
+            fps = self._default_fps()
+
+        self._virtual_time = start_time
+
+        try:
+            for frame_num in range(count):
+                self._virtual_time = start_time + frame_num / fps
+                if on_frame is not None:
+                    on_frame(frame_num)
+
+                self._set_pixels_from_tiles()
+                if output:
+                    self._draw_hardware_matrix()
+
+                yield self._pixels
+        finally:
+            self._virtual_time = None
+
+    def run_offline(self, duration, fps=None, output=False, on_frame=None):
+        """
+        Render ``duration`` seconds of virtual time at ``fps`` frames per
+        second as fast as possible (see :meth:`render_frames`), and report how
+        long it took.
+
+        The reported :attr:`RenderStats.fps` is the frame rate of the pure
+        computation, which shows how much headroom a set of tiles has before
+        being displayed on real hardware.
+
+        :param duration: (float) Seconds of virtual time to render.
+        :param fps: (int) The frame rate of the virtual clock.  Defaults to
+            the TileManager's ``draw_fps`` (or 10 if that is ``None``).
+        :param output: (bool) Whether to also send each frame to the hardware
+            matrix.
+        :param on_frame: (callable) Called with the frame number before each
+            frame is rendered.  Time spent in ``on_frame`` is not included in
+            the compositing time.
+        :return: (:class:`RenderStats`) Rendering statistics.  Times are in
+            seconds; ``composite_seconds`` includes ``draw_seconds``.
+        """
+        if fps is None:
+            fps = self._default_fps()
+
+        count = int(round(duration * fps))
+        draw_seconds = 0
+        composite_seconds = 0
+        output_seconds = 0
+
+        def timed_on_frame(frame_num):
+            on_frame_start = time.time()
+            on_frame(frame_num)
+            on_frame_seconds[0] += time.time() - on_frame_start
+
+        on_frame_seconds = [0]
+
+        start = time.time()
+        frames = self.render_frames(
+            count, fps=fps,
+            on_frame=None if on_frame is None else timed_on_frame)
+        while True:
+            frame_start = time.time()
+            on_frame_seconds[0] = 0
+            try:
+                next(frames)
+            except StopIteration:
+                break
+
+            composite_seconds += (
+                time.time() - frame_start - on_frame_seconds[0])
+            draw_seconds += self._last_draw_seconds
+
+            if output:
+                output_start = time.time()
+                self._draw_hardware_matrix()
+                output_seconds += time.time() - output_start
+
+        seconds = time.time() - start
+
+        return RenderStats(
+            frames=count,
+            seconds=seconds,
+            fps=count / seconds if seconds > 0 else float('inf'),
+            draw_seconds=draw_seconds,
+            composite_seconds=composite_seconds,
+            output_seconds=output_seconds,
+        )
+
+    def bake(self, duration, fps=None, detect_loop=True, on_frame=None):
+        """
+        Render ``duration`` seconds of the registered tiles offline (see
+        :meth:`render_frames`) into a :class:`~neotiles.scene.Scene`, which
+        can be saved to a file and played back on a matrix without the
+        tiles.  This lets animations which are too expensive to draw in real
+        time on a small controller be rendered on a faster machine.  ::
+
+            tiles.bake(duration=60, fps=30).save('fire.nts')
+
+        Identical frames are only stored once.  If ``detect_loop=True`` and
+        the rendered frames repeat (at least twice within ``duration``) then
+        the scene is trimmed to a single repetition and marked as looping.
+
+        :param duration: (float) Seconds of virtual time to render.
+        :param fps: (int) The frame rate of the scene.  Defaults to the
+            TileManager's ``draw_fps`` (or 10 if that is ``None``).
+        :param detect_loop: (bool) Whether to look for a loop.
+        :param on_frame: (callable) Called with the frame number before each
+            frame is rendered.
+        :return: (:class:`~neotiles.scene.Scene`) The baked scene.
+        :raises: :class:`NeoTilesError` if the animation loop is running.
+        """
+        from neotiles.scene import Scene
+
+        if fps is None:
+            fps = self._default_fps()
+
+        frames = [
+            pixels_to_frame(pixels) for pixels in self.render_frames(
+                int(round(duration * fps)), fps=fps, on_frame=on_frame)
+        ]
+
+        return Scene.from_frames(frames, fps, detect_loop=detect_loop)
+
+    @wrapt.synchronized
+    def start_recording(self, path, channel_layout='RGBW', delta=True):
+        """
+        Start recording every frame displayed on the hardware matrix to a
+        file, along with the time (see :attr:`time`) it was displayed.  The
+        recording can be played back on any matrix of the same size with a
+        :class:`~neotiles.recording.FramePlayer`.  ::
+
+            tiles.start_recording('clock.ntr')
+            tiles.draw_hardware_matrix()
+            time.sleep(60)
+            tiles.stop_recording()
+
+        Any recording already in progress is stopped first.
+
+        :param path: (str) Path of the recording file to write.
+        :param channel_layout: (str) ``'RGBW'`` or ``'RGB'`` (see
+            :class:`~neotiles.recording.FrameRecorder`).
+        :param delta: (bool) Whether to only store the pixels which changed
+            since the previous frame.
+        """
+        from neotiles.recording import FrameRecorder
+
+        self.stop_recording()
+        self._recorder = FrameRecorder(
+            path, self.matrix_size, channel_layout=channel_layout,
+            delta=delta)
+
+    @wrapt.synchronized
+    def stop_recording(self):
+        """
+        Stop recording frames (see :meth:`start_recording`).
+
+        :return: (int) The number of frames recorded.
+        """
+        recorder = self._recorder
+        if recorder is None:
+            return 0
+
+        self._recorder = None
+        recorder.close()
+
+        return recorder.frames_written
+
     def draw_stop(self):
         """
         Stop the matrix-drawing animation loop.
@@ -341,7 +1199,7 @@ class TileManager(object):
         Clears the hardware matrix (sets all pixels to
         ``PixelColor(0, 0, 0, 0)``).
         """
-        pixels = self.pixels
+        pixels = self._pixels
         black_pixel = PixelColor(0, 0, 0)
 
         for row_num in range(len(pixels)):
@@ -357,11 +1215,58 @@ class TileManager(object):
         (int) Get or set the brightness of the matrix display.  Range of
             acceptable values will depend on the matrix type.
         """
-        return self.hardware_matrix.brightness
+        return self._brightness
 
     @brightness.setter
     def brightness(self, val):
         self.hardware_matrix.brightness = val
+        self._brightness = self.hardware_matrix.brightness
+
+    @property
+    def power_limiter(self):
+        """
+        (:class:`~neotiles.power.PowerLimiter`|None) Get or set the power
+        limiter applied to every frame.
+        """
+        return self._power_limiter
+
+    @power_limiter.setter
+    def power_limiter(self, val):
+        with wrapt.synchronized(self):
+            self._power_limiter = val
+
+            # Undo any brightness limiting.
+            if self.hardware_matrix.brightness != self._brightness:
+                self.hardware_matrix.brightness = self._brightness
+
+    @property
+    def draw_fps(self):
+        """
+        (float|None) Get the animation loop's frame rate.  If the frame rate
+        is adaptive then this is its current value.
+        """
+        if self._frame_rate is not None:
+            return self._frame_rate.fps
+
+        return self._draw_fps
+
+    @property
+    def output_fps(self):
+        """
+        (float|None) Get the rate at which the animation loop refreshes the
+        matrix with interpolated frames, or ``None`` if the matrix is
+        refreshed once per drawn frame.
+        """
+        return self._output_fps
+
+    @property
+    def time(self):
+        """
+        (float) Get the TileManager's current time in seconds.  This is the
+        wall clock time, except while rendering offline (see
+        :meth:`render_frames`) when it is a virtual clock.
+        """
+        return self._current_time()
 
     @property
     def matrix_size(self):
@@ -373,9 +1278,10 @@ class TileManager(object):
     @property
     def tiles(self):
         """
-        Get all registered tiles as a list of :class:`Tile` objects.
+        Get all registered tiles as a list of :class:`Tile` objects, ordered
+        from the bottom of the stack to the top.
         """
-        return [tile['tile_object'] for tile in self._managed_tiles]
+        return [tile['tile_object'] for tile in self._get_tiles_snapshot()]
 
     @property
     def tiles_meta(self):
@@ -389,7 +1295,10 @@ class TileManager(object):
         If you just want the registered Tile instances then use :attr:`tiles`
         instead.
         """
-        return self._managed_tiles
+        return [
+            {'root': tile['root'], 'tile_object': tile['tile_object']}
+            for tile in self._get_tiles_snapshot()
+        ]
 
     @property
     def pixels(self):
@@ -401,4 +1310,7 @@ class TileManager(object):
         The colors are returned as a two-dimensional list (with the same
         dimensions as :attr:`matrix_size`) of :class:`~PixelColor` objects.
         """
+        if self._pixels_stale:
+            self._set_pixels_from_tiles()
+
         return self._pixels
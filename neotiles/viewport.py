@@ -0,0 +1,263 @@
+from __future__ import division
+
+import numpy as np
+import wrapt
+
+from neotiles import TilePosition, TileSize
+from neotiles.exceptions import NeoTilesError
+from neotiles.framebuffer import array_to_pixels
+from neotiles.pixelcolor import PixelColor
+from neotiles.tile import Tile
+
+
+class ViewportTile(Tile):
+    """
+    A tile which displays a window onto a canvas larger than itself.
+
+    The canvas is drawn once (with :meth:`set_canvas` or
+    :meth:`set_canvas_pixel`) and the tile displays the part of it at
+    :attr:`offset`.  Scrolling or panning only changes the offset (see
+    :meth:`scroll`): the TileManager copies the visible window straight from
+    the canvas, one row slice at a time, and nothing is redrawn.  For
+    example, to scroll a long banner across an 8x8 tile: ::
+
+        banner = ViewportTile(canvas_size=(64, 8))
+        banner.set_canvas(banner_pixels)
+        tiles.register_tile(banner, size=(8, 8), root=(0, 0))
+
+        while True:
+            banner.scroll(dx=1)
+            time.sleep(0.1)
+
+    If ``wrap=True`` then the canvas wraps around at its edges, so the
+    window can scroll forever in any direction; otherwise the parts of the
+    window outside the canvas are the tile's :attr:`default_color`.
+
+    The canvas keeps its contents when the tile is drawn: the default
+    :meth:`draw` does nothing.  Subclasses can override :meth:`draw` to update
+    the canvas or move the offset every frame.  :meth:`set_pixel` sets the
+    canvas pixel which is currently displayed at the given tile position.
+
+    :param canvas_size: (:class:`TileSize`) Size of the canvas.
+    :param wrap: (bool) Whether the canvas wraps around at its edges.
+    :param default_color: (:class:`PixelColor`) Initial color of the canvas.
+    :param animate: (bool) Whether the tile is animating.
+    :raises: :class:`exceptions.NeoTilesError` if the canvas is empty.
+    """
+    def __init__(
+            self, canvas_size, wrap=True, default_color=None, animate=True):
+        canvas_size = TileSize(*canvas_size)
+        if canvas_size.cols < 1 or canvas_size.rows < 1:
+            raise NeoTilesError('canvas_size must be at least (1, 1)')
+
+        self._canvas_size = canvas_size
+        self._wrap = wrap
+        self._offset = TilePosition(0, 0)
+
+        # The canvas, with each row stored twice over (side by side) so that
+        # a window which wraps around the right hand edge is still a single
+        # row slice.
+        self._canvas = None
+        self._canvas_version = 0
+
+        # The most recently displayed window, and the (offset, size, canvas
+        # version) it was taken at.
+        self._window = None
+        self._window_key = None
+
+        super(ViewportTile, self).__init__(
+            default_color=default_color, animate=animate)
+
+        self._canvas = [
+            [self._default_color] * (canvas_size.cols * 2)
+            for _ in range(canvas_size.rows)
+        ]
+
+    def __repr__(self):
+        return '{}(canvas_size={}, wrap={})'.format(
+            self.__class__.__name__, self._canvas_size, self._wrap
+        )
+
+    def _window_row(self, canvas_row, x, cols):
+        """
+        The part of a canvas row which is inside the window.
+        """
+        canvas_cols = self._canvas_size.cols
+
+        if self._wrap:
+            if cols <= canvas_cols:
+                return canvas_row[x:x + cols]
+
+            # The window is wider than the canvas, so it repeats.
+            return [canvas_row[(x + col) % canvas_cols] for col in range(cols)]
+
+        left = min(max(-x, 0), cols)
+        start = max(x, 0)
+        shown = max(min(canvas_cols - start, cols - left), 0)
+        blank = self._default_color
+
+        return (
+            [blank] * left + canvas_row[start:start + shown] +
+            [blank] * (cols - left - shown))
+
+    @wrapt.synchronized
+    def _get_window(self):
+        """
+        The window onto the canvas at the current offset.
+        """
+        key = (self._offset, self._size, self._canvas_version)
+        if key == self._window_key:
+            return self._window
+
+        cols, rows = self._size
+        canvas_cols, canvas_rows = self._canvas_size
+        x, y = self._offset
+        if self._wrap:
+            x %= canvas_cols
+            y %= canvas_rows
+
+        blank_row = [self._default_color] * cols
+        window = []
+        for row in range(y, y + rows):
+            if self._wrap:
+                row %= canvas_rows
+            elif row < 0 or row >= canvas_rows:
+                window.append(blank_row)
+                continue
+
+            window.append(self._window_row(self._canvas[row], x, cols))
+
+        self._window = window
+        self._window_key = key
+
+        return window
+
+    def draw(self):
+        """
+        Does nothing: the canvas keeps its contents from frame to frame.
+        Subclasses can override this to update the canvas or move the offset.
+        """
+        pass
+
+    def clear(self):
+        """
+        Clears the canvas by setting all its pixels to
+        ``PixelColor(0, 0, 0, 0)``.
+        """
+        black_pixel = PixelColor(0, 0, 0, 0)
+        self.set_canvas([
+            [black_pixel] * self._canvas_size.cols
+            for _ in range(self._canvas_size.rows)
+        ])
+
+    def scroll(self, dx=0, dy=0):
+        """
+        Move the window across the canvas.
+
+        :param dx: (int) Number of columns to move right.
+        :param dy: (int) Number of rows to move down.
+        """
+        self.offset = (self._offset.x + dx, self._offset.y + dy)
+
+    @wrapt.synchronized
+    def set_canvas_pixel(self, pos, color):
+        """
+        Sets the pixel at the given ``pos`` on the canvas to the given
+        ``color``.  Positions outside the canvas are ignored.
+
+        :param pos: (:class:`TilePosition`) Canvas pixel to set the color of.
+        :param color: (:class:`PixelColor`) Color to assign.
+        """
+        x, y = pos
+        canvas_cols, canvas_rows = self._canvas_size
+
+        if 0 <= x < canvas_cols and 0 <= y < canvas_rows:
+            canvas_row = self._canvas[y]
+            canvas_row[x] = color
+            canvas_row[x + canvas_cols] = color
+            self._canvas_version += 1
+
+    @wrapt.synchronized
+    def set_canvas(self, pixels):
+        """
+        Sets the whole canvas.
+
+        :param pixels: (numpy.ndarray|[[:class:`PixelColor`]]) The canvas: a
+            uint8 array of shape ``(rows, cols, 4)`` (or ``(rows, cols, 3)``
+            for RGB pixels), or a 2D list of :class:`PixelColor` objects.
+        :raises: :class:`exceptions.NeoTilesError` if ``pixels`` is not the
+            size of the canvas.
+        """
+        canvas_cols, canvas_rows = self._canvas_size
+
+        if isinstance(pixels, np.ndarray):
+            rows, cols, channels = pixels.shape
+            values = np.zeros((rows, cols, 4), dtype=np.float32)
+            values[..., :channels] = pixels[..., :4]
+            pixels = array_to_pixels(
+                values, np.full((rows, cols), channels > 3))
+
+        if (len(pixels) != canvas_rows or
+                any(len(row) != canvas_cols for row in pixels)):
+            raise NeoTilesError(
+                'pixels must be the size of the canvas {}'.format(
+                    self._canvas_size))
+
+        self._canvas = [list(row) * 2 for row in pixels]
+        self._canvas_version += 1
+
+    def set_pixel(self, pos, color):
+        """
+        Sets the canvas pixel which is displayed at the given ``pos`` in the
+        tile to the given ``color``.
+
+        :param pos: (:class:`~PixelPosition`) Tile pixel to set the color of.
+        :param color: (:class:`~PixelColor`) Color to assign.
+        """
+        x = self._offset.x + pos[0]
+        y = self._offset.y + pos[1]
+        if self._wrap:
+            x %= self._canvas_size.cols
+            y %= self._canvas_size.rows
+
+        self.set_canvas_pixel((x, y), color)
+
+    @property
+    def canvas_size(self):
+        """
+        (:class:`TileSize`) Size of the canvas.
+        """
+        return self._canvas_size
+
+    @property
+    def canvas(self):
+        """
+        Get a copy of the canvas's pixel colors, as a two-dimensional list of
+        :class:`PixelColor` objects.
+        """
+        canvas_cols = self._canvas_size.cols
+        return [row[:canvas_cols] for row in self._canvas]
+
+    @property
+    def offset(self):
+        """
+        (:class:`TilePosition`) Get or set the position on the canvas of the
+        tile's top left pixel.  With ``wrap=True`` the offset can be any
+        position, and wraps around the canvas.
+        """
+        return self._offset
+
+    @offset.setter
+    def offset(self, val):
+        self._offset = TilePosition(*val)
+
+    @property
+    def pixels(self):
+        """
+        Get the tile's current pixel colors: the window onto the canvas at
+        :attr:`offset`.
+        """
+        if self._canvas is None:
+            return self._pixels
+
+        return self._get_window()
@@ -9,6 +9,7 @@ packages = [package for package in find_packages()
 version = '0.4.0'
 
 install_requires = [
+    'numpy',
     'wrapt',
 ]
 
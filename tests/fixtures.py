@@ -1,7 +1,7 @@
 import pytest
 
 from neotiles import TileManager, Tile
-from neotiles.matrixes import NTNeoPixelMatrix, NTRGBMatrix
+from neotiles.matrixes import NTNeoPixelMatrix, NTRGBMatrix, NTVirtualMatrix
 
 
 @pytest.fixture
@@ -17,3 +17,8 @@ def manager_neopixel():
 @pytest.fixture
 def manager_rgb():
     return TileManager(NTRGBMatrix(chain_length=1))
+
+
+@pytest.fixture
+def manager_virtual():
+    return TileManager(NTVirtualMatrix(size=(10, 5)), draw_fps=None)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from neotiles import PixelColor
+from neotiles.blending import blend
+from neotiles.framebuffer import array_to_pixels, pixels_to_array
+
+
+class TestBlending:
+    @pytest.mark.parametrize('mode,expected', [
+        ('normal', [50, 200, 0, 0]),
+        ('add', [150, 255, 100, 0]),
+        ('multiply', [100 * 50 / 255, 200 * 200 / 255, 0, 0]),
+        ('screen', [
+            255 - 155 * 205 / 255, 255 - 55 * 55 / 255, 100, 0]),
+        ('max', [100, 200, 100, 0]),
+    ])
+    def test_blend_modes(self, mode, expected):
+        """
+        Test each blend mode at full opacity.
+        """
+        dst = np.array([[[100, 200, 100, 0]]], dtype=np.float32)
+        src = np.array([[[50, 200, 0, 0]]], dtype=np.float32)
+
+        result = blend(dst, src, mode)
+        assert result.shape == dst.shape
+        assert np.allclose(result[0][0], expected, atol=0.01)
+
+    def test_opacity(self):
+        """
+        Test mixing the blend result with the destination.
+        """
+        dst = np.full((2, 3, 4), 100, dtype=np.float32)
+        src = np.full((2, 3, 4), 200, dtype=np.float32)
+
+        assert np.allclose(blend(dst, src, opacity=0.25), 125)
+        assert np.allclose(blend(dst, src, opacity=0), 100)
+
+    def test_invalid_mode(self):
+        """
+        Test that unknown blend modes are rejected.
+        """
+        dst = np.zeros((1, 1, 4), dtype=np.float32)
+
+        with pytest.raises(ValueError) as e:
+            blend(dst, dst, 'foo')
+        assert 'blend mode must be one of' in str(e)
+
+    def test_pixel_conversion(self):
+        """
+        Test converting PixelColor objects to numeric arrays and back.
+        """
+        pixels = [
+            [PixelColor(255, 0, 0), PixelColor(1.0, 0, 0.5)],
+            [PixelColor(1, 2, 3, 4), PixelColor(0, 0, 0, 0)],
+        ]
+
+        values, rgbw = pixels_to_array(pixels)
+        assert values.shape == (2, 2, 4)
+        assert values[0][1].tolist() == [255, 0, 127, 0]
+        assert rgbw.tolist() == [[False, False], [True, True]]
+
+        converted = array_to_pixels(values, rgbw)
+        for row_num in range(2):
+            for col_num in range(2):
+                assert (converted[row_num][col_num].hardware_components ==
+                        pixels[row_num][col_num].hardware_components)
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from neotiles.codec import FRAME_DELTA, FRAME_KEY, FrameDecoder, FrameEncoder
+from neotiles.exceptions import NeoTilesError
+from neotiles.matrixes import NTVirtualMatrix
+
+
+def make_frames(count, size=(16, 8), changes=3):
+    """
+    Make a sequence of frames where a few random pixels change each frame.
+    """
+    cols, rows = size
+    random = np.random.RandomState(0)
+    frame = random.randint(0, 256, (rows, cols, 4)).astype(np.uint8)
+    frames = [frame.copy()]
+    for _ in range(count - 1):
+        for _ in range(changes):
+            frame[random.randint(rows), random.randint(cols)] = (
+                random.randint(0, 256, 4))
+        frames.append(frame.copy())
+
+    return frames
+
+
+class TestCodec:
+    @pytest.mark.parametrize('channel_layout', ['RGBW', 'RGB'])
+    def test_round_trip(self, channel_layout):
+        """
+        Test that decoded frames match the encoded frames.
+        """
+        encoder = FrameEncoder((16, 8), channel_layout=channel_layout)
+        decoder = FrameDecoder((16, 8), channel_layout=channel_layout)
+        channels = len(channel_layout)
+
+        frame_types = []
+        for frame in make_frames(20):
+            frame_type, payload = encoder.encode(frame)
+            frame_types.append(frame_type)
+            decoded = decoder.decode(frame_type, payload)
+            assert np.array_equal(
+                decoded[..., :channels], frame[..., :channels])
+
+        assert frame_types == [FRAME_KEY] + [FRAME_DELTA] * 19
+
+    def test_delta_size(self):
+        """
+        Test that delta frames are small, that unchanged frames are tiny, and
+        that frames which change completely are sent as keyframes.
+        """
+        encoder = FrameEncoder((16, 8))
+        frame = np.zeros((8, 16, 4), dtype=np.uint8)
+        encoder.encode(frame)
+
+        frame_type, payload = encoder.encode(frame)
+        assert frame_type == FRAME_DELTA
+        assert len(payload) == 4
+
+        # Two nearby changed pixels are merged into a single run.
+        frame = frame.copy()
+        frame[0, 1] = [1, 2, 3, 4]
+        frame[0, 3] = [5, 6, 7, 8]
+        frame_type, payload = encoder.encode(frame)
+        assert frame_type == FRAME_DELTA
+        assert len(payload) == 4 + 8 + 3 * 4
+
+        frame_type, payload = encoder.encode(np.full_like(frame, 255))
+        assert frame_type == FRAME_KEY
+        assert len(payload) == 16 * 8 * 4
+
+    def test_keyframe_interval(self):
+        """
+        Test that keyframes are inserted periodically and on reset.
+        """
+        encoder = FrameEncoder((16, 8), keyframe_interval=4)
+        frame_types = [
+            encoder.encode(frame)[0] for frame in make_frames(9)]
+        assert frame_types == [
+            FRAME_KEY, FRAME_DELTA, FRAME_DELTA, FRAME_DELTA,
+            FRAME_KEY, FRAME_DELTA, FRAME_DELTA, FRAME_DELTA,
+            FRAME_KEY,
+        ]
+
+        encoder.reset()
+        assert encoder.encode(make_frames(1)[0])[0] == FRAME_KEY
+
+    def test_decode_into_matrix(self):
+        """
+        Test decoding straight into a matrix's frame buffer.
+        """
+        matrix = NTVirtualMatrix(size=(16, 8))
+        encoder = FrameEncoder(matrix.size)
+        decoder = FrameDecoder(matrix.size, frame=matrix.framebuffer)
+
+        for frame in make_frames(5):
+            decoder.decode(*encoder.encode(frame))
+            matrix.show()
+            assert np.array_equal(matrix.frame, frame)
+
+    def test_invalid(self):
+        """
+        Test invalid channel layouts, frames and frame types.
+        """
+        with pytest.raises(NeoTilesError):
+            FrameEncoder((16, 8), channel_layout='BGR')
+
+        with pytest.raises(NeoTilesError):
+            FrameDecoder((16, 8), channel_layout='W')
+
+        with pytest.raises(NeoTilesError):
+            FrameDecoder((16, 8), frame=np.zeros((16, 8, 4), dtype=np.uint8))
+
+        with pytest.raises(NeoTilesError):
+            FrameDecoder((16, 8)).decode(7, b'')
@@ -0,0 +1,250 @@
+import multiprocessing
+import socket
+import threading
+import time
+
+import numpy as np
+
+from neotiles import PixelColor, Tile, TileManager
+from neotiles.distributed import (
+    _TICK, TICK_MAGIC, CanvasCoordinator, CanvasWorker, WorkerStats)
+from neotiles.matrixes import NTVirtualMatrix
+
+
+class FrameTimeTile(Tile):
+    """
+    A tile whose color depends on the time it is drawn at, with its first
+    pixel set from its data.
+    """
+    def draw(self):
+        color = PixelColor(
+            int(self.time * 100) % 256, 100, 0, normalized=False)
+        for row in range(self.size.rows):
+            for col in range(self.size.cols):
+                self.set_pixel((col, row), color)
+
+        if self.data is not None:
+            self.set_pixel((0, 0), PixelColor(*self.data, normalized=False))
+
+
+def set_up_tiles(manager):
+    """
+    Register the same tiles in canvas coordinates on a manager or worker.
+    """
+    manager.register_tile(FrameTimeTile(), size=(4, 2), root=(2, 1))
+    manager.register_tile(FrameTimeTile(), size=(2, 2), root=(0, 2))
+    manager.register_tile(FrameTimeTile(), size=(2, 2), root=(7, 0))
+
+
+def expected_canvas(frame_time, data):
+    """
+    Render the whole canvas on a single manager.
+    """
+    manager = TileManager(NTVirtualMatrix(size=(8, 4)), draw_fps=None)
+    set_up_tiles(manager)
+    manager.send_data_to_tiles(data)
+    for _ in manager.render_frames(1, start_time=frame_time, output=True):
+        pass
+
+    return manager.hardware_matrix.frame
+
+
+def run_worker(root, frames, addresses, results):
+    """
+    Worker process: present frames, then report the last one.
+    """
+    worker = CanvasWorker(NTVirtualMatrix(size=(4, 4)), root=root,
+                          host='127.0.0.1')
+    set_up_tiles(worker)
+    addresses.put((root, worker.address))
+    worker.run(frames=frames)
+    results.put((root, worker.manager.hardware_matrix.frame.tolist()))
+    worker.close()
+
+
+class TestDistributed:
+    def test_register_tile(self):
+        """
+        Test that workers only keep the tiles overlapping their region.
+        """
+        left = CanvasWorker(NTVirtualMatrix(size=(4, 4)), host='127.0.0.1')
+        right = CanvasWorker(
+            NTVirtualMatrix(size=(4, 4)), root=(4, 0), host='127.0.0.1')
+
+        for worker in [left, right]:
+            set_up_tiles(worker)
+
+        assert [tile['root'] for tile in left.manager.tiles_meta] == [
+            (2, 1), (0, 2)]
+        assert [tile['root'] for tile in right.manager.tiles_meta] == [
+            (-2, 1), (3, 0)]
+
+        left.close()
+        right.close()
+
+    def test_threads(self):
+        """
+        Test that the workers' regions make up the whole canvas, and that
+        every frame is acknowledged.
+        """
+        left = CanvasWorker(NTVirtualMatrix(size=(4, 4)), host='127.0.0.1')
+        right = CanvasWorker(
+            NTVirtualMatrix(size=(4, 4)), root=(4, 0), host='127.0.0.1')
+        threads = []
+        for worker in [left, right]:
+            set_up_tiles(worker)
+            threads.append(threading.Thread(
+                target=worker.run, kwargs={'frames': 5}))
+            threads[-1].start()
+
+        coordinator = CanvasCoordinator(
+            size=(8, 4), workers=[left.address, right.address],
+            host='127.0.0.1')
+        for frame_num in range(5):
+            coordinator.tick(
+                frame_time=frame_num * 0.3, data=[frame_num, 0, 9])
+        for thread in threads:
+            thread.join()
+        coordinator.receive_acks(timeout=1)
+
+        canvas = np.concatenate([
+            left.manager.hardware_matrix.frame,
+            right.manager.hardware_matrix.frame], axis=1)
+        assert np.array_equal(canvas, expected_canvas(4 * 0.3, [4, 0, 9]))
+
+        stats = coordinator.worker_stats
+        assert len(stats) == 2
+        for worker_stats in stats.values():
+            assert isinstance(worker_stats, WorkerStats)
+            assert worker_stats.frames == 5
+            assert worker_stats.last_sequence == 5
+
+        assert coordinator.skew(5) < coordinator.lead_time
+        assert left.frames_presented == right.frames_presented == 5
+        assert left.frames_missed == 0
+
+        coordinator.close()
+        left.close()
+        right.close()
+
+    def test_stale_ticks(self):
+        """
+        Test that ticks older than the latest are ignored.
+        """
+        worker = CanvasWorker(NTVirtualMatrix(size=(4, 4)), host='127.0.0.1')
+        coordinator = CanvasCoordinator(
+            size=(4, 4), workers=[worker.address], lead_time=0,
+            host='127.0.0.1')
+
+        coordinator.tick()
+        coordinator.tick()
+        coordinator._sequence = 0
+        coordinator.tick()
+
+        assert worker.poll(timeout=1)
+        assert worker.poll(timeout=1)
+        assert not worker.poll(timeout=1)
+        assert worker.frames_presented == 2
+        assert worker.ticks_ignored == 1
+
+        coordinator.close()
+        worker.close()
+
+    def test_coordinator_restart(self):
+        """
+        Test that a worker follows a restarted coordinator, whose sequence
+        numbers start again.
+        """
+        worker = CanvasWorker(NTVirtualMatrix(size=(4, 4)), host='127.0.0.1')
+
+        coordinator = CanvasCoordinator(
+            size=(4, 4), workers=[worker.address], lead_time=0,
+            host='127.0.0.1')
+        for _ in range(3):
+            coordinator.tick()
+            assert worker.poll(timeout=1)
+        assert worker.last_sequence == 3
+        coordinator.close()
+
+        restarted = CanvasCoordinator(
+            size=(4, 4), workers=[worker.address], lead_time=0,
+            host='127.0.0.1')
+        restarted.session = (coordinator.session + 1) % 2 ** 32
+        restarted.tick()
+        assert worker.poll(timeout=1)
+        assert worker.last_sequence == 1
+        assert worker.session == restarted.session
+        assert worker.sessions == 2
+        assert worker.frames_presented == 4
+        assert worker.frames_missed == 0
+        assert worker.ticks_ignored == 0
+
+        assert restarted.receive_acks(timeout=1) == 1
+        assert list(restarted.worker_stats.values())[0].last_sequence == 1
+
+        restarted.close()
+        worker.close()
+
+    def test_clock_drift(self):
+        """
+        Test that the worker's estimate of the coordinator's clock follows
+        the clocks as they drift apart, and not only as they drift together.
+        """
+        worker = CanvasWorker(
+            NTVirtualMatrix(size=(4, 4)), host='127.0.0.1', clock_window=4)
+        coordinator = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        coordinator.bind(('127.0.0.1', 0))
+
+        # The coordinator's clock falls a second further behind the worker's
+        # with every tick.
+        for sequence in range(1, 11):
+            sent_at = time.time() - sequence
+            tick = _TICK.pack(TICK_MAGIC, 1, sequence, 0, 0, sent_at)
+            assert worker._handle(tick, coordinator.getsockname())
+
+        assert worker.frames_presented == 10
+        assert 7 <= worker._clock_offset < 8
+
+        coordinator.close()
+        worker.close()
+
+    def test_processes(self):
+        """
+        Test a canvas split across worker processes talking over loopback.
+        """
+        addresses = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=run_worker, args=(root, 3, addresses, results))
+            for root in [(0, 0), (4, 0)]
+        ]
+        for process in processes:
+            process.start()
+
+        workers = dict(addresses.get(timeout=10) for _ in processes)
+        coordinator = CanvasCoordinator(
+            size=(8, 4), workers=[workers[(0, 0)], workers[(4, 0)]],
+            fps=20, host='127.0.0.1')
+        frame_times = []
+
+        def on_frame(frame_num):
+            frame_times.append(frame_num)
+            return [frame_num, 0, 9]
+
+        assert coordinator.run(frames=3, on_frame=on_frame) == 3
+        assert frame_times == [0, 1, 2]
+
+        frames = dict(results.get(timeout=10) for _ in processes)
+        for process in processes:
+            process.join()
+
+        # Each region was rendered from the same tick.
+        left = np.array(frames[(0, 0)], dtype=np.uint8)
+        right = np.array(frames[(4, 0)], dtype=np.uint8)
+        assert tuple(left[2, 0]) == tuple(left[1, 2]) == tuple(right[0, 3])
+        assert tuple(left[2, 0]) == (2, 0, 9, 0)
+        assert all(
+            stats.frames == 3 for stats in coordinator.worker_stats.values())
+
+        coordinator.close()
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from neotiles import PixelColor, Tile, TileManager
+from neotiles.dithering import TemporalDither
+from neotiles.matrixes import NTNeoPixelMatrix
+
+
+def unpack(value):
+    """
+    Split a strip pixel's 0xWWRRGGBB value into (red, green, blue, white).
+    """
+    return (
+        value >> 16 & 0xff, value >> 8 & 0xff, value & 0xff, value >> 24 & 0xff)
+
+
+class TestTemporalDither:
+    def test_instantiation(self):
+        """
+        Test temporal dither instantiation.
+        """
+        dither = TemporalDither((4, 2), brightness=16)
+        assert dither.size == (4, 2)
+        assert dither.brightness == 16
+        assert repr(dither) == 'TemporalDither(size=(4, 2), brightness=16)'
+
+        for brightness in [-1, 256, 'bright']:
+            with pytest.raises(ValueError):
+                TemporalDither((4, 2), brightness=brightness)
+
+            with pytest.raises(ValueError):
+                dither.brightness = brightness
+
+    def test_full_brightness(self):
+        """
+        Test that frames at full brightness are displayed as they are.
+        """
+        dither = TemporalDither((4, 2))
+        frame = np.arange(32, dtype=np.uint8).reshape(2, 4, 4) * 8
+
+        for _ in range(3):
+            assert np.array_equal(dither.dither(frame), frame)
+
+    def test_average_level(self):
+        """
+        Test that dimmed channels average out to their exact level.
+        """
+        dither = TemporalDither((4, 4), brightness=16)
+        frame = np.full((4, 4, 4), 100, dtype=np.uint8)
+
+        # 100 at brightness 16 is 6.27 displayable levels.
+        frames = np.array([dither.dither(frame) for _ in range(256)])
+        assert set(np.unique(frames)) == {6, 7}
+        assert frames.mean(axis=0) == pytest.approx(
+            np.full((4, 4, 4), 100 * 16 / 255), abs=0.01)
+
+        # Not every pixel steps up a level in the same frame.
+        assert len(np.unique(frames[0])) == 2
+
+    def test_16_bit_frames(self):
+        """
+        Test that 16-bit frames keep their extra precision.
+        """
+        dither = TemporalDither((1, 1), brightness=1)
+        frame = np.full((1, 1, 4), 65535 // 4, dtype=np.uint16)
+
+        frames = np.array([dither.dither(frame) for _ in range(256)])
+        assert frames.mean() == pytest.approx(0.25, abs=0.01)
+
+    def test_reset(self):
+        """
+        Test that resetting the dither repeats its output.
+        """
+        dither = TemporalDither((4, 4), brightness=16)
+        frame = np.full((4, 4, 4), 100, dtype=np.uint8)
+
+        first = [dither.dither(frame) for _ in range(4)]
+        dither.reset()
+        second = [dither.dither(frame) for _ in range(4)]
+
+        assert all(np.array_equal(a, b) for a, b in zip(first, second))
+
+
+class TestNeoPixelDither:
+    def test_dithered_output(self):
+        """
+        Test that a dithering neopixel matrix runs the strip at full
+        brightness and dims frames itself.
+        """
+        matrix = NTNeoPixelMatrix(
+            size=(2, 1), led_pin=18, led_brightness=16, dither=True)
+        assert matrix.dither.brightness == 16
+        hardware = matrix.hardware_matrix
+
+        frame = np.array([[[100, 0, 0, 0], [255, 255, 255, 255]]], np.uint8)
+        reds = []
+        for _ in range(256):
+            matrix.setFrame(frame)
+            matrix.show()
+            reds.append(unpack(hardware.getPixelColor(0))[0])
+            assert unpack(hardware.getPixelColor(1)) == (16, 16, 16, 16)
+
+        assert np.mean(reds) == pytest.approx(100 * 16 / 255, abs=0.01)
+
+        matrix.setPixelColor(0, 0, PixelColor(0, 255, 0, 0, False))
+        matrix.show()
+        assert unpack(hardware.getPixelColor(0)) == (0, 16, 0, 0)
+
+        matrix.brightness = 32
+        assert matrix.dither.brightness == 32
+        matrix.show()
+        assert unpack(hardware.getPixelColor(0)) == (0, 32, 0, 0)
+
+    def test_no_dither(self):
+        """
+        Test that neopixel matrixes don't dither by default.
+        """
+        matrix = NTNeoPixelMatrix(size=(2, 1), led_pin=18)
+        assert matrix.dither is None
+
+    def test_tile_manager_output(self):
+        """
+        Test that a TileManager sends whole frames to a dithering matrix.
+        """
+        matrix = NTNeoPixelMatrix(
+            size=(2, 1), led_pin=18, led_brightness=128, dither=True)
+
+        def set_pixel_color(x, y, color):
+            raise AssertionError('pixels should be sent as a frame')
+        matrix.setPixelColor = set_pixel_color
+
+        manager = TileManager(matrix, draw_fps=None)
+        tile = Tile(default_color=PixelColor(0, 0, 0), animate=False)
+        manager.register_tile(tile, size=(2, 1), root=(0, 0))
+        tile.set_pixel((1, 0), PixelColor(0, 0, 1))
+        manager.draw_hardware_matrix()
+
+        assert unpack(matrix.hardware_matrix.getPixelColor(1)) == (
+            0, 0, 128, 0)
@@ -0,0 +1,134 @@
+import time
+
+import pytest
+
+from neotiles import PixelColor, Tile, TileManager
+from neotiles.exceptions import NeoTilesError
+from neotiles.framerate import AdaptiveFrameRate
+from neotiles.matrixes import NTVirtualMatrix
+
+
+class CountingTile(Tile):
+    """
+    A tile which changes color every frame.
+    """
+    def __init__(self):
+        super(CountingTile, self).__init__()
+        self.count = 0
+
+    def draw(self):
+        self.count += 1
+        self.set_pixel((0, 0), PixelColor(self.count % 256, 0, 0, False))
+
+
+class TestAdaptiveFrameRate:
+    def test_instantiation(self):
+        """
+        Test adaptive frame rate instantiation.
+        """
+        frame_rate = AdaptiveFrameRate(min_fps=2, max_fps=30)
+        assert frame_rate.fps == 30
+        assert frame_rate.min_fps == 2
+        assert frame_rate.max_fps == 30
+        assert repr(frame_rate) == 'AdaptiveFrameRate(min_fps=2, max_fps=30)'
+
+        assert AdaptiveFrameRate(min_fps=2, max_fps=30, start_fps=50).fps == 30
+
+        for kwargs in [
+                {'min_fps': 0}, {'min_fps': 10, 'max_fps': 5},
+                {'increase': 0.5}, {'decrease': 1.5}, {'headroom': 0}]:
+            with pytest.raises(NeoTilesError):
+                AdaptiveFrameRate(**kwargs)
+
+    def test_update(self):
+        """
+        Test that the frame rate rises while frames change, and falls while
+        they don't or drawing can't keep up.
+        """
+        frame_rate = AdaptiveFrameRate(
+            min_fps=2, max_fps=40, start_fps=10, increase=2, decrease=0.5)
+
+        assert frame_rate.update(True, 0.001) == 20
+        assert frame_rate.update(True, 0.001) == 40
+        assert frame_rate.update(True, 0.001) == 40
+
+        assert frame_rate.update(False, 0.001) == 20
+        assert frame_rate.update(False, 0.001) == 10
+
+        # 0.1 seconds per frame can only sustain 7.5 fps with 75% headroom.
+        assert frame_rate.update(True, 0.1) == pytest.approx(5)
+        assert frame_rate.update(True, 0.1) == pytest.approx(7.5)
+        assert frame_rate.update(False, 1) == 2
+
+        assert frame_rate.frames == 8
+        assert frame_rate.frames_unchanged == 2
+        assert frame_rate.frames_saturated == 2
+
+        frame_rate.reset()
+        assert frame_rate.fps == 10
+        assert frame_rate.frames == 0
+
+    def test_zero_frame_seconds(self):
+        """
+        Test that a frame measured as taking no time doesn't break the
+        frame rate.
+        """
+        frame_rate = AdaptiveFrameRate(min_fps=2, max_fps=40, start_fps=10)
+        assert frame_rate.update(True, 0) == 11
+        assert frame_rate.update(False, 0) == pytest.approx(9.9)
+
+    def test_animation_loop(self):
+        """
+        Test that the animation loop's frames slow down when nothing changes,
+        and speed up when frames change.
+        """
+        frame_rate = AdaptiveFrameRate(
+            min_fps=5, max_fps=100, start_fps=50, increase=2, decrease=0.5)
+        manager = TileManager(
+            NTVirtualMatrix(size=(4, 4)), draw_fps=frame_rate)
+        assert manager.draw_fps == 50
+
+        tile = Tile()
+        manager.register_tile(tile, size=(4, 4), root=(0, 0))
+
+        # The first frame counts as changed.
+        assert manager._draw_adaptive_frame() == 10
+        for _ in range(5):
+            manager._draw_adaptive_frame()
+        assert manager.draw_fps == 5
+        assert frame_rate.frames_unchanged == 5
+
+        counting_tile = CountingTile()
+        manager.register_tile(counting_tile, size=(1, 1), root=(0, 0), z=1)
+        for _ in range(5):
+            manager._draw_adaptive_frame()
+        assert manager.draw_fps == 100
+        assert counting_tile.count == 5
+
+    def test_animation_thread(self):
+        """
+        Test that the animation loop runs with an adaptive frame rate.
+        """
+        manager = TileManager(
+            NTVirtualMatrix(size=(4, 4)),
+            draw_fps=AdaptiveFrameRate(min_fps=5, max_fps=100))
+        counting_tile = CountingTile()
+        manager.register_tile(counting_tile, size=(1, 1), root=(0, 0))
+
+        try:
+            manager.draw_hardware_matrix()
+            time.sleep(0.1)
+        finally:
+            manager.draw_stop()
+
+        assert counting_tile.count > 1
+
+    def test_render_offline(self):
+        """
+        Test that offline rendering defaults to the highest frame rate.
+        """
+        manager = TileManager(
+            NTVirtualMatrix(size=(4, 4)),
+            draw_fps=AdaptiveFrameRate(min_fps=5, max_fps=20))
+
+        assert manager.run_offline(duration=1).frames == 20
@@ -0,0 +1,139 @@
+import time
+
+import numpy as np
+import pytest
+
+from neotiles import PixelColor, Tile, TileManager
+from neotiles.exceptions import NeoTilesError
+from neotiles.interpolation import FrameInterpolator
+from neotiles.matrixes import NTVirtualMatrix
+
+
+class SwitchingTile(Tile):
+    """
+    A tile which switches between black and white every frame.
+    """
+    def __init__(self):
+        super(SwitchingTile, self).__init__()
+        self.count = 0
+
+    def draw(self):
+        value = 0 if self.count % 2 == 0 else 200
+        self.count += 1
+        self.set_pixel((0, 0), PixelColor(value, value, value, 0, False))
+
+
+def solid_frame(value, size=(2, 2)):
+    """
+    A frame of the given size with every channel set to value.
+    """
+    cols, rows = size
+    return np.full((rows, cols, 4), value, dtype=np.uint8)
+
+
+class TestFrameInterpolator:
+    def test_instantiation(self):
+        """
+        Test frame interpolator instantiation.
+        """
+        interpolator = FrameInterpolator((3, 2))
+        assert interpolator.size == (3, 2)
+        assert interpolator.frames_pushed == 0
+        assert repr(interpolator) == 'FrameInterpolator(size=(3, 2))'
+        assert interpolator.frame_at(0).shape == (2, 3, 4)
+
+    def test_first_frame(self):
+        """
+        Test that the first frame is displayed as it is.
+        """
+        interpolator = FrameInterpolator((2, 2))
+        interpolator.push(solid_frame(100), 1.0)
+
+        assert interpolator.weight_at(1.0) == 1.0
+        assert np.array_equal(interpolator.frame_at(1.05), solid_frame(100))
+
+    def test_cross_fade(self):
+        """
+        Test that frames fade from the previous frame to the newest frame
+        over the time between them.
+        """
+        interpolator = FrameInterpolator((2, 2))
+        interpolator.push(solid_frame(0), 1.0)
+        interpolator.push(solid_frame(200), 1.1)
+        assert interpolator.frames_pushed == 2
+
+        assert np.array_equal(interpolator.frame_at(1.1), solid_frame(0))
+        assert interpolator.weight_at(1.125) == pytest.approx(0.25)
+        assert np.array_equal(interpolator.frame_at(1.125), solid_frame(50))
+        assert np.array_equal(interpolator.frame_at(1.15), solid_frame(100))
+        assert np.array_equal(interpolator.frame_at(1.2), solid_frame(200))
+        assert np.array_equal(interpolator.frame_at(5.0), solid_frame(200))
+
+        # Fading back down.
+        interpolator.push(solid_frame(100), 1.2)
+        assert np.array_equal(interpolator.frame_at(1.25), solid_frame(150))
+
+    def test_frame_is_a_copy(self):
+        """
+        Test that the returned frames aren't changed by later frames.
+        """
+        interpolator = FrameInterpolator((2, 2))
+        interpolator.push(solid_frame(10), 1.0)
+        frame = interpolator.frame_at(1.0)
+        interpolator.push(solid_frame(20), 2.0)
+        interpolator.push(solid_frame(30), 3.0)
+
+        assert np.array_equal(frame, solid_frame(10))
+
+
+class TestTileManagerInterpolation:
+    def test_output_fps(self):
+        """
+        Test the TileManager's output frame rate.
+        """
+        matrix = NTVirtualMatrix(size=(2, 2))
+        assert TileManager(matrix).output_fps is None
+        assert TileManager(matrix, output_fps=60).output_fps == 60
+
+        with pytest.raises(NeoTilesError):
+            TileManager(matrix, output_fps=0)
+
+    def test_interpolated_frames(self):
+        """
+        Test that the matrix is refreshed with frames cross-faded between
+        the drawn frames.
+        """
+        matrix = NTVirtualMatrix(size=(2, 2))
+        manager = TileManager(matrix, draw_fps=10, output_fps=40)
+        tile = SwitchingTile()
+        manager.register_tile(tile, size=(1, 1), root=(0, 0))
+        manager._interpolator = FrameInterpolator(manager.matrix_size)
+
+        assert manager._draw_interpolated_frame(1000) == 100
+        assert manager._draw_interpolated_frame(1100) == 100
+
+        for current_time, value in [(1100, 0), (1150, 100), (1200, 200)]:
+            manager._output_interpolated_frame(current_time)
+            assert tuple(matrix.frame[0, 0]) == (value, value, value, 0)
+
+        assert matrix.frames_shown == 3
+        assert tile.count == 2
+
+    def test_animation_thread(self):
+        """
+        Test that the animation loop refreshes the matrix more often than it
+        draws the tiles.
+        """
+        matrix = NTVirtualMatrix(size=(2, 2))
+        manager = TileManager(matrix, draw_fps=10, output_fps=100)
+        tile = SwitchingTile()
+        manager.register_tile(tile, size=(1, 1), root=(0, 0))
+
+        try:
+            manager.draw_hardware_matrix()
+            time.sleep(0.25)
+        finally:
+            manager.draw_stop()
+
+        assert tile.count >= 1
+        assert matrix.frames_shown > tile.count
@@ -0,0 +1,173 @@
+import numpy as np
+import pytest
+
+from neotiles import PixelColor, Tile, TileManager
+from neotiles.exceptions import NeoTilesError
+from neotiles.layout import PanelLayout, PixelLayout, TiledLayout
+from neotiles.matrixes import NTNeoPixelMatrix, NTNetworkMatrix
+from neotiles.network import PixelReceiver
+
+
+def strip_coordinates(layout):
+    """
+    Get the (x, y) matrix position of each pixel of a layout's strip.
+    """
+    return [
+        (pixel_num % layout.size.cols, pixel_num // layout.size.cols)
+        for pixel_num in layout.pixel_map.tolist()
+    ]
+
+
+class TestLayout:
+    def test_pixel_layout(self):
+        """
+        Test a layout given as an explicit pixel map.
+        """
+        layout = PixelLayout(size=(3, 2), pixel_map=[5, 4, 3, 0, 1])
+        assert len(layout) == 5
+        assert layout.strip_index.tolist() == [[3, 4, -1], [2, 1, 0]]
+        assert repr(layout) == (
+            'PixelLayout(size=MatrixSize(cols=3, rows=2), pixels=5)')
+
+        with pytest.raises(ValueError):
+            layout.pixel_map[0] = 1
+
+        with pytest.raises(NeoTilesError) as e:
+            PixelLayout(size=(3, 2), pixel_map=[6])
+        assert 'outside the matrix' in str(e)
+
+        with pytest.raises(NeoTilesError) as e:
+            PixelLayout(size=(3, 2), pixel_map=[1, 2, 1])
+        assert 'more than once' in str(e)
+
+    def test_panel_layout(self):
+        """
+        Test the common panel wiring patterns.
+        """
+        assert strip_coordinates(PanelLayout((3, 2))) == [
+            (0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1)]
+        assert strip_coordinates(PanelLayout((3, 2), serpentine=True)) == [
+            (0, 0), (1, 0), (2, 0), (2, 1), (1, 1), (0, 1)]
+        assert strip_coordinates(PanelLayout(
+            (3, 2), serpentine=True, column_major=True)) == [
+            (0, 0), (0, 1), (1, 1), (1, 0), (2, 0), (2, 1)]
+        assert strip_coordinates(PanelLayout(
+            (3, 2), flip_x=True, flip_y=True)) == [
+            (2, 1), (1, 1), (0, 1), (2, 0), (1, 0), (0, 0)]
+
+        # A 3x2 panel rotated onto its side is displayed as 2x3, with the
+        # start of the strip at the top right.
+        assert strip_coordinates(PanelLayout((2, 3), rotation=90)) == [
+            (1, 0), (1, 1), (1, 2), (0, 0), (0, 1), (0, 2)]
+        assert strip_coordinates(PanelLayout((3, 2), rotation=180)) == [
+            (2, 1), (1, 1), (0, 1), (2, 0), (1, 0), (0, 0)]
+        assert strip_coordinates(PanelLayout((2, 3), rotation=270)) == [
+            (0, 2), (0, 1), (0, 0), (1, 2), (1, 1), (1, 0)]
+
+        with pytest.raises(NeoTilesError) as e:
+            PanelLayout((3, 2), rotation=45)
+        assert 'rotation must be one of 0, 90, 180, 270' in str(e)
+
+    def test_tiled_layout(self):
+        """
+        Test a matrix made of panels chained together.
+        """
+        panel = PanelLayout((2, 2), serpentine=True)
+        layout = TiledLayout(
+            size=(4, 3), panels=[(panel, (2, 1)), (panel, (0, 0))])
+
+        assert len(layout) == 8
+        assert strip_coordinates(layout) == [
+            (2, 1), (3, 1), (3, 2), (2, 2), (0, 0), (1, 0), (1, 1), (0, 1)]
+        assert layout.panels == [(panel, (2, 1)), (panel, (0, 0))]
+        assert layout.strip_index[2, 0] == -1
+
+        with pytest.raises(NeoTilesError) as e:
+            TiledLayout(size=(4, 3), panels=[(panel, (3, 0))])
+        assert 'does not fit' in str(e)
+
+        with pytest.raises(NeoTilesError):
+            TiledLayout(size=(4, 3), panels=[(panel, (0, 0)), (panel, (1, 0))])
+
+    def test_remap(self):
+        """
+        Test reordering a frame into strip order.
+        """
+        frame = np.arange(3 * 2 * 4, dtype=np.uint8).reshape(2, 3, 4)
+        layout = PanelLayout((3, 2), serpentine=True)
+
+        strip = layout.remap(frame)
+        assert strip.shape == (6, 4)
+        assert strip[3].tolist() == frame[1, 2].tolist()
+        assert strip[5].tolist() == frame[1, 0].tolist()
+
+        out = np.zeros((6, 4), dtype=np.uint8)
+        assert layout.remap(frame, out=out) is out
+        assert np.array_equal(out, strip)
+
+    def test_neopixel_layout(self):
+        """
+        Test that a neopixel matrix sends pixels to the strip positions given
+        by its layout.
+        """
+        layout = PanelLayout((3, 2), serpentine=True)
+        matrix = NTNeoPixelMatrix(size=(3, 2), led_pin=18, layout=layout)
+        hardware = matrix.hardware_matrix
+
+        color = PixelColor(1, 0, 0)
+        matrix.setPixelColor(0, 1, color)
+        assert hardware.getPixelColor(5) == color.hardware_int
+
+        frame = np.zeros((2, 3, 4), dtype=np.uint8)
+        frame[1, 2] = [0, 0, 255, 0]
+        frame[0, 1] = [0, 255, 0, 0]
+        matrix.setFrame(frame)
+        assert hardware.getPixelColor(3) == 0x0000ff
+        assert hardware.getPixelColor(1) == 0x00ff00
+        assert hardware.getPixelColor(5) == 0
+
+        with pytest.raises(NeoTilesError) as e:
+            NTNeoPixelMatrix(size=(2, 3), led_pin=18, layout=layout)
+        assert 'does not match matrix size' in str(e)
+
+    def test_network_layout(self):
+        """
+        Test that a network matrix sends pixels in layout order.
+        """
+        receiver = PixelReceiver(6)
+        matrix = NTNetworkMatrix(
+            size=(3, 2), host='127.0.0.1', port=receiver.address[1],
+            pixel_map=PanelLayout((3, 2), serpentine=True))
+
+        frame = np.zeros((2, 3, 4), dtype=np.uint8)
+        frame[..., 0] = np.arange(6).reshape(2, 3)
+        matrix.setFrame(frame)
+        matrix.show()
+        assert receiver.receive(timeout=1) == 1
+
+        assert receiver.strip[:, 0].tolist() == [0, 1, 2, 5, 4, 3]
+
+        matrix.close()
+        receiver.stop()
+
+    def test_tile_manager_output(self):
+        """
+        Test that a TileManager sends whole frames to a matrix with a layout,
+        rather than setting one pixel at a time.
+        """
+        layout = PanelLayout((3, 2), serpentine=True)
+        matrix = NTNeoPixelMatrix(size=(3, 2), led_pin=18, layout=layout)
+        assert matrix.layout is layout
+
+        def set_pixel_color(x, y, color):
+            raise AssertionError('pixels should be sent as a frame')
+        matrix.setPixelColor = set_pixel_color
+
+        manager = TileManager(matrix, draw_fps=None)
+        tile = Tile(default_color=PixelColor(0, 0, 0), animate=False)
+        manager.register_tile(tile, size=(3, 2), root=(0, 0))
+        tile.set_pixel((0, 1), PixelColor(0, 0, 1))
+        manager.draw_hardware_matrix()
+
+        assert matrix.hardware_matrix.getPixelColor(5) == 0x0000ff
+        assert matrix.hardware_matrix.getPixelColor(0) == 0
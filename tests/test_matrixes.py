@@ -1,8 +1,13 @@
+import time
+
+import numpy as np
 import pytest
 
 from neotiles import PixelColor
 from neotiles.exceptions import NeoTilesError
-from neotiles.matrixes import NTMatrix, NTNeoPixelMatrix, NTRGBMatrix
+from neotiles.matrixes import (
+    NTCompositeMatrix, NTMatrix, NTNeoPixelMatrix, NTRGBMatrix,
+    NTVirtualMatrix, PanelStats)
 
 
 class TestMatrixes:
@@ -64,3 +69,195 @@ class TestMatrixes:
             'pwm_lsb_nanoseconds=130, rows=32, scan_mode=0, '
             'show_refresh_rate=False, swap_green_blue=False)'
         )
+
+    def test_virtual_instantiation(self):
+        """
+        Test virtual matrix instantiation.
+        """
+        with pytest.raises(NeoTilesError) as e:
+            NTVirtualMatrix()
+        assert 'size must be specified' in str(e)
+
+        matrix = NTVirtualMatrix(size=(8, 4))
+        assert matrix.size == (8, 4)
+        assert matrix.frame.shape == (4, 8, 4)
+        assert repr(matrix) == (
+            'NTVirtualMatrix(size=MatrixSize(cols=8, rows=4), brightness=255, '
+            'pixel_latency=0, show_latency=0, dma=False, vsync_hz=None, '
+            'realtime=True)'
+        )
+
+        with pytest.raises(ValueError):
+            matrix.brightness = 256
+
+    def test_virtual_frames(self):
+        """
+        Test that pixels only appear in the virtual matrix's frame once the
+        matrix is shown.
+        """
+        matrix = NTVirtualMatrix(size=(3, 2))
+        matrix.setPixelColor(1, 0, PixelColor(10, 20, 30))
+        matrix.setPixelColor(2, 1, PixelColor(1.0, 0, 0, 0.5))
+        assert not matrix.frame.any()
+
+        matrix.show()
+        assert matrix.frames_shown == 1
+        assert matrix.frame[0][1].tolist() == [10, 20, 30, 0]
+        assert matrix.frame[1][2].tolist() == [255, 0, 0, 127]
+        assert matrix.frame[0][0].tolist() == [0, 0, 0, 0]
+
+    def test_virtual_latency(self):
+        """
+        Test the simulated latency models.
+        """
+        # Pixel and show latency.
+        matrix = NTVirtualMatrix(
+            size=(10, 10), pixel_latency=0.001, show_latency=0.5,
+            realtime=False)
+        matrix.show()
+        assert np.isclose(matrix.last_latency, 0.6)
+        matrix.show()
+        assert np.isclose(matrix.total_latency, 1.2)
+
+        # With DMA the first show returns immediately and the second has to
+        # wait for the first frame to finish sending.
+        matrix = NTVirtualMatrix.ws281x((10, 10), realtime=False)
+        matrix.show()
+        assert matrix.last_latency == 0
+        matrix.show()
+        assert np.isclose(matrix.last_latency, 100 * 0.00003 + 0.00005)
+
+        # With vsync, shows land on refresh boundaries.
+        matrix = NTVirtualMatrix.hub75(
+            (32, 32), refresh_hz=100, show_latency=0.003, realtime=False)
+        for frame_num in range(1, 4):
+            matrix.show()
+            assert np.isclose(matrix._simulated_time, frame_num * 0.01)
+
+        # Realtime shows actually take the time.
+        matrix = NTVirtualMatrix(size=(1, 1), show_latency=0.02)
+        start = time.time()
+        matrix.show()
+        assert time.time() - start >= 0.02
+
+    def test_set_frame(self):
+        """
+        Test setting a whole frame at once, using both the virtual matrix's
+        bulk copy and the base class's per-pixel fallback.
+        """
+        frame = np.zeros((2, 3, 4), dtype=np.uint8)
+        frame[0, 1] = [10, 20, 30, 0]
+        frame[1, 2] = [255, 0, 0, 127]
+
+        matrix = NTVirtualMatrix(size=(3, 2))
+        matrix.setFrame(frame)
+        matrix.show()
+        assert np.array_equal(matrix.frame, frame)
+
+        # The base class fallback.
+        matrix = NTVirtualMatrix(size=(3, 2))
+        NTMatrix.setFrame(matrix, frame)
+        matrix.show()
+        assert np.array_equal(matrix.frame, frame)
+
+    def test_composite(self):
+        """
+        Test that each panel of a composite matrix shows its region of the
+        canvas.
+        """
+        left = NTVirtualMatrix(size=(4, 2))
+        right = NTVirtualMatrix(size=(3, 3))
+        matrix = NTCompositeMatrix(
+            [(left, (0, 0)), (right, (4, 1))], synchronous=True)
+        assert matrix.size == (7, 4)
+        assert matrix.panels == [left, right]
+
+        frame = np.arange(7 * 4 * 4, dtype=np.uint8).reshape(4, 7, 4)
+        matrix.setFrame(frame)
+        matrix.setPixelColor(5, 2, PixelColor(1.0, 0, 0))
+        matrix.show()
+
+        assert np.array_equal(left.frame, frame[0:2, 0:4])
+        assert np.array_equal(right.frame[0], frame[1, 4:7])
+        assert right.frame[1, 1].tolist() == [255, 0, 0, 0]
+
+        stats = matrix.panel_stats
+        assert all(isinstance(panel, PanelStats) for panel in stats)
+        assert [panel.frames for panel in stats] == [1, 1]
+
+        matrix.brightness = 50
+        assert left.brightness == right.brightness == 50
+
+        matrix.close()
+
+    def test_composite_slow_panel(self):
+        """
+        Test that a slow panel doesn't hold up the composite matrix or the
+        other panels, and skips to the newest frame.
+        """
+        fast = NTVirtualMatrix(size=(2, 2))
+        slow = NTVirtualMatrix(size=(2, 2), show_latency=0.1)
+        matrix = NTCompositeMatrix([(fast, (0, 0)), (slow, (2, 0))])
+
+        start = time.time()
+        for value in range(1, 6):
+            matrix.setFrame(np.full((2, 4, 4), value, dtype=np.uint8))
+            matrix.show()
+            time.sleep(0.01)
+        assert time.time() - start < 0.1
+
+        matrix.wait()
+        fast_stats, slow_stats = matrix.panel_stats
+        assert fast_stats.frames == 5
+        assert slow_stats.frames + slow_stats.dropped == 5
+        assert slow_stats.dropped > 0
+        assert slow_stats.max_seconds >= 0.1 > fast_stats.max_seconds
+        assert fast.frame[0, 0, 0] == slow.frame[0, 0, 0] == 5
+
+        matrix.close()
+
+    def test_composite_invalid(self):
+        """
+        Test composite matrixes without panels or with panels off the canvas.
+        """
+        with pytest.raises(NeoTilesError):
+            NTCompositeMatrix([])
+
+        with pytest.raises(NeoTilesError):
+            NTCompositeMatrix(
+                [(NTVirtualMatrix(size=(4, 4)), (2, 0))], size=(4, 4))
+
+    def test_composite_panel_error(self):
+        """
+        Test that a panel raising an error doesn't block the composite matrix,
+        and that the error is reported.
+        """
+        class BrokenMatrix(NTVirtualMatrix):
+            def show(self):
+                raise IOError('panel unplugged')
+
+        good = NTVirtualMatrix(size=(2, 2))
+        matrix = NTCompositeMatrix(
+            [(good, (0, 0)), (BrokenMatrix(size=(2, 2)), (2, 0))],
+            synchronous=True)
+
+        with pytest.raises(NeoTilesError) as e:
+            matrix.show()
+        assert 'panel at (2, 0)' in str(e)
+        assert 'panel unplugged' in str(e)
+
+        good_stats, broken_stats = matrix.panel_stats
+        assert good_stats.frames == 1
+        assert good_stats.errors == 0
+        assert broken_stats.frames == 0
+        assert broken_stats.errors == 1
+
+        # Asynchronous shows report the error on the next call.
+        matrix.synchronous = False
+        matrix.show()
+        with pytest.raises(NeoTilesError):
+            matrix.wait()
+        matrix.wait()
+        assert matrix.panel_stats[1].errors == 2
+
+        matrix.close()
@@ -0,0 +1,238 @@
+import numpy as np
+import pytest
+
+from neotiles.exceptions import NeoTilesError
+from neotiles.framebuffer import pixels_to_frame
+from neotiles.media import Image, MediaTile
+
+
+def solid_frame(red, size=(2, 2)):
+    """
+    An RGB frame of the given (cols, rows) size with every pixel's red
+    component set to red.
+    """
+    cols, rows = size
+    frame = np.zeros((rows, cols, 3), dtype=np.uint8)
+    frame[..., 0] = red
+    return frame
+
+
+def write_ppm(path, frames):
+    """
+    Write RGB frames to a PPM file, one image after another.
+    """
+    with open(str(path), 'wb') as handle:
+        for frame in frames:
+            rows, cols = frame.shape[:2]
+            handle.write('P6\n# frame\n{} {}\n255\n'.format(
+                cols, rows).encode('ascii'))
+            handle.write(frame.tobytes())
+
+
+def reds(tile):
+    """
+    The red components of a tile's pixels.
+    """
+    return pixels_to_frame(tile.pixels)[..., 0].tolist()
+
+
+class TestMediaTile:
+    def test_instantiation(self):
+        """
+        Test media tile instantiation.
+        """
+        tile = MediaTile([solid_frame(1), solid_frame(2)])
+        assert tile.frame_count == 2
+        assert tile.frame_num == -1
+        assert not tile.finished
+        assert repr(tile) == (
+            'MediaTile(frames=2, fps=None, loop=True, cache_size=64)')
+
+        with pytest.raises(NeoTilesError):
+            MediaTile([])
+
+        with pytest.raises(NeoTilesError):
+            MediaTile([solid_frame(1)], cache_size=0)
+
+    def test_frames(self):
+        """
+        Test that every draw displays the next frame, and that the frames
+        loop.
+        """
+        tile = MediaTile([solid_frame(red) for red in (10, 20, 30)])
+        tile.size = (2, 2)
+
+        displayed = []
+        for _ in range(5):
+            tile.draw()
+            displayed.append(reds(tile)[0][0])
+
+        assert displayed == [10, 20, 30, 10, 20]
+        assert not tile.finished
+
+    def test_no_loop(self):
+        """
+        Test that the last frame stays on display if the frames don't loop.
+        """
+        tile = MediaTile([solid_frame(10), solid_frame(20)], loop=False)
+        tile.size = (2, 2)
+
+        for _ in range(4):
+            tile.draw()
+
+        assert reds(tile) == [[20, 20], [20, 20]]
+        assert tile.frame_num == 1
+        assert tile.finished
+
+    def test_fps(self):
+        """
+        Test that frames follow the tile's clock when there's a frame rate.
+        """
+        now = [100.0]
+        tile = MediaTile(
+            [solid_frame(red) for red in (10, 20, 30)], fps=10)
+        tile.clock = lambda: now[0]
+        tile.size = (2, 2)
+
+        displayed = []
+        for seconds in (0, 0.05, 0.15, 0.25, 0.35):
+            now[0] = 100.0 + seconds
+            tile.draw()
+            displayed.append(reds(tile)[0][0])
+
+        assert displayed == [10, 10, 20, 30, 10]
+
+    def test_scaling(self):
+        """
+        Test that frames are scaled to the tile's size when it's set.
+        """
+        frame = np.zeros((2, 2, 3), dtype=np.uint8)
+        frame[..., 0] = [[1, 2], [3, 4]]
+        tile = MediaTile([frame])
+
+        tile.size = (4, 2)
+        assert tile.cache_misses == 2
+        tile.draw()
+        assert reds(tile) == [[1, 1, 2, 2], [3, 3, 4, 4]]
+        assert tile.cache_hits == 1
+
+        tile.size = (1, 1)
+        tile.draw()
+        assert reds(tile) == [[1]]
+
+        tile.size = (2, 4)
+        tile.draw()
+        assert reds(tile) == [[1, 2], [1, 2], [3, 4], [3, 4]]
+
+    def test_rgbw_frames(self):
+        """
+        Test that RGBW frames keep their white component.
+        """
+        tile = MediaTile([np.full((1, 1, 4), 7, dtype=np.uint8)])
+        tile.draw()
+        assert tile.pixels[0][0].hardware_components == (7, 7, 7, 7)
+
+    def test_ppm(self, tmpdir):
+        """
+        Test reading frames from PPM files, including files with several
+        images.
+        """
+        first = tmpdir.join('first.ppm')
+        second = tmpdir.join('second.ppm')
+        write_ppm(first, [solid_frame(10), solid_frame(20)])
+        write_ppm(second, [solid_frame(30)])
+
+        tile = MediaTile(str(first))
+        assert tile.frame_count == 2
+
+        tile = MediaTile([str(first), str(second)])
+        tile.size = (2, 2)
+        displayed = []
+        for _ in range(3):
+            tile.draw()
+            displayed.append(reds(tile))
+
+        assert displayed == [[[red, red], [red, red]] for red in (10, 20, 30)]
+
+    def test_pgm(self, tmpdir):
+        """
+        Test reading 16-bit greyscale frames from a PGM file.
+        """
+        path = tmpdir.join('grey.pgm')
+        samples = np.array([[0, 65535], [32768, 1000]], dtype='>u2')
+        with open(str(path), 'wb') as handle:
+            handle.write(b'P5 2 2 65535\n')
+            handle.write(samples.tobytes())
+
+        tile = MediaTile(str(path))
+        tile.size = (2, 2)
+        tile.draw()
+
+        assert pixels_to_frame(tile.pixels)[..., :3].tolist() == [
+            [[0, 0, 0], [255, 255, 255]], [[127, 127, 127], [3, 3, 3]]]
+
+    def test_bad_files(self, tmpdir):
+        """
+        Test that unsupported and truncated files are errors.
+        """
+        ascii_ppm = tmpdir.join('ascii.ppm')
+        ascii_ppm.write('P3 1 1 255\n1 2 3\n')
+        with pytest.raises(NeoTilesError):
+            MediaTile(str(ascii_ppm))
+
+        truncated = tmpdir.join('truncated.ppm')
+        truncated.write_binary(b'P6 2 2 255\n\x00\x00')
+        with pytest.raises(NeoTilesError):
+            MediaTile(str(truncated))
+
+    def test_streaming(self, tmpdir):
+        """
+        Test that long sequences are read from disk as they're displayed,
+        keeping only the most recently displayed frames.
+        """
+        paths = []
+        for frame_num in range(6):
+            path = tmpdir.join('frame{}.ppm'.format(frame_num))
+            write_ppm(path, [solid_frame(frame_num * 10)])
+            paths.append(str(path))
+
+        tile = MediaTile(paths, cache_size=3)
+        tile.size = (2, 2)
+        assert tile.cache_misses == 0
+
+        for _ in range(3):
+            tile.draw()
+        assert tile.cache_misses == 3
+
+        # Frames are read when they're displayed, so later changes to the
+        # files are picked up.
+        write_ppm(paths[3], [solid_frame(99)])
+        tile.draw()
+        assert reds(tile)[0][0] == 99
+        assert len(tile._cache) == 3
+
+        # Frames which fell out of the cache are read again.
+        for _ in range(3):
+            tile.draw()
+        assert reds(tile)[0][0] == 0
+        assert tile.cache_misses == 7
+        assert tile.cache_hits == 0
+
+    @pytest.mark.skipif(Image is None, reason='PIL is not installed')
+    def test_gif(self, tmpdir):
+        """
+        Test reading frames from an animated GIF.
+        """
+        path = str(tmpdir.join('anim.gif'))
+        images = [
+            Image.fromarray(solid_frame(red), 'RGB') for red in (255, 0)]
+        images[0].save(path, save_all=True, append_images=images[1:])
+
+        tile = MediaTile(path)
+        tile.size = (2, 2)
+        assert tile.frame_count == 2
+
+        tile.draw()
+        assert reds(tile) == [[255, 255], [255, 255]]
+        tile.draw()
+        assert reds(tile) == [[0, 0], [0, 0]]
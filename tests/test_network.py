@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from neotiles import PixelColor, Tile, TileManager
+from neotiles.exceptions import NeoTilesError
+from neotiles.matrixes import NTNetworkMatrix
+from neotiles.network import PixelReceiver, pixels_per_packet
+
+
+def random_frame(size, seed=0):
+    cols, rows = size
+    random = np.random.RandomState(seed)
+    return random.randint(0, 256, (rows, cols, 4)).astype(np.uint8)
+
+
+def receive(receiver, packets):
+    """
+    Receive packets until ``packets`` have arrived (or nothing more does).
+    """
+    received = 0
+    while received < packets:
+        count = receiver.receive(timeout=1)
+        if count == 0:
+            break
+        received += count
+
+    return received
+
+
+class TestNetwork:
+    def test_packets_per_frame(self):
+        """
+        Test splitting frames into packets.
+        """
+        assert pixels_per_packet('e131') == 170
+        assert pixels_per_packet('opc') == 489
+        assert pixels_per_packet('e131', max_packet_size=576) == 150
+
+        with pytest.raises(NeoTilesError):
+            pixels_per_packet('artnet')
+
+        with pytest.raises(NeoTilesError):
+            pixels_per_packet('opc', max_packet_size=6)
+
+    @pytest.mark.parametrize('protocol', ['e131', 'opc'])
+    def test_send_frame(self, protocol):
+        """
+        Test that a frame arrives at the receiver intact.
+        """
+        receiver = PixelReceiver(64 * 32, protocol=protocol)
+        matrix = NTNetworkMatrix(
+            size=(64, 32), host='127.0.0.1', port=receiver.address[1],
+            protocol=protocol)
+
+        frame = random_frame((64, 32))
+        matrix.setFrame(frame)
+        matrix.show()
+
+        expected_packets = -(-64 * 32 // pixels_per_packet(protocol))
+        assert matrix.packets_per_frame == expected_packets
+        assert receive(receiver, expected_packets) == expected_packets
+        assert receiver.packets_rejected == 0
+        assert np.array_equal(receiver.strip, frame.reshape(-1, 4)[:, :3])
+
+        matrix.close()
+        receiver.stop()
+
+    def test_pixel_map_and_brightness(self):
+        """
+        Test sending the pixels in a different order and at a lower
+        brightness.
+        """
+        receiver = PixelReceiver(6)
+        # Reverse the pixels and repeat the first one.
+        pixel_map = [4, 3, 2, 1, 0, 0]
+        matrix = NTNetworkMatrix(
+            size=(5, 1), host='127.0.0.1', port=receiver.address[1],
+            pixel_map=pixel_map, brightness=128)
+
+        for x in range(5):
+            matrix.setPixelColor(x, 0, PixelColor(x * 50, 0, 250, 0, False))
+        matrix.show()
+        receive(receiver, 1)
+
+        assert receiver.strip[:, 0].tolist() == [
+            (x * 50 * 128) // 255 for x in pixel_map]
+        assert receiver.strip[0, 2] == (250 * 128) // 255
+
+        with pytest.raises(NeoTilesError):
+            NTNetworkMatrix(size=(5, 1), host='127.0.0.1', pixel_map=[5])
+
+        matrix.close()
+        receiver.stop()
+
+    def test_changed_only(self):
+        """
+        Test that only packets containing changed pixels are resent.
+        """
+        receiver = PixelReceiver(64 * 32)
+        matrix = NTNetworkMatrix(
+            size=(64, 32), host='127.0.0.1', port=receiver.address[1],
+            changed_only=True, keepalive=None)
+        packets = matrix.packets_per_frame
+
+        matrix.setFrame(random_frame((64, 32)))
+        matrix.show()
+        assert matrix.packets_sent == packets
+
+        matrix.show()
+        assert matrix.packets_sent == packets
+        assert matrix.packets_skipped == packets
+
+        matrix.setPixelColor(0, 31, PixelColor(1.0, 1.0, 1.0))
+        matrix.show()
+        assert matrix.packets_sent == packets + 1
+
+        receive(receiver, packets + 1)
+        assert receiver.strip[64 * 31].tolist() == [255, 255, 255]
+
+        matrix.close()
+        receiver.stop()
+
+    def test_tile_manager(self):
+        """
+        Test driving a network matrix from a TileManager, with the receiver
+        running in the background.
+        """
+        receiver = PixelReceiver(10 * 5)
+        receiver.start()
+        matrix = NTNetworkMatrix(
+            size=(10, 5), host='127.0.0.1', port=receiver.address[1])
+
+        manager = TileManager(matrix, draw_fps=None)
+        manager.register_tile(
+            Tile(default_color=PixelColor(0, 1.0, 0)), size=(2, 2),
+            root=(0, 0))
+        manager.draw_hardware_matrix()
+
+        receiver.stop()
+        matrix.close()
+
+        assert receiver.packets_received == 1
+        assert receiver.strip[11].tolist() == [0, 255, 0]
+        assert receiver.strip[2].tolist() == [0, 0, 0]
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from neotiles import PixelColor, Tile, TileManager
+from neotiles.exceptions import NeoTilesError
+from neotiles.matrixes import NTVirtualMatrix
+from neotiles.power import PowerLimiter
+
+
+def white_frame(cols=10, rows=10):
+    return np.full((rows, cols, 4), 255, dtype=np.uint8)
+
+
+class TestPowerLimiter:
+    def test_instantiation(self):
+        """
+        Test power limiter instantiation.
+        """
+        with pytest.raises(NeoTilesError) as e:
+            PowerLimiter(budget_ma=0)
+        assert 'budget_ma must be positive' in str(e)
+
+        with pytest.raises(NeoTilesError) as e:
+            PowerLimiter(budget_ma=100, channel_ma=(20, 20, 20))
+        assert 'channel_ma must have' in str(e)
+
+        limiter = PowerLimiter(budget_ma=100)
+        assert repr(limiter) == (
+            'PowerLimiter(budget_ma=100, channel_ma=(20, 20, 20, 20), '
+            'idle_ma=0.0, limit_brightness=False, max_brightness=255)')
+
+        limiter.budget_ma = 200
+        assert limiter.budget_ma == 200
+        with pytest.raises(ValueError):
+            limiter.budget_ma = -1
+        with pytest.raises(ValueError):
+            limiter.budget_ma = 'string'
+
+    def test_estimate(self):
+        """
+        Test estimating the current drawn by a frame.
+        """
+        limiter = PowerLimiter(
+            budget_ma=100, channel_ma=(10, 20, 30, 40), idle_ma=1)
+
+        frame = np.zeros((2, 5, 4), dtype=np.uint8)
+        assert limiter.estimate(frame) == pytest.approx(10)
+
+        frame[0, 0] = [255, 0, 0, 0]
+        frame[1, 4] = [0, 255, 0, 255]
+        assert limiter.estimate(frame) == pytest.approx(80)
+        assert limiter.estimate(frame, brightness=51) == pytest.approx(24)
+
+    def test_limit_frame(self):
+        """
+        Test scaling frames down to the budget.
+        """
+        limiter = PowerLimiter(budget_ma=4000)
+
+        frame = np.zeros((10, 10, 4), dtype=np.uint8)
+        limited, brightness = limiter.limit(frame, 255)
+        assert limited is frame
+        assert brightness == 255
+        assert limiter.scale == 1
+        assert limiter.frames_limited == 0
+
+        frame = white_frame()
+        limited, brightness = limiter.limit(frame, 255)
+        assert limiter.estimated_ma == pytest.approx(8000)
+        assert limiter.scale == pytest.approx(0.5)
+        assert limiter.frames_limited == 1
+        assert brightness == 255
+        assert np.all(limited == 127)
+        assert limiter.estimate(limited) <= 4000
+
+        # The hardware brightness is already halving the draw.
+        limited, brightness = limiter.limit(frame, 127)
+        assert limited is frame
+        assert limiter.estimated_ma == pytest.approx(8000 * 127 / 255)
+
+    def test_limit_brightness(self):
+        """
+        Test lowering the matrix brightness to keep within the budget.
+        """
+        limiter = PowerLimiter(
+            budget_ma=2000, limit_brightness=True, max_brightness=100)
+
+        frame = white_frame()
+        limited, brightness = limiter.limit(frame, 100)
+        assert limited is frame
+        assert brightness == 25
+        assert limiter.limited_ma == pytest.approx(2000)
+
+        # Without a brightness the frame has to be scaled.
+        limited, brightness = limiter.limit(frame)
+        assert brightness is None
+        assert np.all(limited == 63)
+
+    def test_tile_manager(self):
+        """
+        Test that a TileManager limits the frames it displays.
+        """
+        matrix = NTVirtualMatrix(size=(10, 10), brightness=200)
+        limiter = PowerLimiter(budget_ma=2000, limit_brightness=True)
+        manager = TileManager(matrix, draw_fps=None, power_limiter=limiter)
+        assert manager.power_limiter is limiter
+
+        tile = Tile(default_color=PixelColor(1, 1, 1, 1))
+        manager.register_tile(tile, size=(10, 10), root=(0, 0))
+        manager.draw_hardware_matrix()
+
+        assert np.all(matrix.frame == 255)
+        assert matrix.brightness == 63
+        assert manager.brightness == 200
+        assert limiter.estimated_ma == pytest.approx(8000 * 200 / 255)
+
+        # Within the budget, so the requested brightness is restored.
+        tile.default_color = PixelColor(0, 0, 0, 0)
+        tile.clear()
+        manager.draw_hardware_matrix()
+        assert matrix.brightness == 200
+
+        tile.default_color = PixelColor(1, 1, 1, 1)
+        tile.clear()
+        manager.draw_hardware_matrix()
+        assert matrix.brightness == 63
+
+        manager.power_limiter = None
+        assert matrix.brightness == 200
+        manager.draw_hardware_matrix()
+        assert matrix.brightness == 200
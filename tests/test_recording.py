@@ -0,0 +1,181 @@
+import numpy as np
+import pytest
+
+from neotiles import MatrixSize, PixelColor, Tile
+from neotiles.exceptions import NeoTilesError
+from neotiles.matrixes import NTVirtualMatrix
+from neotiles.recording import FramePlayer, FrameRecorder
+
+from .fixtures import manager_virtual
+
+
+def make_frames(count, size=(6, 4)):
+    """
+    Make frames with a single moving pixel on a constant background.
+    """
+    cols, rows = size
+    frames = []
+    for frame_num in range(count):
+        frame = np.full((rows, cols, 4), 20, dtype=np.uint8)
+        frame[frame_num % rows, frame_num % cols] = [255, 128, 0, 64]
+        frames.append(frame)
+
+    return frames
+
+
+class TestRecording:
+    @pytest.mark.parametrize('delta', [True, False])
+    def test_round_trip(self, tmpdir, delta):
+        """
+        Test that recorded frames and timestamps are played back unchanged.
+        """
+        path = str(tmpdir.join('frames.ntr'))
+        frames = make_frames(10)
+
+        with FrameRecorder(path, size=(6, 4), delta=delta) as recorder:
+            for frame_num, frame in enumerate(frames):
+                recorder.write(frame, frame_num * 0.1)
+            assert recorder.frames_written == 10
+
+        with FramePlayer(path) as player:
+            assert player.size == MatrixSize(6, 4)
+            assert player.channel_layout == 'RGBW'
+            assert len(player) == 10
+            assert np.isclose(player.duration, 0.9)
+
+            played = [
+                (timestamp, frame.copy())
+                for timestamp, frame in player.frames()
+            ]
+
+        assert [timestamp for timestamp, _ in played] == [
+            frame_num * 0.1 for frame_num in range(10)]
+        for (_, played_frame), frame in zip(played, frames):
+            assert np.array_equal(played_frame, frame)
+
+    def test_delta_is_smaller(self, tmpdir):
+        """
+        Test that delta encoding produces a smaller recording when little
+        changes between frames, and that RGB recordings drop the white
+        component.
+        """
+        sizes = {}
+        for name, kwargs in [
+                ('raw', {'delta': False}),
+                ('delta', {'delta': True}),
+                ('rgb', {'delta': False, 'channel_layout': 'RGB'})]:
+            path = tmpdir.join('{}.ntr'.format(name))
+            with FrameRecorder(str(path), size=(6, 4), **kwargs) as recorder:
+                for frame_num, frame in enumerate(make_frames(10)):
+                    recorder.write(frame, frame_num)
+            sizes[name] = path.size()
+
+        assert sizes['delta'] < sizes['raw']
+        assert sizes['rgb'] < sizes['raw']
+
+        with FramePlayer(str(tmpdir.join('rgb.ntr'))) as player:
+            _, frame = list(player.frames())[-1]
+            assert frame[..., 3].sum() == 0
+            assert np.array_equal(frame[..., :3], make_frames(10)[-1][..., :3])
+
+    def test_invalid(self, tmpdir):
+        """
+        Test invalid channel layouts and recording files.
+        """
+        with pytest.raises(NeoTilesError):
+            FrameRecorder(str(tmpdir.join('bad.ntr')), (2, 2), 'BGR')
+
+        path = tmpdir.join('not_a_recording.ntr')
+        path.write('this is not a recording')
+        with pytest.raises(NeoTilesError):
+            FramePlayer(str(path))
+
+        empty = tmpdir.join('empty.ntr')
+        empty.write('')
+        with pytest.raises(NeoTilesError):
+            FramePlayer(str(empty))
+
+    def test_truncated(self, tmpdir):
+        """
+        Test that a recording which was cut short plays up to its last whole
+        frame.
+        """
+        path = tmpdir.join('frames.ntr')
+        frames = make_frames(3)
+
+        with FrameRecorder(str(path), size=(6, 4), delta=False) as recorder:
+            for frame_num, frame in enumerate(frames):
+                recorder.write(frame, frame_num)
+
+        path.write_binary(path.read_binary()[:-10])
+
+        with FramePlayer(str(path)) as player:
+            assert len(player) == 2
+            assert player.duration == 1
+            played = [frame.copy() for _, frame in player.frames()]
+
+        assert len(played) == 2
+        assert np.array_equal(played[-1], frames[1])
+
+    def test_frames_from(self, tmpdir):
+        """
+        Test decoding a recording from part way through, which starts from
+        the nearest earlier keyframe.
+        """
+        path = str(tmpdir.join('frames.ntr'))
+        frames = make_frames(10)
+
+        with FrameRecorder(
+                path, size=(6, 4), keyframe_interval=4) as recorder:
+            for frame_num, frame in enumerate(frames):
+                recorder.write(frame, frame_num)
+
+        with FramePlayer(path) as player:
+            played = list(player.frames(start=6))
+            assert len(played) == 4
+            assert played[0][0] == 6
+            assert np.array_equal(played[-1][1], frames[-1])
+
+    def test_play(self, tmpdir):
+        """
+        Test playing a recording on a matrix, keeping the original timing.
+        """
+        path = str(tmpdir.join('frames.ntr'))
+        with FrameRecorder(path, size=(6, 4)) as recorder:
+            for frame_num, frame in enumerate(make_frames(5)):
+                recorder.write(frame, 1000 + frame_num * 0.01)
+
+        matrix = NTVirtualMatrix(size=(6, 4))
+        with FramePlayer(path) as player:
+            player.play(matrix)
+            assert matrix.frames_shown == 5
+            assert np.array_equal(matrix.frame, make_frames(5)[-1])
+
+            with pytest.raises(NeoTilesError):
+                player.play(NTVirtualMatrix(size=(4, 6)))
+
+    def test_manager_recording(self, tmpdir, manager_virtual):
+        """
+        Test recording the frames displayed by a TileManager.
+        """
+        path = str(tmpdir.join('manager.ntr'))
+        tile = Tile(default_color=PixelColor(0, 0, 1.0))
+        manager_virtual.register_tile(tile, size=(2, 2), root=(1, 1))
+
+        manager_virtual.start_recording(path)
+        displayed = []
+        for _ in manager_virtual.render_frames(3, fps=10, output=True):
+            displayed.append(manager_virtual.hardware_matrix.frame.copy())
+        assert manager_virtual.stop_recording() == 3
+        assert manager_virtual.stop_recording() == 0
+
+        with FramePlayer(path) as player:
+            played = [
+                (timestamp, frame.copy())
+                for timestamp, frame in player.frames()
+            ]
+
+        assert [timestamp for timestamp, _ in played] == [0, 0.1, 0.2]
+        for (_, played_frame), frame in zip(played, displayed):
+            assert np.array_equal(played_frame, frame)
+        assert played[0][1][1, 1].tolist() == [0, 0, 255, 0]
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from neotiles import MatrixSize, PixelColor, Tile
+from neotiles.exceptions import NeoTilesError
+from neotiles.matrixes import NTVirtualMatrix
+from neotiles.scene import Scene
+
+from .fixtures import manager_virtual
+
+
+class BlinkTile(Tile):
+    """
+    A tile which is on for half a second and off for half a second.
+    """
+    def draw(self):
+        on = int(self.time * 2) % 2 == 0
+        self.clear()
+        if on:
+            self.set_pixel((0, 0), PixelColor(1.0, 0, 0))
+
+
+class TestScene:
+    def test_bake_loop(self, manager_virtual):
+        """
+        Test that a looping animation is baked into one deduplicated loop.
+        """
+        manager_virtual.register_tile(BlinkTile(), size=(2, 2), root=(0, 0))
+        scene = manager_virtual.bake(duration=3, fps=10)
+
+        assert scene.loops
+        assert len(scene) == 10
+        assert scene.unique_frames == 2
+        assert scene.size == MatrixSize(10, 5)
+        assert scene.duration == 1
+
+        frames = list(scene.frames())
+        assert frames[0][0, 0].tolist() == [255, 0, 0, 0]
+        assert frames[4][0, 0].tolist() == [255, 0, 0, 0]
+        assert frames[5][0, 0].tolist() == [0, 0, 0, 0]
+
+    def test_bake_without_loop(self, manager_virtual):
+        """
+        Test baking when there is no loop, or loop detection is disabled.
+        """
+        manager_virtual.register_tile(BlinkTile(), size=(2, 2), root=(0, 0))
+
+        # Less than two repetitions isn't enough to detect a loop.
+        scene = manager_virtual.bake(duration=1.5, fps=10)
+        assert not scene.loops
+        assert len(scene) == 15
+        assert scene.unique_frames == 2
+
+        scene = manager_virtual.bake(duration=3, fps=10, detect_loop=False)
+        assert not scene.loops
+        assert len(scene) == 30
+
+    def test_no_frames(self):
+        """
+        Test that a scene needs frames.
+        """
+        with pytest.raises(NeoTilesError):
+            Scene.from_frames([], fps=10)
+
+    def test_save_load(self, tmpdir, manager_virtual):
+        """
+        Test that a scene survives being saved and loaded.
+        """
+        path = str(tmpdir.join('blink.nts'))
+        manager_virtual.register_tile(BlinkTile(), size=(2, 2), root=(0, 0))
+        scene = manager_virtual.bake(duration=3, fps=10)
+        scene.save(path)
+
+        loaded = Scene.load(path)
+        assert repr(loaded) == repr(scene)
+        for loaded_frame, frame in zip(loaded.frames(), scene.frames()):
+            assert np.array_equal(loaded_frame, frame)
+
+        not_a_scene = tmpdir.join('not_a_scene.nts')
+        not_a_scene.write('this is not a scene')
+        with pytest.raises(NeoTilesError):
+            Scene.load(str(not_a_scene))
+
+    def test_play(self, manager_virtual):
+        """
+        Test playing a scene on a matrix.
+        """
+        manager_virtual.register_tile(BlinkTile(), size=(2, 2), root=(0, 0))
+        scene = manager_virtual.bake(duration=1, fps=10, detect_loop=False)
+
+        matrix = NTVirtualMatrix(size=(10, 5))
+        scene.play(matrix, speed=20)
+        assert matrix.frames_shown == 10
+        assert np.array_equal(matrix.frame, list(scene.frames())[-1])
+
+        with pytest.raises(NeoTilesError):
+            scene.play(NTVirtualMatrix(size=(5, 10)))
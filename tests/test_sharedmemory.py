@@ -0,0 +1,229 @@
+import multiprocessing
+import time
+
+import numpy as np
+import pytest
+
+from neotiles import PixelColor, Tile, TileManager
+from neotiles.exceptions import NeoTilesError
+from neotiles.matrixes import NTSharedMemoryMatrix, NTVirtualMatrix
+from neotiles.sharedmemory import FrameRing, SharedMemoryDriver
+
+
+def random_frame(seed, size=(8, 4)):
+    cols, rows = size
+    random = np.random.RandomState(seed)
+    return random.randint(0, 256, (rows, cols, 4)).astype(np.uint8)
+
+
+def drive_frames(path, frame_count, results):
+    """
+    Driver process: display frame_count frames on a virtual matrix and
+    report the last frame and the frame count back.
+    """
+    matrix = NTVirtualMatrix(size=(8, 4))
+    driver = SharedMemoryDriver(path, matrix)
+    while driver.frames_shown + driver.frames_dropped < frame_count:
+        if not driver.poll():
+            time.sleep(0.001)
+    results.put((matrix.frame.tolist(), driver.frames_shown))
+    driver.close()
+
+
+class TestSharedMemory:
+    def test_publish_and_poll(self, tmpdir):
+        """
+        Test that shown frames reach the driver's matrix, and that the
+        driver only shows new frames.
+        """
+        path = str(tmpdir.join('ring'))
+        writer = NTSharedMemoryMatrix(size=(8, 4), path=path)
+        display = NTVirtualMatrix(size=(8, 4))
+        driver = SharedMemoryDriver(path, display)
+
+        assert not driver.poll()
+
+        frame = random_frame(0)
+        writer.setFrame(frame)
+        writer.show()
+        assert writer.frames_published == 1
+
+        assert driver.poll()
+        assert np.array_equal(display.frame, frame)
+        assert driver.last_latency >= 0
+        assert not driver.poll()
+
+        writer.setPixelColor(1, 2, PixelColor(1.0, 0, 0))
+        writer.show()
+        assert driver.poll()
+        assert display.frame[2, 1].tolist() == [255, 0, 0, 0]
+        assert driver.frames_shown == 2
+
+        driver.close()
+        writer.close()
+
+    def test_dropped_frames(self, tmpdir):
+        """
+        Test that a slow driver skips to the latest frame.
+        """
+        path = str(tmpdir.join('ring'))
+        writer = NTSharedMemoryMatrix(size=(8, 4), path=path, slots=3)
+        display = NTVirtualMatrix(size=(8, 4))
+        driver = SharedMemoryDriver(path, display)
+
+        for seed in range(10):
+            writer.setFrame(random_frame(seed))
+            writer.show()
+
+        assert driver.poll()
+        assert np.array_equal(display.frame, random_frame(9))
+
+        writer.show()
+        assert driver.poll()
+        assert driver.frames_shown == 2
+        assert driver.frames_dropped == 0
+
+        writer.show()
+        writer.show()
+        assert driver.poll()
+        assert driver.frames_dropped == 1
+
+        # The writer restarting resets the sequence numbers.
+        writer.close()
+        writer = NTSharedMemoryMatrix(size=(8, 4), path=path, slots=3)
+        writer.setFrame(random_frame(1))
+        writer.show()
+        assert driver.poll()
+        assert np.array_equal(display.frame, random_frame(1))
+
+        driver.close()
+        writer.close()
+
+    def test_brightness(self, tmpdir):
+        """
+        Test that brightness changes are passed to the driver.
+        """
+        path = str(tmpdir.join('ring'))
+        writer = NTSharedMemoryMatrix(size=(8, 4), path=path, brightness=100)
+        display = NTVirtualMatrix(size=(8, 4))
+        driver = SharedMemoryDriver(path, display)
+
+        writer.show()
+        driver.poll()
+        assert display.brightness == 100
+
+        writer.brightness = 20
+        writer.show()
+        driver.poll()
+        assert display.brightness == 20
+
+        with pytest.raises(ValueError):
+            writer.brightness = 300
+
+        driver.close()
+        writer.close()
+
+    def test_brightness_unset(self, tmpdir):
+        """
+        Test that the driver leaves the matrix's brightness alone until the
+        writer sets one, and scales it to the matrix's range.
+        """
+        path = str(tmpdir.join('ring'))
+        writer = NTSharedMemoryMatrix(size=(8, 4), path=path)
+        assert writer.brightness is None
+
+        display = NTVirtualMatrix(size=(8, 4), brightness=64)
+        driver = SharedMemoryDriver(path, display, max_brightness=100)
+
+        writer.show()
+        assert driver.poll()
+        assert display.brightness == 64
+
+        writer.brightness = 255
+        writer.show()
+        assert driver.poll()
+        assert display.brightness == 100
+
+        writer.brightness = 51
+        writer.show()
+        assert driver.poll()
+        assert display.brightness == 20
+
+        driver.close()
+        writer.close()
+
+    def test_invalid(self, tmpdir):
+        """
+        Test mismatched sizes and files which aren't ring buffers.
+        """
+        path = str(tmpdir.join('ring'))
+        writer = NTSharedMemoryMatrix(size=(8, 4), path=path)
+        with pytest.raises(NeoTilesError):
+            SharedMemoryDriver(path, NTVirtualMatrix(size=(4, 8)))
+        writer.close()
+
+        not_a_ring = tmpdir.join('not_a_ring')
+        not_a_ring.write('this is not a ring buffer')
+        with pytest.raises(NeoTilesError):
+            FrameRing(str(not_a_ring))
+
+        with pytest.raises(NeoTilesError):
+            FrameRing(path, size=(8, 4), slots=1, create=True)
+
+    def test_writer_restart(self, tmpdir):
+        """
+        Test that a new writer replaces the ring rather than truncating the
+        one the driver has mapped, and that the driver follows the new ring.
+        """
+        path = str(tmpdir.join('ring'))
+        writer = NTSharedMemoryMatrix(size=(8, 4), path=path)
+        display = NTVirtualMatrix(size=(8, 4))
+        driver = SharedMemoryDriver(path, display)
+
+        writer.setFrame(random_frame(0))
+        writer.show()
+        assert driver.poll()
+        writer.close()
+
+        restarted = NTSharedMemoryMatrix(size=(8, 4), path=path)
+        assert tmpdir.listdir() == [tmpdir.join('ring')]
+
+        # The driver's old ring is still readable.
+        assert driver._ring.replaced
+        assert driver._ring.latest == 1
+
+        frame = random_frame(1)
+        restarted.setFrame(frame)
+        restarted.show()
+        assert driver.poll()
+        assert np.array_equal(display.frame, frame)
+        assert not driver._ring.replaced
+        assert driver.frames_shown == 2
+
+        driver.close()
+        restarted.close()
+
+    def test_separate_process(self, tmpdir):
+        """
+        Test displaying frames from a TileManager in a driver process.
+        """
+        path = str(tmpdir.join('ring'))
+        matrix = NTSharedMemoryMatrix(size=(8, 4), path=path)
+        manager = TileManager(matrix, draw_fps=None)
+        manager.register_tile(
+            Tile(default_color=PixelColor(0, 0, 1.0)), size=(2, 2),
+            root=(3, 1))
+
+        results = multiprocessing.Queue()
+        driver = multiprocessing.Process(
+            target=drive_frames, args=(path, 1, results))
+        driver.start()
+
+        manager.draw_hardware_matrix()
+        frame, frames_shown = results.get(timeout=10)
+        driver.join()
+        matrix.close()
+
+        assert frames_shown == 1
+        assert frame[1][3] == [0, 0, 255, 0]
+        assert frame[0][0] == [0, 0, 0, 0]
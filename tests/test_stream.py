@@ -0,0 +1,215 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from neotiles import PixelColor, TileManager
+from neotiles.exceptions import NeoTilesError
+from neotiles.framebuffer import pixels_to_frame
+from neotiles.matrixes import NTVirtualMatrix
+from neotiles.stream import StreamTile
+
+
+def counting_frames(size, count):
+    """
+    Generate count frames of the given (cols, rows) size, with the red
+    component of every pixel set to the frame number.
+    """
+    cols, rows = size
+    for frame_num in range(count):
+        frame = np.zeros((rows, cols, 4), dtype=np.uint8)
+        frame[..., 0] = frame_num
+        yield frame
+
+
+def wait_for(condition, timeout=2):
+    """
+    Wait until condition() is true, or fail after timeout seconds.
+    """
+    end = time.time() + timeout
+    while not condition():
+        assert time.time() < end, 'timed out waiting for condition'
+        time.sleep(0.001)
+
+
+class TestStreamTile:
+    def test_instantiation(self):
+        """
+        Test stream tile instantiation.
+        """
+        tile = StreamTile([])
+        assert tile.prefetch == 0
+        assert not tile.finished
+        assert repr(tile) == 'StreamTile(prefetch=0)'
+
+        with pytest.raises(NeoTilesError):
+            StreamTile([], prefetch=-1)
+
+    def test_one_frame_per_draw(self):
+        """
+        Test that every draw takes exactly one frame from the source.
+        """
+        tile = StreamTile(counting_frames((2, 2), 3))
+        tile.size = (2, 2)
+
+        for frame_num in range(3):
+            tile.draw()
+            assert pixels_to_frame(tile.pixels)[..., 0].tolist() == [
+                [frame_num, frame_num], [frame_num, frame_num]]
+
+        assert tile.frames_drawn == 3
+        assert not tile.finished
+
+        # The last frame stays on display.
+        tile.draw()
+        assert tile.finished
+        tile.draw()
+        assert pixels_to_frame(tile.pixels)[0, 0, 0] == 2
+        assert tile.frames_drawn == 3
+
+    def test_frame_types(self):
+        """
+        Test that frames can be RGBW arrays, RGB arrays, or pixel colors.
+        """
+        red = PixelColor(255, 0, 0)
+        frames = [
+            np.full((1, 2, 4), 10, dtype=np.uint8),
+            np.full((1, 2, 3), 20, dtype=np.uint8),
+            [[red, red]],
+        ]
+        tile = StreamTile(frames)
+        tile.size = (2, 1)
+
+        tile.draw()
+        assert tile.pixels[0][1].hardware_components == (10, 10, 10, 10)
+        tile.draw()
+        assert tile.pixels[0][1].hardware_components == (20, 20, 20)
+        tile.draw()
+        assert tile.pixels[0][1] is red
+
+    def test_frame_sizes(self):
+        """
+        Test that frames are cropped to the tile, and frames smaller than the
+        tile leave the rest of the tile alone.
+        """
+        black = PixelColor(0, 0, 0, 0)
+        tile = StreamTile([
+            np.full((3, 3, 4), 50, dtype=np.uint8),
+            np.full((1, 1, 4), 100, dtype=np.uint8),
+        ], default_color=black)
+        tile.size = (2, 2)
+
+        tile.draw()
+        assert pixels_to_frame(tile.pixels)[..., 0].tolist() == [
+            [50, 50], [50, 50]]
+        tile.draw()
+        assert pixels_to_frame(tile.pixels)[..., 0].tolist() == [
+            [100, 50], [50, 50]]
+
+    def test_prefetch(self):
+        """
+        Test that frames are read ahead into a bounded buffer.
+        """
+        pulled = []
+
+        def source():
+            for frame in counting_frames((1, 1), 10):
+                pulled.append(frame)
+                yield frame
+
+        tile = StreamTile(source(), prefetch=3)
+        tile.size = (1, 1)
+
+        # The buffer holds 3 frames, and the thread holds one more waiting
+        # for room in the buffer.
+        wait_for(lambda: len(pulled) == 4)
+        time.sleep(0.05)
+        assert len(pulled) == 4
+
+        for frame_num in range(10):
+            wait_for(lambda: tile._buffer.qsize() > 0)
+            tile.draw()
+            assert pixels_to_frame(tile.pixels)[0, 0, 0] == frame_num
+
+        wait_for(lambda: tile._buffer.qsize() > 0)
+        tile.draw()
+        assert tile.finished
+        tile.close()
+
+    def test_prefetch_missed_frames(self):
+        """
+        Test that the previous frame stays on display when the prefetch
+        buffer is empty.
+        """
+        ready = threading.Event()
+
+        def source():
+            yield np.full((1, 1, 4), 1, dtype=np.uint8)
+            ready.wait()
+            yield np.full((1, 1, 4), 2, dtype=np.uint8)
+
+        tile = StreamTile(source(), prefetch=2)
+        tile.size = (1, 1)
+
+        wait_for(lambda: tile._buffer.qsize() > 0)
+        tile.draw()
+        tile.draw()
+        assert tile.frames_missed == 1
+        assert pixels_to_frame(tile.pixels)[0, 0, 0] == 1
+
+        ready.set()
+        wait_for(lambda: tile._buffer.qsize() > 0)
+        tile.draw()
+        assert pixels_to_frame(tile.pixels)[0, 0, 0] == 2
+
+        tile.close()
+
+    def test_source_errors(self):
+        """
+        Test that errors raised by the source are raised by draw.
+        """
+        def source():
+            yield np.zeros((1, 1, 4), dtype=np.uint8)
+            raise RuntimeError('source failed')
+
+        tile = StreamTile(source())
+        tile.draw()
+        with pytest.raises(RuntimeError):
+            tile.draw()
+
+        tile = StreamTile(source(), prefetch=2)
+        wait_for(lambda: tile._buffer.qsize() == 2)
+        tile.draw()
+        with pytest.raises(RuntimeError):
+            tile.draw()
+        assert tile.finished
+
+    def test_close(self):
+        """
+        Test that closing the tile stops the prefetch thread.
+        """
+        def source():
+            while True:
+                yield np.zeros((1, 1, 4), dtype=np.uint8)
+
+        tile = StreamTile(source(), prefetch=2)
+        wait_for(lambda: tile._buffer.qsize() == 2)
+
+        tile.close()
+        assert tile.finished
+        assert tile._prefetch_thread is None
+
+    def test_tile_manager(self):
+        """
+        Test that a TileManager displays one frame per rendered frame.
+        """
+        manager = TileManager(NTVirtualMatrix(size=(2, 2)), draw_fps=None)
+        tile = StreamTile(counting_frames((2, 2), 5))
+        manager.register_tile(tile, size=(2, 2), root=(0, 0))
+
+        frames = [
+            pixels_to_frame(pixels)[0, 0, 0]
+            for pixels in manager.render_frames(5)
+        ]
+        assert frames == [0, 1, 2, 3, 4]
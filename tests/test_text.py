@@ -0,0 +1,193 @@
+import numpy as np
+import pytest
+
+from neotiles import PixelColor, TileManager
+from neotiles.exceptions import NeoTilesError
+from neotiles.framebuffer import pixels_to_frame
+from neotiles.matrixes import NTVirtualMatrix
+from neotiles.text import DEFAULT_FONT, BitmapFont, TextTile, render_text
+
+
+# A tiny 2-row font: 'a' is a 1x2 bar, 'b' is a 2x2 diagonal.
+GLYPHS = {'a': (0b11,), 'b': (0b01, 0b10), '?': (0b10,)}
+
+
+def lit(tile):
+    """
+    Which of a tile's pixels are lit (not black), as strings of '#' and '.'.
+    """
+    frame = pixels_to_frame(tile.pixels)
+    return [
+        ''.join('#' if pixel.any() else '.' for pixel in row)
+        for row in frame
+    ]
+
+
+class TestBitmapFont:
+    def test_instantiation(self):
+        """
+        Test bitmap font instantiation.
+        """
+        font = BitmapFont(GLYPHS, height=2)
+        assert font.height == 2
+        assert font.atlas.shape == (2, 5)
+        assert not font.atlas.flags.writeable
+        assert repr(font) == 'BitmapFont(glyphs=3, height=2, spacing=1)'
+
+        with pytest.raises(NeoTilesError):
+            BitmapFont(GLYPHS, height=2, default_char='x')
+
+        with pytest.raises(NeoTilesError):
+            BitmapFont(GLYPHS, height=0)
+
+    def test_render(self):
+        """
+        Test rendering strings from the atlas.
+        """
+        font = BitmapFont(GLYPHS, height=2)
+
+        assert font.width('') == 0
+        assert font.render('').shape == (2, 0)
+        assert font.width('ab') == 4
+        assert font.render('ab').tolist() == [
+            [True, False, True, False],
+            [True, False, False, True],
+        ]
+
+        # Unknown characters are drawn as the default character.
+        assert font.render('x').tolist() == [[False], [True]]
+
+        font = BitmapFont(GLYPHS, height=2, spacing=0)
+        assert font.width('aa') == 2
+
+    def test_default_font(self):
+        """
+        Test the default font.
+        """
+        assert DEFAULT_FONT.height == 7
+        assert DEFAULT_FONT.width('Hi') == 9
+        assert DEFAULT_FONT.render('!').tolist() == [
+            [True], [True], [True], [True], [True], [False], [True]]
+
+
+class TestRenderText:
+    def test_render_text(self):
+        """
+        Test rendering strings as pixel colors.
+        """
+        red = PixelColor(255, 0, 0)
+        blue = PixelColor(0, 0, 255)
+        font = BitmapFont(GLYPHS, height=2)
+
+        bitmap = render_text('b', red, background=blue, font=font)
+        assert bitmap == [[red, blue], [blue, red]]
+
+    def test_cache(self):
+        """
+        Test that rendered strings are cached by text, font, and color.
+        """
+        font = BitmapFont(GLYPHS, height=2)
+        red = PixelColor(255, 0, 0)
+
+        bitmap = render_text('ab', red, font=font)
+        assert render_text('ab', PixelColor(255, 0, 0), font=font) is bitmap
+        assert render_text('ab', PixelColor(0, 255, 0), font=font) is not (
+            bitmap)
+        assert render_text('ba', red, font=font) is not bitmap
+        assert render_text('ab', red) is not bitmap
+
+
+class TestTextTile:
+    def test_instantiation(self):
+        """
+        Test text tile instantiation.
+        """
+        tile = TextTile('hi')
+        assert tile.text == 'hi'
+        assert tile.progress == 0
+        assert not tile.finished
+        assert repr(tile) == "TextTile(text='hi', scroll=False)"
+
+    def test_static_text(self):
+        """
+        Test that static text is drawn at the top left of the tile.
+        """
+        tile = TextTile('ab', font=BitmapFont(GLYPHS, height=2))
+        tile.size = (6, 3)
+        tile.draw()
+
+        assert lit(tile) == ['#.#...', '#..#..', '......']
+
+        tile.size = (2, 1)
+        tile.draw()
+        assert lit(tile) == ['#.']
+
+    def test_scroll(self):
+        """
+        Test that scrolling text moves in from the right and out of the
+        left, one window of the rendered text per frame.
+        """
+        tile = TextTile(
+            'ab', font=BitmapFont(GLYPHS, height=2), scroll=True, loop=False)
+        tile.size = (3, 2)
+
+        frames = []
+        while not tile.finished:
+            tile.draw()
+            frames.append(lit(tile)[1])
+
+        assert frames == [
+            '...', '..#', '.#.', '#..', '..#', '.#.', '#..']
+        assert tile.progress == 1
+
+        tile.draw()
+        assert lit(tile) == ['...', '...']
+
+        # Setting the text starts the scroll again.
+        tile.text = 'a'
+        assert not tile.finished
+        tile.draw()
+        tile.draw()
+        assert lit(tile) == ['..#', '..#']
+
+    def test_scroll_loop(self):
+        """
+        Test that looping text starts scrolling again.
+        """
+        tile = TextTile('a', font=BitmapFont(GLYPHS, height=2), scroll=True)
+        tile.size = (2, 2)
+
+        rows = []
+        for _ in range(6):
+            tile.draw()
+            rows.append(lit(tile)[0])
+
+        assert rows == ['..', '.#', '#.', '..', '.#', '#.']
+        assert not tile.finished
+
+    def test_color(self):
+        """
+        Test changing the color of the text.
+        """
+        tile = TextTile('a', font=BitmapFont(GLYPHS, height=2))
+        tile.size = (1, 1)
+        tile.color = PixelColor(0, 0, 255)
+        tile.draw()
+
+        assert tile.pixels[0][0].hardware_components == (0, 0, 255)
+
+    def test_tile_manager(self):
+        """
+        Test scrolling text through a TileManager.
+        """
+        matrix = NTVirtualMatrix(size=(8, 7))
+        manager = TileManager(matrix, draw_fps=None)
+        tile = TextTile('Hi', color=PixelColor(255, 0, 0), scroll=True)
+        manager.register_tile(tile, size=(8, 7), root=(0, 0))
+
+        for _ in range(8):
+            manager.draw_hardware_matrix()
+
+        expected = np.zeros((7, 8), dtype=bool)
+        expected[:, 1:8] = DEFAULT_FONT.render('Hi')[:, :7]
+        assert np.array_equal(matrix.frame[..., 0] > 0, expected)
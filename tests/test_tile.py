@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 from neotiles import PixelColor, PixelPosition, Tile, TileSize
@@ -178,6 +180,53 @@ class TestTile:
             default_tile.visible = 'foo'
         assert 'must be set to True or False' in str(e)
 
+    def test_opacity(self, default_tile):
+        """
+        Test the opacity attribute.
+        """
+        assert default_tile.opacity == 1.0
+        assert default_tile.is_opaque is True
+
+        default_tile.opacity = 0.5
+        assert default_tile.opacity == 0.5
+        assert default_tile.is_opaque is False
+
+        for invalid in [-0.1, 1.1, 'foo', None]:
+            with pytest.raises(ValueError) as e:
+                default_tile.opacity = invalid
+            assert 'opacity must be between 0 and 1' in str(e)
+
+    def test_blend_mode(self, default_tile):
+        """
+        Test the blend_mode attribute.
+        """
+        assert default_tile.blend_mode == 'normal'
+
+        for mode in ['add', 'multiply', 'screen', 'max', 'normal']:
+            default_tile.blend_mode = mode
+            assert default_tile.blend_mode == mode
+
+        default_tile.blend_mode = 'add'
+        assert default_tile.is_opaque is False
+
+        with pytest.raises(ValueError) as e:
+            default_tile.blend_mode = 'foo'
+        assert 'blend_mode must be one of' in str(e)
+
+    def test_clock(self, default_tile):
+        """
+        Test the clock and time attributes.
+        """
+        assert default_tile.clock is time.time
+        assert abs(default_tile.time - time.time()) < 1
+
+        default_tile.clock = lambda: 42
+        assert default_tile.time == 42
+
+        with pytest.raises(ValueError) as e:
+            default_tile.clock = 'foo'
+        assert 'clock must be callable' in str(e)
+
     def test_on_size_set(self):
         """
         Test the on_size_set handler.  This handler should be called whenever
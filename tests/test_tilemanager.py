@@ -1,10 +1,28 @@
+import threading
+import time
+
 import pytest
 
 from neotiles import (
-    MatrixSize, PixelColor, Tile, TileManager, TilePosition)
+    MatrixSize, PixelColor, RenderStats, Tile, TileManager, TilePosition)
+from neotiles.exceptions import NeoTilesError
 from neotiles.matrixes import NTNeoPixelMatrix, NTRGBMatrix
 
-from .fixtures import manager_neopixel, manager_rgb
+from .fixtures import manager_neopixel, manager_rgb, manager_virtual
+
+
+class RedsTile(Tile):
+    """
+    A tile which draws the given red components, one per pixel.
+    """
+    def __init__(self, reds):
+        self.reds = reds
+        super(RedsTile, self).__init__()
+
+    def draw(self):
+        for y, row in enumerate(self.reds):
+            for x, red in enumerate(row):
+                self.set_pixel((x, y), PixelColor(red, 0, 0))
 
 
 class TestTileManager:
@@ -80,6 +98,62 @@ class TestTileManager:
         manager.deregister_tile(grn_tile)
         assert len(manager.tiles_meta) == 0
 
+    @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
+    def test_reregister_tile(self, manager):
+        """
+        Test that registering a tile twice replaces the first registration,
+        and that deregistering an unknown tile is harmless.
+        """
+        red_pixel = PixelColor(128, 0, 0, 0)
+        red_tile = Tile(default_color=red_pixel)
+
+        manager.register_tile(tile=red_tile, size=(2, 2), root=(0, 0))
+        manager.register_tile(tile=red_tile, size=(2, 2), root=(4, 0))
+        assert len(manager.tiles) == 1
+        assert manager.tiles_meta[0]['root'] == (4, 0)
+        assert manager.pixels[0][0] != red_pixel
+        assert manager.pixels[0][4] == red_pixel
+
+        assert manager.deregister_tile(Tile()) == 0
+        assert manager.deregister_tile(red_tile) == 1
+        assert manager.deregister_tile(red_tile) == 0
+        assert len(manager.tiles) == 0
+
+    @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
+    def test_register_while_compositing(self, manager):
+        """
+        Test that tiles can be registered and deregistered from another thread
+        while frames are being composited.
+        """
+        errors = []
+        tiles = [Tile() for _ in range(50)]
+
+        def churn():
+            try:
+                for _ in range(5):
+                    for index, tile in enumerate(tiles):
+                        manager.register_tile(
+                            tile=tile, size=(2, 2), root=(index % 8, 0))
+                    for tile in tiles:
+                        manager.deregister_tile(tile)
+            except Exception as e:
+                errors.append(e)
+
+        # Keep one tile registered so the (pretend) animation loop isn't
+        # stopped, and pretend the animation loop is running so registration
+        # doesn't composite a frame itself.
+        manager.register_tile(tile=Tile(), size=(1, 1), root=(0, 4))
+        manager._animation_thread = threading.current_thread()
+        churner = threading.Thread(target=churn)
+        churner.start()
+        while churner.is_alive():
+            manager._set_pixels_from_tiles()
+        churner.join()
+        manager._animation_thread = None
+
+        assert errors == []
+        assert len(manager.tiles) == 1
+
     @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
     def test_data(self, manager):
         """
@@ -169,12 +243,351 @@ class TestTileManager:
             for matrix_pixel in row:
                 assert matrix_pixel == red_pixel
 
+    @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
+    def test_tile_clipping(self, manager):
+        """
+        Test that tiles which extend beyond the matrix edges are clipped
+        rather than raising or wrapping around.
+        """
+        cols = manager.matrix_size.cols
+        rows = manager.matrix_size.rows
+
+        red_pixel = PixelColor(128, 0, 0, 0)
+        grn_pixel = PixelColor(0, 128, 0, 0)
+
+        # Hangs off the top left corner (negative root).
+        manager.register_tile(
+            tile=Tile(default_color=red_pixel), size=(4, 4), root=(-2, -2))
+
+        # Hangs off the bottom right corner.
+        manager.register_tile(
+            tile=Tile(default_color=grn_pixel), size=(4, 4),
+            root=(cols - 2, rows - 2))
+
+        # Entirely off the matrix.
+        manager.register_tile(
+            tile=Tile(default_color=grn_pixel), size=(2, 2),
+            root=(cols + 5, rows + 5))
+
+        pixels = manager.pixels
+        for row_num in range(rows):
+            for col_num in range(cols):
+                pixel = pixels[row_num][col_num]
+                if row_num < 2 and col_num < 2:
+                    assert pixel == red_pixel
+                elif row_num >= rows - 2 and col_num >= cols - 2:
+                    assert pixel == grn_pixel
+                else:
+                    assert pixel.components == (0, 0, 0, 0)
+
+    @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
+    def test_tile_resized_after_registration(self, manager):
+        """
+        Test that resizing a registered tile updates its blit map.
+        """
+        red_pixel = PixelColor(128, 0, 0, 0)
+        red_tile = Tile(default_color=red_pixel)
+        manager.register_tile(tile=red_tile, size=(2, 2), root=(0, 0))
+        assert manager.pixels[2][2] != red_pixel
+
+        red_tile.size = (3, 3)
+        manager._set_pixels_from_tiles()
+        assert manager.pixels[2][2] == red_pixel
+        assert manager.pixels[3][3] != red_pixel
+
+    @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
+    def test_z_order(self, manager):
+        """
+        Test that overlapping tiles are stacked by z order, and then by
+        registration order.
+        """
+        red_pixel = PixelColor(128, 0, 0, 0)
+        grn_pixel = PixelColor(0, 128, 0, 0)
+        blu_pixel = PixelColor(0, 0, 128, 0)
+
+        red_tile = Tile(default_color=red_pixel)
+        grn_tile = Tile(default_color=grn_pixel)
+        blu_tile = Tile(default_color=blu_pixel)
+
+        manager.register_tile(tile=red_tile, size=(4, 4), root=(0, 0), z=1)
+        manager.register_tile(tile=grn_tile, size=(4, 4), root=(2, 0))
+        manager.register_tile(tile=blu_tile, size=(2, 2), root=(1, 0), z=1)
+
+        assert manager.tiles == [grn_tile, red_tile, blu_tile]
+
+        pixels = manager.pixels
+        assert pixels[0][0] == red_pixel
+        assert pixels[0][1] == blu_pixel
+        assert pixels[0][2] == blu_pixel
+        assert pixels[0][3] == red_pixel
+        assert pixels[0][4] == grn_pixel
+        assert pixels[2][1] == red_pixel
+
+        # Hiding the top tiles should reveal the ones underneath.
+        red_tile.visible = False
+        blu_tile.visible = False
+        manager._set_pixels_from_tiles()
+        assert pixels[0][0].components == (0, 0, 0, 0)
+        assert pixels[0][2] == grn_pixel
+
+    @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
+    def test_skip_occluded(self, manager):
+        """
+        Test that completely hidden tiles are not drawn when skip_occluded is
+        enabled.
+        """
+        class CountingTile(Tile):
+            def __init__(self, **kwargs):
+                super(CountingTile, self).__init__(**kwargs)
+                self.draw_count = 0
+
+            def draw(self):
+                self.draw_count += 1
+
+        hidden_tile = CountingTile()
+        manager.register_tile(tile=hidden_tile, size=(2, 2), root=(0, 0))
+        manager.register_tile(tile=Tile(), size=(4, 4), root=(0, 0), z=1)
+
+        draw_count = hidden_tile.draw_count
+        manager._set_pixels_from_tiles()
+        assert hidden_tile.draw_count == draw_count + 1
+
+        manager._skip_occluded = True
+        manager._set_pixels_from_tiles()
+        assert hidden_tile.draw_count == draw_count + 1
+
+    def test_transparent_tile_drawn(self, manager_virtual):
+        """
+        Test that a tile at zero opacity is still drawn, so it can fade itself
+        back in, but doesn't affect the matrix.
+        """
+        class FadingTile(Tile):
+            def __init__(self, **kwargs):
+                super(FadingTile, self).__init__(**kwargs)
+                self.draw_count = 0
+
+            def draw(self):
+                self.draw_count += 1
+                self.opacity = min(1, self.opacity + 0.5)
+
+        fading_tile = FadingTile(default_color=PixelColor(0, 100, 0))
+        fading_tile.opacity = 0
+        manager_virtual.register_tile(
+            tile=fading_tile, size=(2, 2), root=(0, 0))
+
+        for skip_occluded in [False, True]:
+            manager_virtual._skip_occluded = skip_occluded
+            fading_tile.opacity = 0
+            draw_count = fading_tile.draw_count
+
+            manager_virtual._set_pixels_from_tiles()
+            assert fading_tile.draw_count == draw_count + 1
+            manager_virtual._set_pixels_from_tiles()
+            manager_virtual._set_pixels_from_tiles()
+            assert fading_tile.draw_count == draw_count + 3
+            assert manager_virtual.pixels[0][0].hardware_components[1] == 100
+
+    @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
+    def test_blended_tiles(self, manager):
+        """
+        Test that non-opaque tiles are blended with the tiles beneath them,
+        but not with opaque tiles above them.
+        """
+        red_tile = Tile(default_color=PixelColor(200, 0, 0))
+        manager.register_tile(tile=red_tile, size=(4, 1), root=(0, 0))
+
+        overlay_tile = Tile(default_color=PixelColor(0, 100, 0))
+        overlay_tile.blend_mode = 'add'
+        overlay_tile.opacity = 0.5
+        manager.register_tile(
+            tile=overlay_tile, size=(3, 1), root=(1, 0), z=1)
+
+        blu_tile = Tile(default_color=PixelColor(0, 0, 200))
+        manager.register_tile(tile=blu_tile, size=(1, 1), root=(3, 0), z=2)
+
+        pixels = manager.pixels
+        assert pixels[0][0].hardware_components == (200, 0, 0)
+        assert pixels[0][1].hardware_components == (200, 50, 0)
+        assert pixels[0][2].hardware_components == (200, 50, 0)
+        assert pixels[0][3].hardware_components == (0, 0, 200)
+        assert pixels[0][4].hardware_components == (0, 0, 0, 0)
+
+        # Making the overlay opaque turns it into a normal tile.
+        overlay_tile.opacity = 1
+        overlay_tile.blend_mode = 'normal'
+        manager._set_pixels_from_tiles()
+        assert pixels[0][1].hardware_components == (0, 100, 0)
+
+    @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
+    def test_tile_per_pixel(self, manager):
+        """
+        Test a matrix made up of one 1x1 tile per pixel.
+        """
+        cols = manager.matrix_size.cols
+        rows = manager.matrix_size.rows
+
+        colors = {}
+        for row_num in range(rows):
+            for col_num in range(cols):
+                color = PixelColor(col_num, row_num, 0)
+                colors[(col_num, row_num)] = color
+                manager.register_tile(
+                    tile=Tile(default_color=color, animate=False),
+                    size=(1, 1), root=(col_num, row_num))
+
+        pixels = manager.pixels
+        for row_num in range(rows):
+            for col_num in range(cols):
+                assert pixels[row_num][col_num] is colors[(col_num, row_num)]
+
+    def test_draw_virtual_matrix(self, manager_virtual):
+        """
+        Test drawing the tiles to a virtual matrix.
+        """
+        manager_virtual.register_tile(
+            tile=Tile(default_color=PixelColor(10, 20, 30)),
+            size=(2, 2), root=(1, 1))
+        manager_virtual.draw_hardware_matrix()
+
+        frame = manager_virtual.hardware_matrix.frame
+        assert manager_virtual.hardware_matrix.frames_shown == 1
+        assert frame[1][1].tolist() == [10, 20, 30, 0]
+        assert frame[2][2].tolist() == [10, 20, 30, 0]
+        assert frame[0][0].tolist() == [0, 0, 0, 0]
+        assert frame[3][3].tolist() == [0, 0, 0, 0]
+
+    def test_show_hardware_matrix(self, manager_virtual):
+        """
+        Test displaying the current pixels without drawing the tiles.
+        """
+        tile = RedsTile([[10, 20]])
+        manager_virtual.register_tile(tile=tile, size=(2, 1), root=(0, 0))
+        for _ in manager_virtual.render_frames(1):
+            pass
+        tile.reds = [[30, 40]]
+
+        matrix = manager_virtual.hardware_matrix
+        assert matrix.frames_shown == 0
+        manager_virtual.show_hardware_matrix()
+        assert matrix.frames_shown == 1
+        assert matrix.frame[0, :2, 0].tolist() == [10, 20]
+
+    def test_render_size_upscaled(self, manager_virtual):
+        """
+        Test that a tile drawn at a lower resolution is scaled up to its
+        display size.
+        """
+        tile = RedsTile([[10, 20], [30, 40]])
+        manager_virtual.register_tile(
+            tile=tile, size=(4, 4), root=(1, 1), render_size=(2, 2))
+        assert tile.size == (2, 2)
+
+        manager_virtual.draw_hardware_matrix()
+
+        frame = manager_virtual.hardware_matrix.frame
+        assert frame[1:5, 1:5, 0].tolist() == [
+            [10, 10, 20, 20],
+            [10, 10, 20, 20],
+            [30, 30, 40, 40],
+            [30, 30, 40, 40],
+        ]
+        assert frame[0, :, 0].tolist() == [0] * 10
+        assert frame[1:5, 5, 0].tolist() == [0] * 4
+
+    def test_render_size_supersampled(self, manager_virtual):
+        """
+        Test that a tile drawn at a multiple of its display size is averaged
+        down to its display size.
+        """
+        tile = RedsTile([[200, 0, 200, 0], [0, 0, 0, 200]])
+        manager_virtual.register_tile(
+            tile=tile, size=(2, 1), root=(0, 0), render_size=(4, 2))
+        manager_virtual.draw_hardware_matrix()
+
+        frame = manager_virtual.hardware_matrix.frame
+        assert frame[0, :3, 0].tolist() == [50, 100, 0]
+
+    def test_render_size_changed(self, manager_virtual):
+        """
+        Test that a tile drawn at a different resolution keeps its display
+        size when the tile is resized.
+        """
+        red_pixel = PixelColor(128, 0, 0, 0)
+        tile = Tile(default_color=red_pixel)
+        manager_virtual.register_tile(
+            tile=tile, size=(4, 2), root=(0, 0), render_size=(2, 1))
+        assert manager_virtual.pixels[1][3] == red_pixel
+
+        tile.size = (1, 1)
+        manager_virtual._set_pixels_from_tiles()
+        assert manager_virtual.pixels[1][3] == red_pixel
+        assert manager_virtual.pixels[2][4] != red_pixel
+
+    def test_render_frames(self, manager_virtual):
+        """
+        Test rendering frames offline against the virtual clock.
+        """
+        class ClockTile(Tile):
+            def __init__(self):
+                super(ClockTile, self).__init__()
+                self.times = []
+
+            def draw(self):
+                self.times.append(self.time)
+                self._init_pixels(PixelColor(len(self.times), 0, 0))
+
+        clock_tile = ClockTile()
+        manager_virtual.register_tile(
+            tile=clock_tile, size=(2, 2), root=(0, 0))
+        clock_tile.times = []
+
+        reds = [
+            pixels[0][0].red for pixels in
+            manager_virtual.render_frames(5, fps=4, start_time=10)
+        ]
+        assert reds == [1, 2, 3, 4, 5]
+        assert clock_tile.times == [10, 10.25, 10.5, 10.75, 11]
+
+        # Without output the hardware matrix is left alone.
+        assert manager_virtual.hardware_matrix.frames_shown == 0
+        list(manager_virtual.render_frames(3, output=True))
+        assert manager_virtual.hardware_matrix.frames_shown == 3
+
+        # Outside of offline rendering the tile sees the wall clock.
+        assert abs(clock_tile.time - time.time()) < 1
+
+    def test_run_offline(self, manager_virtual):
+        """
+        Test the offline rendering statistics.
+        """
+        manager_virtual.register_tile(tile=Tile(), size=(4, 4), root=(0, 0))
+
+        stats = manager_virtual.run_offline(2, fps=30, output=True)
+        assert isinstance(stats, RenderStats)
+        assert stats.frames == 60
+        assert stats.fps > 0
+        assert stats.seconds >= stats.composite_seconds >= stats.draw_seconds
+        assert stats.output_seconds > 0
+        assert manager_virtual.hardware_matrix.frames_shown == 60
+
+    def test_render_frames_while_animating(self, manager_virtual):
+        """
+        Test that offline rendering is refused while the animation loop is
+        running.
+        """
+        manager_virtual._animation_thread = threading.current_thread()
+        with pytest.raises(NeoTilesError):
+            next(manager_virtual.render_frames(1))
+        manager_virtual._animation_thread = None
+
     @pytest.mark.parametrize('manager', [manager_neopixel(), manager_rgb()])
     def test_unsettable_attributes(self, manager):
         """
         Try setting unsettable attributes.
         """
-        for unsettable in ['matrix_size', 'tiles', 'tiles_meta', 'pixels']:
+        for unsettable in [
+                'matrix_size', 'tiles', 'tiles_meta', 'pixels', 'time',
+                'draw_fps']:
             with pytest.raises(AttributeError):
                 setattr(manager, unsettable, 'foo')
 
@@ -0,0 +1,179 @@
+import numpy as np
+import pytest
+
+from neotiles import PixelColor, TileManager
+from neotiles.exceptions import NeoTilesError
+from neotiles.framebuffer import pixels_to_frame
+from neotiles.matrixes import NTVirtualMatrix
+from neotiles.viewport import ViewportTile
+
+
+def numbered_canvas(cols, rows):
+    """
+    A canvas whose pixels' red components number them from 0 (top left),
+    left to right and top to bottom.
+    """
+    canvas = np.zeros((rows, cols, 3), dtype=np.uint8)
+    canvas[..., 0] = np.arange(cols * rows).reshape(rows, cols)
+    return canvas
+
+
+def reds(pixels):
+    """
+    The red components of a 2D list of pixel colors.
+    """
+    return pixels_to_frame(pixels)[..., 0].tolist()
+
+
+class CountingViewportTile(ViewportTile):
+    """
+    A viewport tile which counts how often it's drawn.
+    """
+    def __init__(self, *args, **kwargs):
+        super(CountingViewportTile, self).__init__(*args, **kwargs)
+        self.draws = 0
+
+    def draw(self):
+        self.draws += 1
+
+
+class TestViewportTile:
+    def test_instantiation(self):
+        """
+        Test viewport tile instantiation.
+        """
+        tile = ViewportTile(canvas_size=(8, 4))
+        assert tile.canvas_size == (8, 4)
+        assert tile.offset == (0, 0)
+        assert len(tile.canvas) == 4
+        assert len(tile.canvas[0]) == 8
+        assert repr(tile) == (
+            'ViewportTile(canvas_size=TileSize(cols=8, rows=4), wrap=True)')
+
+        with pytest.raises(NeoTilesError):
+            ViewportTile(canvas_size=(0, 4))
+
+    def test_set_canvas(self):
+        """
+        Test setting the whole canvas and single canvas pixels.
+        """
+        tile = ViewportTile(canvas_size=(3, 2))
+        tile.set_canvas(numbered_canvas(3, 2))
+        assert reds(tile.canvas) == [[0, 1, 2], [3, 4, 5]]
+
+        red = PixelColor(255, 0, 0)
+        tile.set_canvas_pixel((1, 1), red)
+        tile.set_canvas_pixel((3, 0), red)
+        assert tile.canvas[1][1] is red
+        assert reds(tile.canvas) == [[0, 1, 2], [3, 255, 5]]
+
+        with pytest.raises(NeoTilesError):
+            tile.set_canvas(numbered_canvas(2, 2))
+
+        tile.clear()
+        assert reds(tile.canvas) == [[0, 0, 0], [0, 0, 0]]
+
+    def test_window(self):
+        """
+        Test that the tile displays the window onto the canvas at its offset.
+        """
+        tile = ViewportTile(canvas_size=(4, 3))
+        tile.set_canvas(numbered_canvas(4, 3))
+        tile.size = (2, 2)
+        assert reds(tile.pixels) == [[0, 1], [4, 5]]
+
+        tile.offset = (2, 1)
+        assert reds(tile.pixels) == [[6, 7], [10, 11]]
+
+        tile.scroll(dx=-1)
+        assert tile.offset == (1, 1)
+        assert reds(tile.pixels) == [[5, 6], [9, 10]]
+
+    def test_window_cached(self):
+        """
+        Test that the window is only rebuilt when it changes.
+        """
+        tile = ViewportTile(canvas_size=(4, 3))
+        tile.size = (2, 2)
+
+        window = tile.pixels
+        assert tile.pixels is window
+
+        tile.scroll(dx=1)
+        assert tile.pixels is not window
+
+        window = tile.pixels
+        tile.set_canvas_pixel((0, 0), PixelColor(1, 0, 0))
+        assert tile.pixels is not window
+
+    def test_wrap(self):
+        """
+        Test that the window wraps around the canvas.
+        """
+        tile = ViewportTile(canvas_size=(4, 3))
+        tile.set_canvas(numbered_canvas(4, 3))
+        tile.size = (2, 2)
+
+        tile.offset = (3, 2)
+        assert reds(tile.pixels) == [[11, 8], [3, 0]]
+
+        tile.offset = (-1, -1)
+        assert reds(tile.pixels) == [[11, 8], [3, 0]]
+
+        # A window wider than the canvas repeats it.
+        tile.size = (6, 1)
+        tile.offset = (1, 0)
+        assert reds(tile.pixels) == [[1, 2, 3, 0, 1, 2]]
+
+    def test_no_wrap(self):
+        """
+        Test that the window outside the canvas is the default color when the
+        canvas doesn't wrap.
+        """
+        tile = ViewportTile(
+            canvas_size=(4, 3), wrap=False,
+            default_color=PixelColor(0, 0, 0))
+        tile.set_canvas(numbered_canvas(4, 3))
+        tile.size = (2, 2)
+
+        tile.offset = (3, 2)
+        assert reds(tile.pixels) == [[11, 0], [0, 0]]
+
+        tile.offset = (-1, -1)
+        assert reds(tile.pixels) == [[0, 0], [0, 0]]
+
+        tile.offset = (-1, 0)
+        assert reds(tile.pixels) == [[0, 0], [0, 4]]
+
+    def test_set_pixel(self):
+        """
+        Test that setting a tile pixel sets the canvas pixel displayed there.
+        """
+        tile = ViewportTile(canvas_size=(4, 3))
+        tile.size = (2, 2)
+        tile.offset = (3, 2)
+
+        red = PixelColor(255, 0, 0)
+        tile.set_pixel((1, 1), red)
+        assert tile.canvas[0][0] is red
+        assert tile.pixels[1][1] is red
+
+    def test_tile_manager(self):
+        """
+        Test that scrolling moves the window on the matrix without the tile
+        redrawing its canvas.
+        """
+        matrix = NTVirtualMatrix(size=(2, 1))
+        manager = TileManager(matrix, draw_fps=None)
+        tile = CountingViewportTile(canvas_size=(3, 1))
+        tile.set_canvas(numbered_canvas(3, 1) + 1)
+        manager.register_tile(tile, size=(2, 1), root=(0, 0))
+
+        displayed = []
+        for _ in range(3):
+            manager.draw_hardware_matrix()
+            displayed.append(matrix.frame[0, :, 0].tolist())
+            tile.scroll(dx=1)
+
+        assert displayed == [[1, 2], [2, 3], [3, 1]]
+        assert tile.draws == 3